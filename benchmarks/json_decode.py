@@ -0,0 +1,112 @@
+"""Compare the SDK's double decode with the tap's single-parse page pipeline.
+
+Run from the repository root with recorded pages, or synthetic DNA pages::
+
+    python -m benchmarks.json_decode --fixture recorded/dna_page_*.json
+    python -m benchmarks.json_decode --records 100 --bases 20000
+"""
+
+import argparse
+import json
+import random
+import time
+import tracemalloc
+from typing import Callable, List
+
+import requests
+from singer_sdk.helpers.jsonpath import extract_jsonpath
+
+from tap_benchling.parsing import JSON_BACKEND
+from tap_benchling.tap import TapBenchling
+
+
+def synthetic_dna_page(records: int, bases: int) -> bytes:
+    """Return a `/dna-sequences` page with long `bases` and annotations."""
+    rng = random.Random(0)
+    sequences = []
+    for index in range(records):
+        sequence = "".join(rng.choice("ACGT") for _ in range(bases))
+        annotations = [
+            {"name": f"feature {n}", "start": n * 50, "end": n * 50 + 40, "strand": 1}
+            for n in range(bases // 500)
+        ]
+        sequences.append(
+            {
+                "id": f"seq_{index}",
+                "bases": sequence,
+                "annotations": annotations,
+                "modifiedAt": "2023-01-01T00:00:00+00:00",
+            }
+        )
+    return json.dumps({"dnaSequences": sequences, "nextToken": "abc"}).encode()
+
+
+def as_response(content: bytes) -> requests.Response:
+    """Wrap a page body in a `requests.Response`."""
+    response = requests.Response()
+    response._content = content
+    response.status_code = 200
+    return response
+
+
+def sdk_default(content: bytes) -> int:
+    """Decode twice and walk both jsonpaths, as the previous client did."""
+    response = as_response(content)
+    token = next(iter(extract_jsonpath("$.nextToken", response.json())), None)
+    records = list(extract_jsonpath("$.dnaSequences[*]", response.json()))
+    return len(records) + bool(token)
+
+
+def single_parse(stream) -> Callable[[bytes], int]:
+    """Decode once and reuse the body for the token and the records."""
+
+    def run(content: bytes) -> int:
+        response = as_response(content)
+        token = stream.get_next_page_token(response, None)
+        records = list(stream.parse_response(response))
+        return len(records) + bool(token)
+
+    return run
+
+
+def measure(fn: Callable[[bytes], int], pages: List[bytes], repeat: int) -> tuple:
+    """Return (seconds per page, peak traced MiB) for `fn` over `pages`."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for page in pages:
+            fn(page)
+    elapsed = (time.perf_counter() - start) / (repeat * len(pages))
+    tracemalloc.start()
+    for page in pages:
+        fn(page)
+    peak = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main() -> None:
+    """Print time and peak memory per page for both pipelines."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixture", nargs="*", default=[])
+    parser.add_argument("--records", type=int, default=100)
+    parser.add_argument("--bases", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.fixture:
+        pages = [open(path, "rb").read() for path in args.fixture]
+    else:
+        pages = [synthetic_dna_page(args.records, args.bases)]
+    stream = TapBenchling(config={"api_key": "bench"}).streams["dna-sequences"]
+
+    size = sum(len(page) for page in pages) / len(pages) / 2**20
+    print(f"{len(pages)} page(s), {size:.1f} MiB each, backend={JSON_BACKEND}")
+    print("{:>14} {:>10} {:>10}".format("pipeline", "ms/page", "peak MiB"))
+    pipelines = (("sdk default", sdk_default), ("single parse", single_parse(stream)))
+    for name, fn in pipelines:
+        elapsed, peak = measure(fn, pages, args.repeat)
+        print(f"{name:>14} {elapsed * 1000:>10.1f} {peak:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Compare the SDK's message writer with the buffered writer on large records.
+
+Writes entry records with nested `days[].notes[].links` and DNA records with
+long `bases` to /dev/null. Run from the repository root::
+
+    python -m benchmarks.message_writer --messages 20000
+"""
+
+import argparse
+import contextlib
+import os
+import time
+from typing import Callable, List
+
+from singer_sdk import _singerlib as singer
+
+from tap_benchling.writer import BufferedMessageWriter, MessageWriter
+
+
+def entry_record(index: int) -> dict:
+    """Return a notebook entry with a few days of notes and links."""
+    return {
+        "id": f"etr_{index}",
+        "name": f"Experiment {index}",
+        "modifiedAt": "2023-01-01T00:00:00+00:00",
+        "days": [
+            {
+                "date": f"2023-01-0{day + 1}",
+                "notes": [
+                    {
+                        "type": "text",
+                        "text": "Observed growth in sample plate " * 4,
+                        "links": [
+                            {"id": f"bfi_{link}", "type": "custom_entity"}
+                            for link in range(5)
+                        ],
+                    }
+                    for _ in range(6)
+                ],
+            }
+            for day in range(3)
+        ],
+    }
+
+
+def dna_record(index: int) -> dict:
+    """Return a DNA sequence record with 20 kb of bases."""
+    return {
+        "id": f"seq_{index}",
+        "name": f"Plasmid {index}",
+        "modifiedAt": "2023-01-01T00:00:00+00:00",
+        "bases": "ACGT" * 5000,
+        "isCircular": True,
+        "length": 20000,
+    }
+
+
+def run(writer_factory: Callable[[], MessageWriter], messages: List) -> float:
+    """Return the seconds taken to write every message."""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        writer = writer_factory()
+        start = time.perf_counter()
+        for message in messages:
+            writer.write(message)
+        writer.close()
+        return time.perf_counter() - start
+
+
+def main() -> None:
+    """Print messages/s for each writer and record shape."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=20000)
+    args = parser.parse_args()
+
+    writers = {
+        "sdk": MessageWriter,
+        "buffered": lambda: BufferedMessageWriter(open(os.devnull, "wb")),
+        "buffered+gzip": lambda: BufferedMessageWriter(
+            open(os.devnull, "wb"), compression="gzip"
+        ),
+    }
+    header = ("records", "writer", "seconds", "msg/s", "speedup")
+    print("{:<10} {:<14} {:>9} {:>10} {:>8}".format(*header))
+    for shape, make in (("entries", entry_record), ("dna", dna_record)):
+        messages = [
+            singer.RecordMessage(stream=shape, record=make(i))
+            for i in range(args.messages)
+        ]
+        baseline = None
+        for name, factory in writers.items():
+            seconds = run(factory, messages)
+            baseline = baseline or seconds
+            print(
+                f"{shape:<10} {name:<14} {seconds:>9.2f} "
+                f"{args.messages / seconds:>10.0f} {baseline / seconds:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
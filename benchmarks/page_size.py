@@ -0,0 +1,58 @@
+"""Compare request counts and wall time per `page_size` against the mock server.
+
+Run from the repository root::
+
+    python -m benchmarks.page_size --records 10000 --latency 0.02
+"""
+
+import argparse
+import contextlib
+import logging
+import os
+import time
+
+from tap_benchling.tap import TapBenchling
+from tap_benchling.tests.mock_server import MockBenchling
+
+
+def sync_stream(url: str, stream_name: str, page_size: int) -> None:
+    """Sync one stream from `url`, discarding the Singer output."""
+    tap = TapBenchling(
+        config={
+            "api_key": "bench",
+            "api_url": url,
+            "page_size": page_size,
+            "max_requests_per_second": 1000000,
+        }
+    )
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        tap.streams[stream_name].sync()
+
+
+def main() -> None:
+    """Print one row per page size."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=10000)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--stream", default="dna-sequences")
+    parser.add_argument("--page-sizes", default="10,25,50,100")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    header = ("page_size", "requests", "req/10k", "seconds", "rec/s")
+    print("{:>9} {:>9} {:>9} {:>8} {:>9}".format(*header))
+    for page_size in [int(size) for size in args.page_sizes.split(",")]:
+        with MockBenchling(records=args.records, latency=args.latency) as mock:
+            start = time.perf_counter()
+            sync_stream(mock.url, args.stream, page_size)
+            elapsed = time.perf_counter() - start
+            requests = mock.total_requests
+        per_10k = requests * 10000 / args.records
+        print(
+            f"{page_size:>9} {requests:>9} {per_10k:>9.0f} {elapsed:>8.2f} "
+            f"{args.records / elapsed:>9.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Compare the SDK's recursive type conformance with the compiled transformer.
+
+Conforms mock container and entry records, with extra properties and
+`Z`-suffixed timestamps, to the streams' schemas. Run from the repository root::
+
+    python -m benchmarks.record_transform --records 20000
+"""
+
+import argparse
+import copy
+import json
+import logging
+import time
+from typing import Callable, List
+
+from singer_sdk.helpers._typing import TypeConformanceLevel, conform_record_data_types
+
+from tap_benchling.streams import SCHEMAS_DIR
+from tap_benchling.transform import compile_transformer
+
+LOGGER = logging.getLogger("benchmark")
+LOGGER.disabled = True
+
+
+def container_record(index: int) -> dict:
+    """Return a container with contents, a quantity and an undocumented key."""
+    return {
+        "id": f"con_{index}",
+        "name": f"Tube {index}",
+        "barcode": f"BC{index:08d}",
+        "createdAt": "2023-01-01T00:00:00.000000Z",
+        "modifiedAt": "2023-01-02T00:00:00.000000Z",
+        "quantity": {"units": "mL", "value": "1.5"},
+        "volume": {"units": "uL", "value": 250},
+        "contents": [
+            {
+                "batch": None,
+                "concentration": {"units": "uM", "value": "0.25"},
+                "entity": {"id": f"bfi_{index}", "name": "Sample"},
+            }
+            for _ in range(3)
+        ],
+        "fields": {"Notes": {"value": "ok", "type": "text"}},
+        "webURL": f"https://example.benchling.com/containers/{index}",
+        "undocumented": {"nested": [1, 2, 3]},
+    }
+
+
+def entry_record(index: int) -> dict:
+    """Return a notebook entry with a few days of notes."""
+    return {
+        "id": f"etr_{index}",
+        "name": f"Experiment {index}",
+        "createdAt": "2023-01-01T00:00:00Z",
+        "modifiedAt": "2023-01-02T00:00:00Z",
+        "days": [
+            {
+                "date": f"2023-01-0{day + 1}",
+                "notes": [
+                    {"type": "text", "text": "Observed growth", "links": []}
+                    for _ in range(6)
+                ],
+            }
+            for day in range(3)
+        ],
+        "undocumented": True,
+    }
+
+
+def run(conform: Callable[[dict], dict], records: List[dict]) -> float:
+    """Return the seconds taken to conform every record."""
+    start = time.perf_counter()
+    for record in records:
+        conform(record)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Print records/s for each conformance and record shape."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=20000)
+    args = parser.parse_args()
+
+    header = ("records", "conformance", "seconds", "rec/s", "speedup")
+    print("{:<12} {:<10} {:>9} {:>10} {:>8}".format(*header))
+    shapes = (("containers", container_record), ("entries", entry_record))
+    for shape, make in shapes:
+        schema = json.loads((SCHEMAS_DIR / f"{shape}.json").read_text())
+        records = [make(i) for i in range(args.records)]
+        conformances = {
+            "sdk": lambda record: conform_record_data_types(
+                shape, copy.copy(record), schema, TypeConformanceLevel.RECURSIVE, LOGGER
+            ),
+            "compiled": compile_transformer(schema),
+        }
+        baseline = None
+        for name, conform in conformances.items():
+            seconds = run(conform, records)
+            baseline = baseline or seconds
+            print(
+                f"{shape:<12} {name:<10} {seconds:>9.2f} "
+                f"{args.records / seconds:>10.0f} {baseline / seconds:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
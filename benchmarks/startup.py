@@ -0,0 +1,93 @@
+"""Measure tap import time and `--discover` latency in fresh interpreters.
+
+Run from the repository root; append results to track them over time::
+
+    python -m benchmarks.startup --runs 5 --append benchmarks/startup.jsonl
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+_IMPORT_LINE = re.compile(r"import time:\s+\d+ \|\s+(\d+) \|\s*(\S+)")
+
+
+def import_times() -> Dict[str, float]:
+    """Return cumulative import ms of the tap modules, via `-X importtime`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import tap_benchling.tap"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for match in _IMPORT_LINE.finditer(result.stderr):
+        if match.group(2).startswith("tap_benchling"):
+            times[match.group(2)] = int(match.group(1)) / 1000
+    return times
+
+
+def discover_seconds(config_path: str) -> float:
+    """Return the wall time of one `--discover` run."""
+    start = time.perf_counter()
+    subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "tap_benchling.tap",
+            "--config",
+            config_path,
+            "--discover",
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        check=True,
+    )
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Print (and optionally append) median startup timings as one JSON line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--append", help="JSON lines file to append the result to")
+    args = parser.parse_args()
+
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as config:
+        json.dump({"api_key": "bench"}, config)
+    try:
+        imports: List[Dict[str, float]] = [import_times() for _ in range(args.runs)]
+        discovers = [discover_seconds(config.name) for _ in range(args.runs)]
+    finally:
+        os.unlink(config.name)
+
+    result = {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "import_ms": statistics.median(run["tap_benchling.tap"] for run in imports),
+        "streams_import_ms": statistics.median(
+            run.get("tap_benchling.streams", 0.0) for run in imports
+        ),
+        "discover_ms": statistics.median(discovers) * 1000,
+    }
+    line = json.dumps(
+        {
+            key: round(value, 1) if isinstance(value, float) else value
+            for key, value in result.items()
+        }
+    )
+    print(line)
+    if args.append:
+        with open(args.append, "a") as history:
+            history.write(line + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Measure sync throughput, peak memory and request counts per stream.
+
+Runs `tap-benchling` in a subprocess against the local mock server and reads
+its Singer output as a target would. Run from the repository root; append
+results to track regressions over time::
+
+    python -m benchmarks.throughput --records 5000 --record-bytes 2000 \\
+        --latency 0.01 --append benchmarks/throughput.jsonl
+
+Extra tap settings, such as `{"streaming_parse": true}`, go in `--tap-config`.
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict
+
+from tap_benchling.tap import STREAM_TYPES
+from tap_benchling.tests.mock_server import MockBenchling
+
+
+def peak_rss_mb() -> float:
+    """Return the peak resident memory of finished child processes, in MB."""
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # Linux reports kilobytes, macOS bytes.
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def run_tap(config: dict) -> Dict[str, Dict[str, float]]:
+    """Sync every stream, returning records, bytes and timings per stream."""
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as file:
+        json.dump(config, file)
+    streams: Dict[str, Dict[str, float]] = {}
+    try:
+        process = subprocess.Popen(
+            [sys.executable, "-m", "tap_benchling.tap", "--config", file.name],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        assert process.stdout is not None
+        for line in process.stdout:
+            message = json.loads(line)
+            if message["type"] != "RECORD":
+                continue
+            now = time.perf_counter()
+            stats = streams.setdefault(
+                message["stream"], {"records": 0, "bytes": 0, "first": now}
+            )
+            stats["records"] += 1
+            stats["bytes"] += len(line)
+            stats["last"] = now
+        if process.wait():
+            raise subprocess.CalledProcessError(process.returncode, process.args)
+    finally:
+        os.unlink(file.name)
+    return streams
+
+
+def main() -> None:
+    """Print a row per stream and a JSON summary line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=5000)
+    parser.add_argument("--record-bytes", type=int, default=0)
+    parser.add_argument("--schemas", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--throttle-every", type=int, default=0)
+    parser.add_argument("--retry-after", type=float, default=0.05)
+    parser.add_argument("--tap-config", default="{}", help="JSON of tap settings")
+    parser.add_argument("--append", help="JSON lines file to append the result to")
+    args = parser.parse_args()
+
+    paths = {stream_class.name: stream_class.path for stream_class in STREAM_TYPES}
+    with MockBenchling(
+        records=args.records,
+        schemas=args.schemas,
+        latency=args.latency,
+        throttle_every=args.throttle_every,
+        retry_after=args.retry_after,
+        record_bytes=args.record_bytes,
+    ) as mock:
+        config = {
+            "api_key": "bench",
+            "api_url": mock.url,
+            "max_requests_per_second": 1000000,
+            **json.loads(args.tap_config),
+        }
+        start = time.perf_counter()
+        streams = run_tap(config)
+        elapsed = time.perf_counter() - start
+        request_counts = dict(mock.request_counts)
+        throttled = mock.throttled
+
+    header = ("stream", "records", "MB", "requests", "seconds", "rec/s", "MB/s")
+    print("{:<22} {:>9} {:>8} {:>9} {:>8} {:>10} {:>8}".format(*header))
+    for name, stats in sorted(streams.items()):
+        seconds = max(stats["last"] - stats["first"], 1e-6)
+        megabytes = stats["bytes"] / 1e6
+        requests = request_counts.get(paths.get(name, ""), 0)
+        print(
+            f"{name:<22} {stats['records']:>9.0f} {megabytes:>8.2f} {requests:>9} "
+            f"{seconds:>8.2f} {stats['records'] / seconds:>10.0f} "
+            f"{megabytes / seconds:>8.2f}"
+        )
+
+    records = sum(stats["records"] for stats in streams.values())
+    total_bytes = sum(stats["bytes"] for stats in streams.values())
+    result = {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "args": vars(args),
+        "seconds": round(elapsed, 2),
+        "records": records,
+        "records_per_second": round(records / elapsed, 1),
+        "mb_per_second": round(total_bytes / 1e6 / elapsed, 2),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "requests": sum(request_counts.values()),
+        "throttled": throttled,
+        "streams": {
+            name: {"records": stats["records"], "bytes": stats["bytes"]}
+            for name, stats in sorted(streams.items())
+        },
+    }
+    line = json.dumps(result)
+    print(line)
+    if args.append:
+        with open(args.append, "a") as history:
+            history.write(line + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""Asyncio HTTP engine paging many streams and partitions on one event loop."""
+
+import asyncio
+import datetime
+import queue
+import threading
+import time
+from typing import Any, Iterator, Optional, Sequence, Tuple
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from singer_sdk import metrics
+
+# Responses that may wait for the consuming stream thread, per fan out.
+BUFFERED_PAGES = 8
+
+
+class AsyncEngine:
+    """Send the requests of every stream from one event loop thread.
+
+    Stream threads keep parsing pages and writing messages with their usual
+    `RESTStream` hooks. Only building, sending and retrying requests move onto
+    the loop, so a stream's partitions are all in flight at once without a
+    thread each. Responses are handed back as `requests.Response` objects,
+    which keeps `validate_response`, `parse_response` and the retry policy of
+    `request_decorator` shared with the default engine.
+    """
+
+    def __init__(self, pool_size: int) -> None:
+        """Start the event loop thread and an HTTP session of `pool_size`."""
+        try:
+            import aiohttp
+        except ImportError as ex:  # pragma: no cover - optional engine
+            raise ImportError(
+                "The asyncio engine requires aiohttp: "
+                "install tap-benchling with the `async` extra."
+            ) from ex
+        self._aiohttp = aiohttp
+        self.pool_size = pool_size
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="benchling-aio", daemon=True
+        )
+        self._thread.start()
+        self._session = self._run(self._open_session())
+
+    async def _open_session(self) -> Any:
+        connector = self._aiohttp.TCPConnector(limit=self.pool_size)
+        return self._aiohttp.ClientSession(connector=connector)
+
+    def _run(self, coroutine: Any) -> Any:
+        """Run a coroutine on the loop and wait for its result."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def close(self) -> None:
+        """Close the HTTP session and stop the loop thread."""
+        self._run(self._session.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def fan_out(
+        self, stream: Any, contexts: Sequence[Optional[dict]], max_in_flight: int
+    ) -> Iterator[Tuple[Optional[dict], Optional[dict]]]:
+        """Page each context on the loop and yield its raw records.
+
+        Yields `(context, record)` pairs, then `(context, None)` once a context
+        is exhausted, like `concurrency.fan_out`. Pages are parsed on the
+        calling thread, keeping the loop free for I/O. Up to `max_in_flight`
+        contexts are paged at once. The first error is re-raised here and
+        cancels the remaining work.
+        """
+        feed = _Feed(self._loop)
+        future = asyncio.run_coroutine_threadsafe(
+            self._fan_out(stream, contexts, max_in_flight, feed), self._loop
+        )
+        remaining = len(contexts)
+        try:
+            while remaining:
+                context, response = feed.pages.get()
+                if isinstance(response, BaseException):
+                    raise response
+                if response is None:
+                    remaining -= 1
+                    yield context, None
+                    continue
+                feed.release()
+                for record in stream.parse_response(response):
+                    yield context, record
+        finally:
+            future.cancel()
+
+    async def _fan_out(
+        self,
+        stream: Any,
+        contexts: Sequence[Optional[dict]],
+        max_in_flight: int,
+        feed: "_Feed",
+    ) -> None:
+        feed.slots = asyncio.Semaphore(BUFFERED_PAGES)
+        in_flight = asyncio.Semaphore(max_in_flight)
+
+        async def page_context(context: Optional[dict]) -> None:
+            async with in_flight:
+                try:
+                    await self._page(stream, context, feed)
+                    feed.pages.put((context, None))
+                except Exception as ex:  # noqa: B902 - re-raised by the consumer
+                    feed.pages.put((context, ex))
+
+        await asyncio.gather(*(page_context(context) for context in contexts))
+
+    async def _page(self, stream: Any, context: Optional[dict], feed: "_Feed") -> None:
+        """Follow `nextToken` through every page of one context."""
+        send = stream.request_decorator(self._send)
+        loop = asyncio.get_running_loop()
+        token = None
+        with metrics.http_request_counter(stream.name, stream.path) as counter:
+            counter.context = context
+            while True:
+                prepared = stream.prepare_request(context, next_page_token=token)
+                response = await send(stream, prepared, context)
+                counter.increment()
+                stream.update_sync_costs(prepared, response, context)
+                # Decoding the body is CPU work: keep it off the loop. The
+                # decoded body is cached, so parsing the page reuses it.
+                next_token = await loop.run_in_executor(
+                    None, stream.get_next_page_token, response, token
+                )
+                await feed.slots.acquire()  # type: ignore[union-attr]
+                feed.pages.put((context, response))
+                if next_token and next_token == token:
+                    raise RuntimeError(
+                        f"Loop detected in pagination. Pagination token {token} "
+                        "is identical to prior token."
+                    )
+                if not next_token:
+                    return
+                token = next_token
+
+    async def _send(
+        self,
+        stream: Any,
+        prepared: requests.PreparedRequest,
+        context: Optional[dict],
+    ) -> requests.Response:
+        """Send one request and return it as a validated `requests.Response`."""
+        await stream.rate_limiter.acquire_async()
+        started = time.perf_counter()
+        try:
+            async with self._session.request(
+                prepared.method or "GET",
+                prepared.url,
+                headers=dict(prepared.headers),
+                data=prepared.body,
+                timeout=self._aiohttp.ClientTimeout(total=stream.timeout),
+            ) as raw:
+                content = await raw.read()
+        except asyncio.TimeoutError as ex:
+            raise requests.exceptions.ReadTimeout(str(ex)) from ex
+        except self._aiohttp.ClientError as ex:
+            raise requests.exceptions.ConnectionError(str(ex)) from ex
+
+        response = requests.Response()
+        response.status_code = raw.status
+        response.reason = raw.reason or ""
+        response.headers = CaseInsensitiveDict(raw.headers)
+        response.url = prepared.url or ""
+        response.request = prepared
+        response.elapsed = datetime.timedelta(seconds=time.perf_counter() - started)
+        stream.telemetry.observe_request(response.elapsed.total_seconds())
+        response._content = content
+        response._content_consumed = True  # type: ignore[attr-defined]
+        stream._write_request_duration_log(
+            endpoint=stream.path,
+            response=response,
+            context=context,
+            extra_tags={"url": prepared.path_url}
+            if stream._LOG_REQUEST_METRIC_URLS
+            else None,
+        )
+        stream.validate_response(response)
+        return response
+
+
+class _Feed:
+    """Responses handed from the event loop to one consuming stream thread."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self.pages: "queue.Queue[Tuple[Optional[dict], Any]]" = queue.Queue()
+        # Created on the loop; bounds the responses waiting in `pages`.
+        self.slots: Optional[asyncio.Semaphore] = None
+
+    def release(self) -> None:
+        """Let the loop fetch another page once one has been consumed."""
+        self.loop.call_soon_threadsafe(self.slots.release)  # type: ignore[union-attr]
@@ -1,21 +1,90 @@
 """REST client handling, including BenchlingStream base class."""
 
+import copy
+import datetime
+import random
+import time
 import requests
-from pathlib import Path
-from typing import Any, Dict, Optional, Union, List, Iterable
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Optional,
+    List,
+    Iterable,
+    Iterator,
+    Set,
+    Tuple,
+    cast,
+)
 
-from memoization import cached
+import backoff
+import pendulum
 
-from singer_sdk.helpers.jsonpath import extract_jsonpath
+from singer_sdk import _singerlib as singer
+from singer_sdk import metrics
 from singer_sdk.streams import RESTStream
 from singer_sdk.authenticators import BasicAuthenticator
+from singer_sdk.exceptions import FatalAPIError, RetriableAPIError
 from singer_sdk.helpers._typing import TypeConformanceLevel
 
+from tap_benchling.aio import AsyncEngine
+from tap_benchling.concurrency import fan_out
+from tap_benchling.enrichment import (
+    MAX_BULK_GET_IDS,
+    BulkGet,
+    Reference,
+    batched,
+    bulk_gets_for,
+    find_ids,
+)
+from tap_benchling.events import CHANGED_IDS, DELETED_AT, ChangeSource
+from tap_benchling.fieldschemas import SchemaSource, with_typed_fields
+from tap_benchling.payloads import REF_SCHEMA, REF_SUFFIX
+from tap_benchling.parsing import StreamingArrayParser, extract, loads, simple_path
+from tap_benchling.partitioning import (
+    WINDOW_END,
+    WINDOW_SETTLE_TIME,
+    WINDOW_START,
+    is_window,
+    modified_at_windows,
+)
+from tap_benchling.ratelimit import RateLimiter, retry_after_seconds
+from tap_benchling.telemetry import StreamTelemetry
+from tap_benchling.transform import Transform, compile_transformer
+
+if TYPE_CHECKING:
+    from backoff.types import Details
+
+    from tap_benchling.tap import TapBenchling
+
+# Bytes read from the socket at a time when parsing responses as they arrive.
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Cap and upper jitter bound, in seconds, for retries without `Retry-After`.
+MAX_BACKOFF = 60.0
+RETRY_AFTER_JITTER = 1.0
+
+
+def _parse_timestamp(value: str) -> datetime.datetime:
+    """Parse an ISO 8601 timestamp from config or state."""
+    parsed = pendulum.parse(value)
+    assert isinstance(parsed, datetime.datetime)
+    return parsed
+
 
 class BenchlingStream(RESTStream):
     """Benchling stream class."""
+
     TYPE_CONFORMANCE_LEVEL = TypeConformanceLevel.NONE
-    
+
+    @property
+    def tap(self) -> "TapBenchling":
+        """Return the tap that owns this stream and its shared clients."""
+        return cast("TapBenchling", self._tap)
+
     # OR use a dynamic url_base:
     @property
     def url_base(self) -> str:
@@ -25,15 +94,188 @@ class BenchlingStream(RESTStream):
     records_jsonpath = "$[*]"  # Or override `parse_response`.
     next_page_token_jsonpath = "$.nextToken"  # Or override `get_next_page_token`.
 
+    # Benchling list endpoints reject a `pageSize` above this value.
+    max_page_size = 100
+
+    # Incremental streams ask for ascending `modifiedAt` so bookmarks are resumable.
+    is_sorted = True
+    replication_sort = "modifiedAt:asc"
+
+    # Large streams may be split into `modifiedAt` windows paged in parallel.
+    partition_by_modified_at = False
+
+    # IDs resolved into full records when `enrich_references` is set.
+    references: List[Reference] = []
+
+    # Benchling schemas whose field definitions type `fields` with `typed_fields`.
+    field_schema_source: Optional[SchemaSource] = None
+
+    # Objects of Benchling's events feed re-fetched by this stream in `cdc_mode`.
+    change_sources: List[ChangeSource] = []
+
+    # Large text fields moved to side files when `payload_offload_url` is set.
+    offloaded_fields: List[str] = []
+
+    # Properties the tap fills from another field of the record, by source.
+    derived_properties: Dict[str, str] = {}
+
+    # Small, slowly changing lists kept by `reference_cache_path` between runs.
+    is_reference_data = False
+
+    # Set when a cached reference list is unchanged and its records are skipped.
+    _skips_records = False
+
+    _record_transformer: Optional[Transform] = None
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the stream, typing its `fields` if `typed_fields` is set.
+
+        `state_message_interval` replaces the SDK's STATE message frequency.
+
+        In `cdc_mode` streams fed by events also get a soft-delete column, and
+        offloaded fields get a `<field>Ref` reference when offloading is on.
+        Reference targets are only added when `enrich_references` is set.
+        """
+        super().__init__(*args, **kwargs)
+        tap = self.tap
+        self.telemetry: StreamTelemetry = tap.telemetry.for_stream(self.name)
+        if self.config.get("state_message_interval"):
+            self.STATE_MSG_FREQUENCY = self.config["state_message_interval"]
+        if self.field_schema_source and self.config.get("typed_fields"):
+            self._schema = with_typed_fields(
+                self._schema,
+                self.get_field_schemas(),
+                validation="fieldValidation" in self._schema["properties"],
+            )
+        if self.change_sources and self.config.get("cdc_mode"):
+            self._schema["properties"][DELETED_AT] = {
+                "type": ["string", "null"],
+                "format": "date-time",
+            }
+        if self.config.get("payload_offload_url"):
+            for field in self.offloaded_fields:
+                self._schema["properties"][field + REF_SUFFIX] = REF_SCHEMA
+        if self.config.get("enrich_references"):
+            for ref in self.references:
+                self._schema["properties"][ref.target] = ref.schema
+
+    def get_field_schemas(self) -> List[dict]:
+        """Return the Benchling schemas whose fields this stream's records have."""
+        assert self.field_schema_source is not None
+        return self.tap.benchling_schemas(self.field_schema_source)
+
     @property
     def authenticator(self) -> BasicAuthenticator:
-        """Return a new authenticator object."""
-        return BasicAuthenticator.create_for_stream(
-            self,
-            username=self.config.get("api_key"),
-            password="",
+        """Return the authenticator shared by every stream of the tap."""
+        tap = self.tap
+        if tap._authenticator is None:
+            tap._authenticator = BasicAuthenticator.create_for_stream(
+                self,
+                username=self.config.get("api_key"),
+                password="",
+            )
+        return tap._authenticator
+
+    @property
+    def requests_session(self) -> requests.Session:
+        """Return the pooled HTTP session shared by every stream of the tap."""
+        return self.tap.http_session
+
+    @property
+    def page_size(self) -> int:
+        """Return the configured page size, capped at the API maximum."""
+        overrides = self.config.get("stream_page_sizes") or {}
+        size = overrides.get(self.name) or self.config.get("page_size")
+        return min(size or self.max_page_size, self.max_page_size)
+
+    @property
+    def partition_concurrency(self) -> int:
+        """Return how many partitions of this stream may be paged at once."""
+        return max(self.config.get("partition_concurrency") or 1, 1)
+
+    @property
+    def is_window_partitioned(self) -> bool:
+        """Return True if this stream is split into `modifiedAt` windows."""
+        return bool(
+            self.partition_by_modified_at
+            and self.config.get("partition_window_days")
+            and self.config.get("start_date")
         )
 
+    @property
+    def partitions(self) -> Optional[List[dict]]:
+        """Return unfinished `modifiedAt` windows when `partition_window_days` is set.
+
+        Windows span `start_date` to now. Streams that are not window
+        partitioned keep the SDK default of partitions found in state.
+        """
+        if not self.is_window_partitioned:
+            return super().partitions
+        if getattr(self, "_windows", None) is None:
+            windows = modified_at_windows(
+                _parse_timestamp(self.config["start_date"]),
+                self.config["partition_window_days"],
+                pendulum.now("UTC"),
+            )
+            self._windows = [
+                window
+                for window in windows
+                if not self.get_context_state(window).get("window_complete")
+            ]
+        return self._windows
+
+    @property
+    def returning(self) -> Optional[str]:
+        """Return the `returning` projection of the selected properties.
+
+        Primary and replication keys are always kept, as is `nextToken` for
+        paging, and `archiveRecord` in `cdc_mode` to spot archived records.
+        Selected reference targets, payload references and derived properties
+        are filled by the tap, so their source fields are requested instead.
+        Returns None, requesting whole records, when every property is selected
+        or the records path is not a plain `$.key[*]`.
+        """
+        records_path = simple_path(self.records_jsonpath)
+        properties = list(self.schema.get("properties", {}))
+        selected = [name for name in properties if self.mask[("properties", name)]]
+        if not records_path or len(selected) == len(properties):
+            return None
+        required = set(self.primary_keys or [])
+        if self.replication_key:
+            required.add(self.replication_key)
+        if self.change_sources and self.config.get("cdc_mode"):
+            required.add("archiveRecord")
+        sources = {ref.target: ref.path.split(".", 1)[0] for ref in self.references}
+        sources.update({f + REF_SUFFIX: f for f in self.offloaded_fields})
+        sources.update(self.derived_properties)
+        for target, source in sources.items():
+            if target in selected:
+                required.add(source)
+        targets = set(sources) | {DELETED_AT}
+        key = records_path[0]
+        fields = [
+            f"{key}.{name}"
+            for name in properties
+            if (name in required or name in selected) and name not in targets
+        ]
+        return ",".join(fields + ["nextToken"])
+
+    @property
+    def streams_responses(self) -> bool:
+        """Return True if records are parsed while the response body arrives."""
+        records_path = simple_path(self.records_jsonpath)
+        return bool(self.config.get("streaming_parse") and records_path)
+
+    @property
+    def rate_limiter(self) -> RateLimiter:
+        """Return the rate limiter shared by every stream of the tap."""
+        return self.tap.rate_limiter
+
+    @property
+    def async_engine(self) -> Optional[AsyncEngine]:
+        """Return the tap's asyncio engine, or None for the requests engine."""
+        return self.tap.async_engine
+
     @property
     def http_headers(self) -> dict:
         """Return the http headers needed."""
@@ -42,26 +284,540 @@ class BenchlingStream(RESTStream):
             headers["User-Agent"] = self.config.get("user_agent")
         return headers
 
+    def decode_response(self, response: requests.Response) -> Any:
+        """Decode the response body once, caching it on the response."""
+        try:
+            return response._decoded_body  # type: ignore[attr-defined]
+        except AttributeError:
+            body = loads(response.content)
+            response._decoded_body = body  # type: ignore[attr-defined]
+            return body
+
+    def parse_response(self, response: requests.Response) -> Iterable[dict]:
+        """Parse the response and return an iterator of result records."""
+        records = self.telemetry.timed("parse", self._parse_records(response))
+        if self.references and self.config.get("enrich_references"):
+            records = self.enrich(records)
+        yield from records
+
+    def _parse_records(self, response: requests.Response) -> Iterable[dict]:
+        """Decode the records of a response.
+
+        Streamed responses are split record by record as chunks arrive. Their
+        remaining top-level keys, such as `nextToken`, become the decoded body.
+        """
+        consumed = response._content_consumed  # type: ignore[attr-defined]
+        if not response.raw or consumed:
+            self.telemetry.add_bytes(len(response.content))
+            yield from extract(self.records_jsonpath, self.decode_response(response))
+            return
+        key, _ = simple_path(self.records_jsonpath)  # type: ignore[misc]
+        parser = StreamingArrayParser(key)
+        received = 0
+        for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+            received += len(chunk)
+            yield from parser.feed(chunk)
+        self.telemetry.add_bytes(received)
+        response._decoded_body = parser.extras  # type: ignore[attr-defined]
+
+    def enrich(self, records: Iterable[dict]) -> Iterator[dict]:
+        """Fill each reference's target with the records its IDs point to.
+
+        IDs are gathered from up to a page of records at a time, so each
+        distinct ID costs at most one bulk-get slot. IDs with an unknown prefix
+        or missing from the API are left unresolved.
+        """
+        for batch in batched(records, self.page_size):
+            paths = [(ref, ref.path.split(".")) for ref in self.references]
+            ids = {
+                entity_id
+                for record in batch
+                for _, path in paths
+                for entity_id in find_ids(record, path)
+            }
+            resolved = self.resolve_ids(ids)
+            for record in batch:
+                for ref, path in paths:
+                    found = [
+                        resolved[entity_id]
+                        for entity_id in find_ids(record, path)
+                        if entity_id in resolved
+                    ]
+                    if ref.many:
+                        record[ref.target] = found
+                    else:
+                        record[ref.target] = found[0] if found else None
+                yield record
+
+    def resolve_ids(self, ids: Iterable[str]) -> Dict[str, dict]:
+        """Return full records for `ids`, bulk-getting the ones not cached."""
+        started = time.perf_counter()
+        try:
+            return self._resolve_ids(ids)
+        finally:
+            self.telemetry.add("enrich", time.perf_counter() - started)
+
+    def _resolve_ids(self, ids: Iterable[str]) -> Dict[str, dict]:
+        cache = self.tap.reference_cache
+        known = {entity_id: bulk_gets_for(entity_id) for entity_id in ids}
+        resolved = cache.get_many(entity_id for entity_id in known if known[entity_id])
+        missing: Dict[Tuple[BulkGet, ...], List[str]] = {}
+        for entity_id, bulk_gets in known.items():
+            if entity_id not in resolved and bulk_gets:
+                missing.setdefault(bulk_gets, []).append(entity_id)
+        for bulk_gets, entity_ids in missing.items():
+            for batch in batched(sorted(entity_ids), MAX_BULK_GET_IDS):
+                for bulk_get in bulk_gets:
+                    records = self.bulk_get(bulk_get, batch)
+                    found = {record["id"]: record for record in records}
+                    cache.put_many(found)
+                    resolved.update(found)
+                    batch = [entity_id for entity_id in batch if entity_id not in found]
+                    if not batch:
+                        break
+        return resolved
+
+    def bulk_get(self, bulk_get: BulkGet, entity_ids: List[str]) -> List[dict]:
+        """Fetch records by ID from a bulk-get endpoint, with the usual retries.
+
+        A rejected request, such as one naming an ID that no longer exists,
+        returns no records, leaving the batch's IDs unresolved.
+        """
+        params = dict(bulk_get.params)
+        params[bulk_get.ids_param] = ",".join(entity_ids)
+        prepared_request = self.build_prepared_request(
+            method="GET",
+            url=self.url_base + bulk_get.path,
+            params=params,
+            headers=self.http_headers,
+        )
+        decorated_request = self.request_decorator(self._request)
+        try:
+            response = decorated_request(prepared_request, None)
+        except FatalAPIError as ex:
+            self.logger.warning(
+                "Could not resolve %d IDs from '%s': %s",
+                len(entity_ids),
+                bulk_get.path,
+                ex,
+            )
+            return []
+        return self.decode_response(response).get(bulk_get.records_key, [])
+
     def get_next_page_token(
         self, response: requests.Response, previous_token: Optional[Any]
     ) -> Optional[Any]:
         """Return a token for identifying next page or None if no more pages."""
+        started = time.perf_counter()
         if self.next_page_token_jsonpath:
-            all_matches = extract_jsonpath(
-                self.next_page_token_jsonpath, response.json()
+            all_matches = extract(
+                self.next_page_token_jsonpath, self.decode_response(response)
             )
             first_match = next(iter(all_matches), None)
             next_page_token = first_match
         else:
             next_page_token = response.headers.get("X-Next-Page", None)
 
+        self.telemetry.add("paginate", time.perf_counter() - started)
         return next_page_token
 
     def get_url_params(
         self, context: Optional[dict], next_page_token: Optional[Any]
     ) -> dict[str, Any]:
         """Return a dictionary of values to be used in URL parameterization."""
-        params: dict = {}
+        params: dict = {"pageSize": self.page_size}
+        returning = self.returning
+        if returning:
+            params["returning"] = returning
+        if context and CHANGED_IDS in context:
+            params["ids"] = context[CHANGED_IDS]
+            params["archiveReason"] = "Any"
+        elif self.replication_key:
+            params["sort"] = self.replication_sort
+            params.update(self.get_replication_key_params(context))
         if next_page_token:
             params["nextToken"] = next_page_token
         return params
+
+    def get_replication_key_params(self, context: Optional[dict]) -> dict:
+        """Return the `modifiedAt` range filter for the bookmark and any window."""
+        start, end = self.get_modified_at_range(context)
+        conditions = []
+        if start:
+            conditions.append(f">= {start.isoformat()}")
+        if end:
+            conditions.append(f"< {end.isoformat()}")
+        return {"modifiedAt": " AND ".join(conditions)} if conditions else {}
+
+    def get_modified_at_range(
+        self, context: Optional[dict]
+    ) -> Tuple[Optional[datetime.datetime], Optional[datetime.datetime]]:
+        """Return the `[start, end)` range of `modifiedAt` values to request.
+
+        The start is the bookmark (or `start_date`). Window partitions clamp it
+        to the window and to any stream-level bookmark left by earlier,
+        unpartitioned runs.
+        """
+        start = self.get_starting_timestamp(context)
+        if not context or not is_window(context):
+            return start, None
+        floors = [_parse_timestamp(context[WINDOW_START])]
+        if start:
+            floors.append(start)
+        stream_bookmark = self.stream_state.get("replication_key_value")
+        if stream_bookmark:
+            floors.append(_parse_timestamp(stream_bookmark))
+        return max(floors), _parse_timestamp(context[WINDOW_END])
+
+    def _request(
+        self, prepared_request: requests.PreparedRequest, context: Optional[dict]
+    ) -> requests.Response:
+        """Wait for the shared rate limiter, then send the request.
+
+        With `streaming_parse` the body is left unread for `parse_response`.
+        """
+        self.rate_limiter.acquire()
+        started = time.perf_counter()
+        response = self.requests_session.send(
+            prepared_request, timeout=self.timeout, stream=self.streams_responses
+        )
+        self.telemetry.observe_request(time.perf_counter() - started)
+        self._write_request_duration_log(
+            endpoint=self.path,
+            response=response,
+            context=context,
+            extra_tags={"url": prepared_request.path_url}
+            if self._LOG_REQUEST_METRIC_URLS
+            else None,
+        )
+        self.validate_response(response)
+        return response
+
+    def validate_response(self, response: requests.Response) -> None:
+        """Feed rate-limit headers to the limiter before checking the status."""
+        self.rate_limiter.observe(response.headers)
+        try:
+            super().validate_response(response)
+        except Exception:
+            response.close()
+            raise
+
+    def request_decorator(self, func: Callable) -> Callable:
+        """Retry 429 and 5xx responses using `backoff_wait_generator` waits.
+
+        Jitter is applied by the wait generator, so the `Retry-After` delay is
+        honoured instead of being scaled down by `backoff`'s default jitter.
+        """
+        return backoff.on_exception(
+            self.backoff_wait_generator,
+            (
+                ConnectionResetError,
+                RetriableAPIError,
+                requests.exceptions.ReadTimeout,
+                requests.exceptions.ConnectionError,
+            ),
+            max_tries=self.backoff_max_tries,
+            on_backoff=self.backoff_handler,
+            jitter=None,
+        )(func)
+
+    def backoff_wait_generator(self) -> Generator[float, Any, None]:
+        """Wait for `Retry-After` if sent, else a full-jitter exponential delay."""
+        attempt = 0
+        exception = yield  # type: ignore[misc]
+        while True:
+            attempt += 1
+            response = getattr(exception, "response", None)
+            retry_after = None
+            if response is not None:
+                retry_after = retry_after_seconds(response.headers)
+            if retry_after is not None:
+                wait = retry_after + random.uniform(0, RETRY_AFTER_JITTER)
+                self.rate_limiter.pause(wait)
+            else:
+                wait = random.uniform(0, min(MAX_BACKOFF, 2.0**attempt))
+            exception = yield wait
+
+    def backoff_handler(self, details: "Details") -> None:
+        """Count the retry against the shared limiter, then log it."""
+        self.rate_limiter.record_retry(details["wait"])
+        super().backoff_handler(details)
+
+    def _write_message(self, message: singer.Message) -> None:
+        """Write a message through the tap, which serializes concurrent streams."""
+        started = time.perf_counter()
+        self.tap.write_message(message)
+        self.telemetry.add("write", time.perf_counter() - started)
+
+    def _write_schema_message(self) -> None:
+        """Write out a SCHEMA message with the stream schema."""
+        for schema_message in self._generate_schema_messages():
+            self._write_message(schema_message)
+
+    @property
+    def record_transformer(self) -> Transform:
+        """Return the function conforming records to the schema, compiled once."""
+        if self._record_transformer is None:
+            self._record_transformer = compile_transformer(
+                self.schema, self._warn_unknown_property
+            )
+        return self._record_transformer
+
+    def _warn_unknown_property(self, path: str) -> None:
+        self.logger.warning(
+            "Dropping property '%s' of stream '%s', it is not in the schema.",
+            path,
+            self.name,
+        )
+
+    def _write_record_message(self, record: dict) -> None:
+        """Write out a RECORD message, unless the record index has it unchanged.
+
+        Records of unchanged cached reference lists are skipped when
+        `reference_cache_skip_unchanged` is set. With `conform_records` the
+        record is conformed to the schema first.
+        Large payloads are offloaded before the index check, so unchanged ones
+        compare equal by their reference.
+        """
+        if self._skips_records:
+            return
+        started = time.perf_counter()
+        if self.config.get("conform_records"):
+            record = self.record_transformer(record)
+        transform_seconds = time.perf_counter() - started
+        store = self.tap.payload_store
+        if store is not None:
+            min_length = self.config.get("payload_offload_min_length", 1024)
+            for field in self.offloaded_fields:
+                store.offload(record, field, min_length)
+        index = self.tap.record_index
+        if index is not None and self.primary_keys:
+            key = "|".join(str(record.get(name)) for name in self.primary_keys)
+            modified_at = record.get("modifiedAt")
+            if index.is_unchanged(self.name, key, modified_at, record):
+                return
+        started = time.perf_counter()
+        record_messages = list(self._generate_record_messages(record))
+        transform_seconds += time.perf_counter() - started
+        self.telemetry.observe_record(transform_seconds)
+        for record_message in record_messages:
+            self._write_message(record_message)
+
+    def _write_state_message(self) -> None:
+        """Write out a STATE message with the latest state."""
+        self._write_message(singer.StateMessage(value=self.tap_state))
+
+    def sync_partitions(self, contexts: List[dict]) -> None:
+        """Sync several partitions at once, writing every message from this thread.
+
+        Worker threads only page the API. Records, bookmarks and STATE messages
+        are handled here, so output stays serialized and each partition keeps
+        its own bookmark. The caller writes the SCHEMA message.
+        """
+        for context in contexts:
+            signpost = self.get_replication_key_signpost(context)
+            if signpost:
+                self._write_replication_key_signpost(context, signpost)
+            self._write_starting_replication_value(context)
+
+        record_count = 0
+        with metrics.record_counter(self.name) as counter:
+            for context, record in self._partition_records(contexts):
+                if record is None:
+                    self._finalize_partition(context)
+                    continue
+                self._process_record(
+                    record,
+                    child_context=context,
+                    partition_context=self._get_state_partition_context(context),
+                )
+                self._check_max_record_limit(record_count)
+                if self.selected:
+                    if record_count % self.STATE_MSG_FREQUENCY == 0:
+                        self._write_state_message()
+                    self._write_record_message(record)
+                    self._increment_stream_state(record, context=context)
+                    counter.increment()
+                    record_count += 1
+        self._write_state_message()
+
+    def sync_changes(self, changes: Dict[str, Optional[str]]) -> Set[str]:
+        """Emit the current version of each changed ID, for `cdc_mode`.
+
+        `changes` maps IDs to the time an event removed them, or None. IDs are
+        listed with the `ids` filter, archived records included; those with an
+        `archiveRecord` are soft-deleted. IDs the list does not return may
+        belong to another stream sharing their prefix, such as the `bfi_` of
+        mixtures and custom entities, so no stubs are written here. Returns
+        the IDs found, for the tap to stub the removed IDs no stream found.
+        """
+        self._write_schema_message()
+        found: Set[str] = set()
+        with metrics.record_counter(self.name) as counter:
+            for batch in batched(sorted(changes), MAX_BULK_GET_IDS):
+                context = {CHANGED_IDS: ",".join(batch)}
+                for record in self.get_records(context):
+                    found.add(record["id"])
+                    if record.get("archiveRecord"):
+                        removed_at = changes.get(record["id"])
+                        record[DELETED_AT] = removed_at or record.get("modifiedAt")
+                    self._write_record_message(record)
+                    counter.increment()
+        return found
+
+    def write_removed(self, removed: Dict[str, str]) -> None:
+        """Emit soft-delete stubs for IDs removed from the API, for `cdc_mode`."""
+        with metrics.record_counter(self.name) as counter:
+            for entity_id, removed_at in sorted(removed.items()):
+                self._write_record_message({"id": entity_id, DELETED_AT: removed_at})
+                counter.increment()
+
+    def _partition_records(
+        self, contexts: List[dict]
+    ) -> Iterable[Tuple[dict, Optional[dict]]]:
+        """Page the contexts concurrently on the configured HTTP engine."""
+        engine = self.async_engine
+        if engine is None:
+            yield from fan_out(self.get_records, contexts, self.partition_concurrency)
+            return
+        for context, record in engine.fan_out(
+            self, contexts, self.partition_concurrency
+        ):
+            assert context is not None
+            if record is not None:
+                record = self.post_process(record, context)
+                if record is None:
+                    continue
+            yield context, record
+
+    def request_records(self, context: Optional[dict]) -> Iterable[dict]:
+        """Request records, on the asyncio engine when it is configured.
+
+        Reference streams are served from the reference cache when it is set.
+        """
+        cache = self.tap.reference_stream_cache
+        engine = self.async_engine
+        if self.is_reference_data and context is None and cache is not None:
+            records_key, _ = simple_path(self.records_jsonpath)  # type: ignore[misc]
+            records, changed = self.tap.reference_list(self.path, records_key)
+            self._skips_records = not changed and bool(
+                self.config.get("reference_cache_skip_unchanged")
+            )
+            if self._skips_records:
+                self.logger.info(
+                    "Stream '%s' is unchanged since it was cached, skipping its "
+                    "records.",
+                    self.name,
+                )
+            yield from copy.deepcopy(records)
+        elif engine is not None:
+            for _, record in engine.fan_out(self, [context], 1):
+                if record is not None:
+                    yield record
+        else:
+            for response in self._pages(context):
+                yield from self.parse_response(response)
+
+    def _pages(
+        self, context: Optional[dict], headers: Optional[Dict[str, str]] = None
+    ) -> Iterator[requests.Response]:
+        """Yield each response of a context, paged like `RESTStream.request_records`.
+
+        `headers` are added to the first request only. A page is parsed by the
+        caller before the paginator reads its next token.
+        """
+        paginator = self.get_new_paginator()
+        decorated_request = self.request_decorator(self._request)
+        with metrics.http_request_counter(self.name, self.path) as request_counter:
+            request_counter.context = context
+            while not paginator.finished:
+                prepared_request = self.prepare_request(
+                    context, next_page_token=paginator.current_value
+                )
+                if headers and not paginator.count:
+                    prepared_request.headers.update(headers)
+                response = decorated_request(prepared_request, context)
+                request_counter.increment()
+                self.update_sync_costs(prepared_request, response, context)
+                yield response
+                paginator.advance(response)
+
+    def _finalize_partition(self, context: dict) -> None:
+        """Promote a finished partition's bookmark and retire settled windows."""
+        state = self.get_context_state(context)
+        self.finalize_state_progress_markers(state)
+        if is_window(context):
+            settled = pendulum.now("UTC") - WINDOW_SETTLE_TIME
+            if _parse_timestamp(context[WINDOW_END]) < settled:
+                state["window_complete"] = True
+
+    def _process_record(
+        self,
+        record: dict,
+        child_context: Optional[dict] = None,
+        partition_context: Optional[dict] = None,
+    ) -> None:
+        """Process a record without copying window bounds into it."""
+        if partition_context and is_window(partition_context):
+            partition_context = None
+        super()._process_record(record, child_context, partition_context)
+
+    def _sync_children(self, child_context: dict) -> None:
+        """Defer child partitions when they are to be paged concurrently."""
+        if self.child_streams and self.partition_concurrency > 1:
+            self._deferred_child_contexts.append(child_context)
+            return
+        super()._sync_children(child_context)
+
+    def _sync_records(
+        self, context: Optional[dict] = None, write_messages: bool = True
+    ) -> Generator[dict, Any, Any]:
+        """Sync this stream's records, fanning out windows and deferred children.
+
+        Window partitions are always paged through `sync_partitions`, so each
+        window is finalized (and retired once settled) as soon as it is done.
+        """
+        if context is None and self.is_window_partitioned:
+            self.sync_partitions(self.partitions or [])
+            return
+        self._deferred_child_contexts: List[dict] = []
+        yield from super()._sync_records(context, write_messages)
+        if not self._deferred_child_contexts:
+            return
+        for child in self.child_streams:
+            if child.selected or child.has_selected_descendents:
+                child_stream = cast(BenchlingStream, child)
+                if child_stream.selected:
+                    child_stream._write_schema_message()
+                child_stream.sync_partitions(self._deferred_child_contexts)
+
+
+class ListEndpointStream(BenchlingStream):
+    """A list endpoint the tap reads for itself, such as `/events`.
+
+    It is never synced or discovered. It pages `path` with `params` through
+    the same retries, rate limiter and headers as the tap's streams.
+    """
+
+    replication_key = None
+
+    def __init__(
+        self, tap: Any, path: str, records_key: str, params: Dict[str, Any]
+    ) -> None:
+        """Page `records_key` of `path`, sending `params` with every request."""
+        self.records_jsonpath = f"$.{records_key}[*]"
+        self.params = params
+        super().__init__(
+            tap=tap,
+            name=path.strip("/"),
+            schema={"type": "object", "properties": {}},
+            path=path,
+        )
+
+    def get_url_params(
+        self, context: Optional[dict], next_page_token: Optional[Any]
+    ) -> dict[str, Any]:
+        """Return the page size and token with the endpoint's own parameters."""
+        params = super().get_url_params(context, next_page_token)
+        params.update(self.params)
+        return params
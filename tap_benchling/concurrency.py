@@ -0,0 +1,71 @@
+"""Helpers for paging several stream partitions at once."""
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+# How long a blocked worker waits before re-checking for cancellation.
+_PUT_TIMEOUT = 0.1
+
+
+class _Workers:
+    """Thread pool workers feeding one bounded result queue."""
+
+    def __init__(self, fetch: Callable[[dict], Iterable[dict]], buffer_size: int):
+        self.fetch = fetch
+        self.results: "queue.Queue[Tuple[dict, Any]]" = queue.Queue(buffer_size)
+        self.cancelled = threading.Event()
+
+    def put(self, item: Tuple[dict, Any]) -> bool:
+        """Queue an item, giving up once the consumer has gone away."""
+        while not self.cancelled.is_set():
+            try:
+                self.results.put(item, timeout=_PUT_TIMEOUT)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def work(self, context: dict) -> None:
+        """Page one context into the queue, ending with a `None` marker."""
+        if self.cancelled.is_set():
+            return
+        try:
+            for record in self.fetch(context):
+                if not self.put((context, record)):
+                    return
+            self.put((context, None))
+        except BaseException as ex:  # noqa: B902 - re-raised by the consumer
+            self.put((context, ex))
+
+
+def fan_out(
+    fetch: Callable[[dict], Iterable[dict]],
+    contexts: List[dict],
+    max_workers: int,
+    buffer_size: int = 1000,
+) -> Iterator[Tuple[dict, Optional[dict]]]:
+    """Run `fetch` for each context on a thread pool and yield its records.
+
+    Yields `(context, record)` pairs in arrival order, followed by a single
+    `(context, None)` once a context is exhausted. Records from one context keep
+    their original order. At most `buffer_size` records wait in memory, so slow
+    consumers apply backpressure to the workers. The first worker error is
+    re-raised here and cancels the remaining work.
+    """
+    workers = _Workers(fetch, buffer_size)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for context in contexts:
+            pool.submit(workers.work, context)
+        remaining = len(contexts)
+        try:
+            while remaining:
+                context, item = workers.results.get()
+                if isinstance(item, BaseException):
+                    raise item
+                if item is None:
+                    remaining -= 1
+                yield context, item
+        finally:
+            workers.cancelled.set()
@@ -0,0 +1,128 @@
+"""Resolution of IDs referenced by records through Benchling's bulk-get endpoints."""
+
+import threading
+from collections import OrderedDict
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Tuple
+
+# Benchling bulk-get endpoints accept at most this many IDs per request.
+MAX_BULK_GET_IDS = 100
+
+
+class BulkGet(NamedTuple):
+    """An endpoint getting records by ID, its ID parameter and results key.
+
+    `params` are sent with every request, such as the `archiveReason` that
+    makes a list endpoint return archived records like `:bulk-get` does.
+    """
+
+    path: str
+    ids_param: str
+    records_key: str
+    params: Tuple[Tuple[str, str], ...] = ()
+
+
+# List endpoints filtered by `ids`, for prefixes that several types share.
+# They skip IDs of the other types, where a `:bulk-get` rejects the request.
+LIST_BY_IDS = (("archiveReason", "Any"), ("pageSize", str(MAX_BULK_GET_IDS)))
+
+# Endpoints tried in turn for each Benchling ID prefix, until one returns an ID.
+BULK_GETS = {
+    "bfi_": (
+        BulkGet("/custom-entities", "ids", "customEntities", LIST_BY_IDS),
+        BulkGet("/mixtures", "ids", "mixtures", LIST_BY_IDS),
+    ),
+    "seq_": (BulkGet("/dna-sequences:bulk-get", "dnaSequenceIds", "dnaSequences"),),
+    "prtn_": (BulkGet("/aa-sequences:bulk-get", "aaSequenceIds", "aaSequences"),),
+    "etr_": (BulkGet("/entries:bulk-get", "entryIds", "entries"),),
+}
+
+
+def bulk_gets_for(entity_id: str) -> Tuple[BulkGet, ...]:
+    """Return the endpoints to get an ID from, or none for unknown prefixes."""
+    prefix = entity_id.split("_", 1)[0] + "_"
+    return BULK_GETS.get(prefix, ())
+
+
+class Reference(NamedTuple):
+    """IDs found at a dotted `path` of each record, resolved into `target`.
+
+    A `*` path segment visits every item of an array. With `many` the target
+    holds a list of every resolved record, otherwise the first one.
+    """
+
+    target: str
+    path: str
+    many: bool = False
+
+    @property
+    def schema(self) -> dict:
+        """Return the JSON schema of the `target` property."""
+        if self.many:
+            return {
+                "type": ["array", "null"],
+                "items": {"type": "object", "properties": {}},
+            }
+        return {"type": ["object", "null"], "properties": {}}
+
+
+def find_ids(value: Any, path: List[str]) -> Iterator[str]:
+    """Yield the string IDs found at `path` below `value`."""
+    if not path:
+        if isinstance(value, str):
+            yield value
+        return
+    head, rest = path[0], path[1:]
+    if head == "*":
+        for item in value if isinstance(value, list) else []:
+            yield from find_ids(item, rest)
+    elif isinstance(value, dict) and head in value:
+        yield from find_ids(value[head], rest)
+
+
+def batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Yield lists of up to `size` consecutive items."""
+    iterator = iter(items)
+    batch = list(islice(iterator, size))
+    while batch:
+        yield batch
+        batch = list(islice(iterator, size))
+
+
+class LRUCache:
+    """Thread-safe mapping that evicts the least recently used key past `maxsize`."""
+
+    def __init__(self, maxsize: int) -> None:
+        """Hold at most `maxsize` entries."""
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Return the cached values of `keys`, counting hits and misses."""
+        found = {}
+        with self._lock:
+            for key in keys:
+                if key in self._data:
+                    self._data.move_to_end(key)
+                    found[key] = self._data[key]
+                    self.hits += 1
+                else:
+                    self.misses += 1
+        return found
+
+    def put_many(self, values: Dict[str, Any]) -> None:
+        """Store values, evicting the least recently used beyond `maxsize`."""
+        with self._lock:
+            for key, value in values.items():
+                self._data[key] = value
+                self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        """Return the cache size and hit counters."""
+        with self._lock:
+            return {"size": len(self._data), "hits": self.hits, "misses": self.misses}
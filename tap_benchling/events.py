@@ -0,0 +1,62 @@
+"""Change data capture from Benchling's events feed."""
+
+from typing import Dict, Iterator, NamedTuple, Optional, Tuple
+
+# State bookmark holding the events cursor, next to the per-stream bookmarks.
+EVENTS_BOOKMARK = "events"
+
+# Context key listing the IDs a stream re-fetches in `cdc_mode`.
+CHANGED_IDS = "changed_ids"
+
+# Soft-delete column, set on archived and deleted records.
+DELETED_AT = "_sdc_deleted_at"
+
+# `eventType` segments marking the resource as archived or deleted.
+REMOVAL_EVENTS = ("archived", "deleted")
+
+
+class ChangeSource(NamedTuple):
+    """Event resources that are records of a stream.
+
+    `resource` is the key of the changed object in the event, such as `entity`
+    or `entry`; `prefix` narrows it to IDs with that prefix, e.g. `seq_`.
+    """
+
+    resource: str
+    prefix: str = ""
+
+    def matches(self, resource: str, entity_id: str) -> bool:
+        """Return True if the changed object is a record of this source."""
+        return resource == self.resource and entity_id.startswith(self.prefix)
+
+
+def changed_resources(event: dict) -> Iterator[Tuple[str, str]]:
+    """Yield `(resource, id)` for each object an event carries."""
+    for resource, value in event.items():
+        if isinstance(value, dict) and isinstance(value.get("id"), str):
+            yield resource, value["id"]
+
+
+def is_removal(event: dict) -> bool:
+    """Return True if the event archives or deletes its resources."""
+    segments = (event.get("eventType") or "").split(".")
+    return any(segment in REMOVAL_EVENTS for segment in segments)
+
+
+class ChangeSet:
+    """IDs changed per stream, each with the time it was removed, if it was."""
+
+    def __init__(self) -> None:
+        """Start with no changes."""
+        self.events = 0
+        self.changes: Dict[str, Dict[str, Optional[str]]] = {}
+
+    def add(self, stream: str, entity_id: str, removed_at: Optional[str]) -> None:
+        """Record a change; the latest event of an ID decides if it is removed."""
+        self.changes.setdefault(stream, {})[entity_id] = removed_at
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number of events read and IDs changed per stream."""
+        stats = {"events": self.events}
+        stats.update({stream: len(ids) for stream, ids in self.changes.items()})
+        return stats
@@ -0,0 +1,147 @@
+"""Typed JSON schemas for schema `fields`, built from Benchling field definitions."""
+
+import copy
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+# JSON schema of a field value for each Benchling field type; links are IDs.
+FIELD_TYPES: Dict[str, dict] = {
+    "text": {"type": ["string", "null"]},
+    "long_text": {"type": ["string", "null"]},
+    "dropdown": {"type": ["string", "null"]},
+    "integer": {"type": ["integer", "null"]},
+    "float": {"type": ["number", "null"]},
+    "decimal": {"type": ["number", "null"]},
+    "boolean": {"type": ["boolean", "null"]},
+    "date": {"type": ["string", "null"], "format": "date"},
+    "datetime": {"type": ["string", "null"], "format": "date-time"},
+}
+LINK_SUFFIX = "_link"
+
+# Schema of one field's entry in an assay result's `fieldValidation`.
+VALIDATION_SCHEMA = {
+    "type": ["object", "null"],
+    "properties": {
+        "validationComment": {"type": ["string", "null"]},
+        "validationStatus": {"type": ["string", "null"]},
+    },
+}
+
+
+class SchemaSource(NamedTuple):
+    """Benchling endpoint listing a stream's schemas, optionally of one `type`."""
+
+    path: str
+    records_key: str
+    type: Optional[str] = None
+
+
+def value_schema(definition: dict) -> dict:
+    """Return the JSON schema of one field's value, or `{}` if it is untyped."""
+    field_type = definition.get("type") or ""
+    if field_type.endswith(LINK_SUFFIX):
+        schema = {"type": ["string", "null"]}
+    else:
+        schema = copy.deepcopy(FIELD_TYPES.get(field_type, {}))
+    if definition.get("isMulti") and schema:
+        return {"type": ["array", "null"], "items": schema}
+    return schema
+
+
+def field_schema(definition: dict) -> dict:
+    """Return the schema of a `fields` entry: the typed value and its metadata."""
+    return {
+        "type": ["object", "null"],
+        "properties": {
+            "value": value_schema(definition),
+            "displayValue": {"type": ["string", "null"]},
+            "isMulti": {"type": ["boolean", "null"]},
+            "textValue": {"type": ["string", "null"]},
+            "type": {"type": ["string", "null"]},
+        },
+    }
+
+
+def fields_properties(schemas: List[dict]) -> Dict[str, dict]:
+    """Return `fields` properties covering every field of every schema.
+
+    A field name defined with different types by two schemas keeps an untyped
+    value.
+    """
+    properties: Dict[str, dict] = {}
+    for schema in schemas:
+        for definition in schema.get("fieldDefinitions") or []:
+            name = definition.get("name")
+            if not name or definition.get("archiveRecord"):
+                continue
+            prop = field_schema(definition)
+            if name in properties and properties[name] != prop:
+                prop["properties"]["value"] = {}
+            properties[name] = prop
+    return properties
+
+
+def with_typed_fields(
+    stream_schema: dict, schemas: List[dict], validation: bool = False
+) -> dict:
+    """Return a copy of `stream_schema` whose `fields` are typed per field name.
+
+    With `validation` the per-field `fieldValidation` entries are declared too.
+    """
+    typed = copy.deepcopy(stream_schema)
+    properties = fields_properties(schemas)
+    typed["properties"]["fields"] = {
+        "type": ["object", "null"],
+        "properties": properties,
+    }
+    if validation:
+        typed["properties"]["fieldValidation"] = {
+            "type": ["object", "null"],
+            "properties": {name: VALIDATION_SCHEMA for name in properties},
+            "additionalProperties": VALIDATION_SCHEMA,
+        }
+    return typed
+
+
+class SchemaCache:
+    """Benchling schema lists per endpoint URL, reused for `ttl` seconds.
+
+    With a `path`, lists are also kept in a JSON file so later runs of the tap
+    within the TTL skip the schema endpoints entirely.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        path: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Create an empty cache, loading the file at `path` if it exists."""
+        self.ttl = ttl
+        self.path = path
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        if path and os.path.exists(path):
+            with open(path) as cache_file:
+                self._entries = json.load(cache_file)
+
+    def get(self, endpoint: str, fetch: Callable[[], List[dict]]) -> List[dict]:
+        """Return the cached schemas of `endpoint`, fetching them when stale."""
+        with self._lock:
+            entry = self._entries.get(endpoint)
+            now = self._clock()
+            if entry is None or now - entry["fetched_at"] > self.ttl:
+                entry = {"fetched_at": now, "schemas": fetch()}
+                self._entries[endpoint] = entry
+                self._save()
+            return entry["schemas"]
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        with open(self.path, "w") as cache_file:
+            json.dump(self._entries, cache_file)
@@ -0,0 +1,191 @@
+"""Response decoding helpers, using orjson when it is installed."""
+
+import functools
+import json
+import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from singer_sdk.helpers.jsonpath import extract_jsonpath
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore[assignment]
+
+JSON_BACKEND = "orjson" if orjson else "json"
+
+_SIMPLE_PATH = re.compile(r"\$\.(\w+)(\[\*\])?")
+_STRUCTURAL = re.compile(rb'["{}\[\],:]')
+_STRING_SPECIAL = re.compile(rb'["\\]')
+_QUOTE, _BACKSLASH, _COLON, _COMMA = ord('"'), ord("\\"), ord(":"), ord(",")
+_OPENERS, _CLOSERS = b"{[", b"}]"
+
+
+def loads(data: bytes) -> Any:
+    """Decode a JSON document with the fastest available backend."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_canonical(value: Any) -> bytes:
+    """Encode a JSON value with sorted keys, so equal values give equal bytes."""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_SORT_KEYS, default=str)
+    return json.dumps(
+        value, sort_keys=True, separators=(",", ":"), default=str
+    ).encode()
+
+
+@functools.lru_cache(maxsize=None)
+def simple_path(expression: str) -> Optional[Tuple[str, bool]]:
+    """Return `(key, is_array)` for `$.key` and `$.key[*]`, else None."""
+    match = _SIMPLE_PATH.fullmatch(expression)
+    if not match:
+        return None
+    return match.group(1), bool(match.group(2))
+
+
+def extract(expression: str, body: Any) -> Iterator[Any]:
+    """Yield jsonpath matches, looking up `$.key` and `$.key[*]` directly."""
+    simple = simple_path(expression)
+    if simple is None:
+        yield from extract_jsonpath(expression, body)
+        return
+    key, is_array = simple
+    if not isinstance(body, dict) or key not in body:
+        return
+    value = body[key]
+    if not is_array:
+        yield value
+    elif isinstance(value, list):
+        yield from value
+    elif isinstance(value, dict):
+        yield from value.values()
+
+
+class StreamingArrayParser:
+    """Split the objects of one top-level array out of a JSON body as it arrives.
+
+    Feed raw chunks of a document like `{"dnaSequences": [{...}, ...], ...}`;
+    each complete object of the `key` array is decoded and returned as soon as
+    its closing brace is seen. Other top-level values (e.g. `nextToken`) are
+    collected in `extras`. Only the bytes of the current element are buffered,
+    and string contents are skipped with a regex rather than byte by byte.
+    """
+
+    def __init__(self, key: str) -> None:
+        """Prepare to extract the objects of the `key` array."""
+        self.key = key
+        self.extras: Dict[str, Any] = {}
+        self._buffer = bytearray()
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._key_start: Optional[int] = None
+        self._last_key: Optional[str] = None
+        self._value_start: Optional[int] = None
+        self._in_array = False
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """Consume a chunk and return the array elements it completed."""
+        self._buffer += chunk
+        items: List[Any] = []
+        while self._pos < len(self._buffer):
+            if self._in_string:
+                if not self._skip_string():
+                    break
+                continue
+            match = _STRUCTURAL.search(self._buffer, self._pos)
+            if not match:
+                self._pos = len(self._buffer)
+                break
+            self._pos = match.end()
+            item = self._on_token(match.start())
+            if item is not None:
+                items.append(item)
+        self._compact()
+        return items
+
+    def _skip_string(self) -> bool:
+        """Advance past string contents; return False if more data is needed."""
+        match = _STRING_SPECIAL.search(self._buffer, self._pos)
+        if not match:
+            self._pos = len(self._buffer)
+            return False
+        if self._buffer[match.start()] == _BACKSLASH:
+            if match.start() + 1 >= len(self._buffer):
+                self._pos = match.start()
+                return False
+            self._pos = match.start() + 2
+            return True
+        self._in_string = False
+        self._pos = match.end()
+        if self._key_start is not None:
+            start, end = self._key_start, self._pos
+            self._last_key = loads(bytes(self._buffer[start:end]))
+            self._key_start = None
+        return True
+
+    def _on_token(self, index: int) -> Optional[Any]:
+        """Handle one structural byte, returning a completed element if any."""
+        token = self._buffer[index]
+        top_level = self._depth == 1 and not self._in_array
+        if token == _QUOTE:
+            self._in_string = True
+            if top_level and self._value_start is None:
+                self._key_start = index
+        elif token in _OPENERS:
+            self._open(index)
+        elif token in _CLOSERS:
+            return self._close(index)
+        elif token == _COLON and top_level:
+            if self._last_key != self.key:
+                self._value_start = self._pos
+        elif token == _COMMA and top_level:
+            self._end_value(index)
+        return None
+
+    def _open(self, index: int) -> None:
+        """Enter an object or array, noting where an array element starts."""
+        self._depth += 1
+        if self._depth == 2 and self._last_key == self.key:
+            self._in_array = True
+            self._value_start = None
+        elif self._depth == 3 and self._in_array:
+            self._value_start = index
+
+    def _close(self, index: int) -> Optional[Any]:
+        """Leave an object or array, returning the element it completed."""
+        self._depth -= 1
+        if self._depth == 2 and self._in_array:
+            return self._take(self._value_start, index + 1)
+        if self._depth == 1 and self._in_array:
+            self._in_array = False
+            self._last_key = None
+        elif self._depth == 0:
+            self._end_value(index)
+        return None
+
+    def _end_value(self, index: int) -> None:
+        """Store the top-level value that ends at `index` in `extras`."""
+        if self._value_start is not None and self._last_key is not None:
+            self.extras[self._last_key] = self._take(self._value_start, index)
+        self._last_key = None
+
+    def _take(self, start: Optional[int], end: int) -> Any:
+        """Decode and release the buffered bytes of one value."""
+        self._value_start = None
+        return loads(bytes(self._buffer[start:end]).strip())
+
+    def _compact(self) -> None:
+        """Drop bytes that no pending value or key still needs."""
+        marks = [m for m in (self._value_start, self._key_start) if m is not None]
+        keep = min(marks + [self._pos])
+        if keep:
+            del self._buffer[:keep]
+            self._pos -= keep
+            if self._value_start is not None:
+                self._value_start -= keep
+            if self._key_start is not None:
+                self._key_start -= keep
@@ -0,0 +1,98 @@
+"""Content-addressed side files for large record payloads, such as sequence bases."""
+
+import gzip
+import hashlib
+import threading
+from typing import Dict, Optional, Set
+
+import fs
+
+COMPRESSIONS = {"gzip": ".gz", "none": ""}
+
+# Suffix of the property that references an offloaded payload, e.g. `basesRef`.
+REF_SUFFIX = "Ref"
+
+REF_SCHEMA = {
+    "type": ["object", "null"],
+    "properties": {
+        "uri": {"type": ["string", "null"]},
+        "sha256": {"type": ["string", "null"]},
+        "length": {"type": ["integer", "null"]},
+        "compression": {"type": ["string", "null"]},
+    },
+}
+
+
+class PayloadStore:
+    """Write payloads once each, named by the SHA-256 of their text.
+
+    `url` is any PyFilesystem URL or local directory; `s3://bucket/prefix`
+    needs the `s3` extra. A payload whose file already exists, from this run
+    or an earlier one, is not written again.
+    """
+
+    def __init__(self, url: str, compression: str = "gzip") -> None:
+        """Open (creating if needed) the store at `url`."""
+        self.url = url.rstrip("/")
+        self.compression = compression
+        self.stored = 0
+        self.deduplicated = 0
+        self.bytes_written = 0
+        self._suffix = COMPRESSIONS[compression]
+        self._fs = fs.open_fs(url, create=True)
+        self._known: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def put(self, payload: str) -> dict:
+        """Store `payload` unless it is already stored, returning its reference."""
+        data = payload.encode()
+        digest = hashlib.sha256(data).hexdigest()
+        path = f"{digest[:2]}/{digest}{self._suffix}"
+        with self._lock:
+            seen = digest in self._known
+            self._known.add(digest)
+        written = 0
+        if not seen and not self._fs.exists(path):
+            if self.compression == "gzip":
+                data = gzip.compress(data, mtime=0)
+            self._fs.makedirs(digest[:2], recreate=True)
+            self._fs.writebytes(path, data)
+            written = len(data)
+        with self._lock:
+            if written:
+                self.stored += 1
+                self.bytes_written += written
+            else:
+                self.deduplicated += 1
+        return {
+            "uri": f"{self.url}/{path}",
+            "sha256": digest,
+            "length": len(payload),
+            "compression": None if self.compression == "none" else self.compression,
+        }
+
+    def offload(self, record: dict, field: str, min_length: int) -> None:
+        """Move `record[field]` into the store if it is at least `min_length` long.
+
+        The field is set to None and `<field>Ref` to the reference; shorter
+        payloads stay inline with a null reference.
+        """
+        payload: Optional[str] = record.get(field)
+        if payload is None or len(payload) < min_length:
+            record[field + REF_SUFFIX] = None
+            return
+        record[field + REF_SUFFIX] = self.put(payload)
+        record[field] = None
+
+    def close(self) -> None:
+        """Close the underlying filesystem."""
+        self._fs.close()
+
+    def stats(self) -> Dict[str, int]:
+        """Return payloads written and skipped as duplicates, and bytes written."""
+        with self._lock:
+            return {
+                "stored": self.stored,
+                "deduplicated": self.deduplicated,
+                "bytes_written": self.bytes_written,
+            }
@@ -0,0 +1,159 @@
+"""Rate limiting shared by every stream and worker of the tap."""
+
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Mapping, Optional
+
+# Never slow below this many requests per second, even if headers suggest it.
+MIN_RATE = 0.1
+
+
+def _header_number(headers: Mapping[str, str], name: str) -> Optional[float]:
+    value = headers.get(name)
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def retry_after_seconds(headers: Mapping[str, str]) -> Optional[float]:
+    """Return the `Retry-After` delay in seconds, if the header is present."""
+    value = headers.get("Retry-After")
+    if value is None:
+        return None
+    seconds = _header_number(headers, "Retry-After")
+    if seconds is not None:
+        return max(seconds, 0.0)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+class RateLimiter:
+    """Token bucket that adapts its rate to Benchling's rate-limit headers.
+
+    The bucket refills at `rate` requests per second, up to `max_rate`. After each
+    response, `observe` spreads the advertised remaining requests over the time
+    left in the window, keeping `headroom` of the budget in reserve. A spent
+    window, or a 429 with `Retry-After`, pauses every caller until it resets.
+    Without a `max_rate` requests are only paced once the headers have set a
+    rate.
+    """
+
+    def __init__(
+        self,
+        max_rate: Optional[float] = None,
+        headroom: float = 0.9,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """Start with a full bucket refilling at `max_rate` per second."""
+        if max_rate is not None and max_rate <= 0:
+            raise ValueError(f"max_rate must be positive, got {max_rate}")
+        self.max_rate = max_rate
+        self.rate = max_rate
+        self.headroom = headroom
+        self.capacity = max(max_rate or 1.0, 1.0)
+        self.throttled_seconds = 0.0
+        self.throttled_requests = 0
+        self.retries = 0
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(now - self._updated, 0.0)
+        if self.rate is None:
+            self._tokens = self.capacity
+        else:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def _reserve(self) -> float:
+        """Take a token, or return how long to wait before trying again."""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            if now < self._paused_until:
+                return self._paused_until - now
+            if self.rate is None:
+                return 0.0
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self) -> float:
+        """Block until a request may be sent and return the seconds waited."""
+        waited = 0.0
+        wait = self._reserve()
+        while wait:
+            self._sleep(wait)
+            waited += wait
+            wait = self._reserve()
+        if waited:
+            with self._lock:
+                self.throttled_seconds += waited
+                self.throttled_requests += 1
+        return waited
+
+    async def acquire_async(self) -> float:
+        """Like `acquire`, but waits without blocking the event loop."""
+        waited = 0.0
+        wait = self._reserve()
+        while wait:
+            await asyncio.sleep(wait)
+            waited += wait
+            wait = self._reserve()
+        if waited:
+            with self._lock:
+                self.throttled_seconds += waited
+                self.throttled_requests += 1
+        return waited
+
+    def observe(self, headers: Mapping[str, str]) -> None:
+        """Adjust the request rate from a response's rate-limit headers."""
+        remaining = _header_number(headers, "x-rate-limit-remaining")
+        reset = _header_number(headers, "x-rate-limit-reset")
+        if remaining is None or reset is None:
+            return
+        with self._lock:
+            if remaining <= 0:
+                # The window is spent: wait for it to reset, then carry on at
+                # the current rate rather than pacing the new window's budget.
+                self._paused_until = max(self._paused_until, self._clock() + reset)
+                return
+            target = self.headroom * remaining / max(reset, 1.0)
+            self.rate = max(target, MIN_RATE)
+            if self.max_rate is None:
+                self.capacity = max(self.rate, 1.0)
+            else:
+                self.rate = min(self.max_rate, self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """Hold every caller back for `seconds`, e.g. after a `Retry-After`."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+    def record_retry(self, wait: float) -> None:
+        """Count a retried request and the time spent backing off for it."""
+        with self._lock:
+            self.retries += 1
+            self.throttled_seconds += wait
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        """Return the throttling counters."""
+        with self._lock:
+            return {
+                "rate": None if self.rate is None else round(self.rate, 3),
+                "retries": self.retries,
+                "throttled_requests": self.throttled_requests,
+                "throttled_seconds": round(self.throttled_seconds, 3),
+            }
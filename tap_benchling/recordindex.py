@@ -0,0 +1,105 @@
+"""On-disk index of emitted records, used to suppress unchanged ones between runs."""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from tap_benchling.parsing import dumps_canonical
+
+# Compact the index once this fraction of its pages is free after eviction.
+COMPACT_FREE_RATIO = 0.25
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    stream TEXT NOT NULL,
+    key TEXT NOT NULL,
+    modified_at TEXT,
+    hash BLOB NOT NULL,
+    seen_at INTEGER NOT NULL,
+    PRIMARY KEY (stream, key)
+) WITHOUT ROWID
+"""
+
+_UPSERT = """
+INSERT INTO records (stream, key, modified_at, hash, seen_at)
+VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (stream, key) DO UPDATE SET
+    modified_at = excluded.modified_at,
+    hash = excluded.hash,
+    seen_at = excluded.seen_at
+"""
+
+
+def record_digest(record: dict) -> bytes:
+    """Return a 16 byte hash of the record's canonical JSON."""
+    return hashlib.blake2b(dumps_canonical(record), digest_size=16).digest()
+
+
+class RecordIndex:
+    """SQLite table of `(stream, key, modifiedAt, hash)` for every emitted record.
+
+    All changes of a run are held in one transaction and only committed by
+    `commit`, after the sync succeeded; a failed run leaves the index as it was,
+    so its records are emitted again next time. Rows not seen for `ttl_days`
+    are evicted on commit, and the file is vacuumed once enough of it is free.
+    """
+
+    def __init__(self, path: str, ttl_days: Optional[float] = None) -> None:
+        """Open (or create) the index at `path`."""
+        self.path = path
+        self.ttl_days = ttl_days
+        self.checked: Dict[str, int] = {}
+        self.suppressed: Dict[str, int] = {}
+        self._now = int(time.time())
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute(_SCHEMA)
+        self._db.commit()
+
+    def is_unchanged(
+        self, stream: str, key: str, modified_at: Optional[str], record: dict
+    ) -> bool:
+        """Return True if the record matches the last run, recording it either way."""
+        digest = record_digest(record)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT hash FROM records WHERE stream = ? AND key = ?", (stream, key)
+            ).fetchone()
+            self._db.execute(_UPSERT, (stream, key, modified_at, digest, self._now))
+            self.checked[stream] = self.checked.get(stream, 0) + 1
+            unchanged = row is not None and row[0] == digest
+            if unchanged:
+                self.suppressed[stream] = self.suppressed.get(stream, 0) + 1
+        return unchanged
+
+    def commit(self) -> None:
+        """Persist this run's records, then evict stale rows and compact."""
+        with self._lock:
+            if self.ttl_days:
+                cutoff = self._now - int(self.ttl_days * 86400)
+                self._db.execute("DELETE FROM records WHERE seen_at < ?", (cutoff,))
+            self._db.commit()
+            free = self._db.execute("PRAGMA freelist_count").fetchone()[0]
+            pages = self._db.execute("PRAGMA page_count").fetchone()[0]
+            if pages and free / pages > COMPACT_FREE_RATIO:
+                self._db.execute("VACUUM")
+
+    def close(self) -> None:
+        """Close the index, discarding uncommitted changes."""
+        with self._lock:
+            self._db.rollback()
+            self._db.close()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Return records checked and suppressed per stream."""
+        with self._lock:
+            return {
+                stream: {
+                    "checked": checked,
+                    "suppressed": self.suppressed.get(stream, 0),
+                }
+                for stream, checked in self.checked.items()
+            }
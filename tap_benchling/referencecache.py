@@ -0,0 +1,105 @@
+"""On-disk cache of small, slowly changing reference streams such as `users`."""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from tap_benchling.parsing import dumps_canonical
+
+# Response headers kept to revalidate a cached list, and the request headers
+# sending them back.
+VALIDATORS = {"ETag": "If-None-Match", "Last-Modified": "If-Modified-Since"}
+
+# `fetch(headers)` returns the records and validators, or None for a 304.
+Fetch = Callable[[Dict[str, str]], Optional[Tuple[List[dict], Dict[str, str]]]]
+
+
+def records_digest(records: List[dict]) -> str:
+    """Return a hash of the records' canonical JSON."""
+    digest = hashlib.sha256()
+    for record in records:
+        digest.update(dumps_canonical(record))
+    return digest.hexdigest()
+
+
+class ReferenceStreamCache:
+    """Full lists of reference streams, keyed by URL, reused for `ttl` seconds.
+
+    The key holds the tenant's API URL, so one file may serve several
+    tenants. Stale lists are revalidated with the `ETag` and `Last-Modified`
+    Benchling sent, and otherwise re-fetched and compared by content, so
+    callers can tell whether anything changed since the list was cached.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Open the cache file at `path`, if it exists."""
+        self.path = path
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._resolved: Dict[str, Tuple[List[dict], bool]] = {}
+        self.counts = dict.fromkeys(("fresh", "revalidated", "fetched", "changed"), 0)
+        if os.path.exists(path):
+            with open(path) as cache_file:
+                self._entries = json.load(cache_file)
+
+    def get(self, key: str, fetch: Fetch) -> Tuple[List[dict], bool]:
+        """Return the records of `key`, and whether they changed since cached.
+
+        Lists younger than the TTL are returned without calling `fetch`. A key
+        is resolved once per run; later calls get the same list and flag.
+        """
+        with self._lock:
+            if key in self._resolved:
+                return self._resolved[key]
+            self._resolved[key] = self._get(key, fetch)
+            return self._resolved[key]
+
+    def _get(self, key: str, fetch: Fetch) -> Tuple[List[dict], bool]:
+        entry = self._entries.get(key)
+        now = self._clock()
+        if entry is not None and now - entry["fetched_at"] <= self.ttl:
+            self.counts["fresh"] += 1
+            return entry["records"], False
+        validators = entry["validators"] if entry else {}
+        result = fetch({VALIDATORS[name]: value for name, value in validators.items()})
+        if result is None and entry is not None:
+            self.counts["revalidated"] += 1
+            entry["fetched_at"] = now
+            self._save()
+            return entry["records"], False
+        assert result is not None, "A 304 needs a cached list to revalidate."
+        records, validators = result
+        digest = records_digest(records)
+        changed = entry is None or entry["digest"] != digest
+        self.counts["fetched"] += 1
+        self.counts["changed"] += changed
+        self._entries[key] = {
+            "fetched_at": now,
+            "validators": validators,
+            "digest": digest,
+            "records": records,
+        }
+        self._save()
+        return records, changed
+
+    def _save(self) -> None:
+        """Replace the file at once, so concurrent runs never read half of it."""
+        partial = f"{self.path}.{os.getpid()}.tmp"
+        with open(partial, "w") as cache_file:
+            json.dump(self._entries, cache_file)
+        os.replace(partial, self.path)
+
+    def stats(self) -> Dict[str, int]:
+        """Return lists served fresh, revalidated, fetched and found changed."""
+        with self._lock:
+            return dict(self.counts)
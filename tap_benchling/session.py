@@ -0,0 +1,53 @@
+"""HTTP session shared by every stream of the tap."""
+
+from typing import Dict
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import brotli  # noqa: F401 - lets urllib3 decode `br` responses
+except ImportError:  # pragma: no cover - optional speedup
+    brotli = None
+
+ACCEPT_ENCODING = "gzip, deflate, br" if brotli else "gzip, deflate"
+
+# Connections kept open per host when `http_pool_size` is not set.
+DEFAULT_POOL_SIZE = 10
+
+
+class PooledSession(requests.Session):
+    """Keep-alive session with one sized connection pool per host."""
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE) -> None:
+        """Mount adapters keeping up to `pool_size` connections per host."""
+        super().__init__()
+        self.headers["Accept-Encoding"] = ACCEPT_ENCODING
+        self.headers["Connection"] = "keep-alive"
+        for prefix in ("https://", "http://"):
+            self.mount(prefix, HTTPAdapter(pool_connections=4, pool_maxsize=pool_size))
+
+    def _pools(self):
+        for adapter in self.adapters.values():
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                yield pools[key]
+
+    def stats(self) -> Dict[str, float]:
+        """Return request, connection and TLS handshake counts with reuse rate.
+
+        Every new connection to an `https` host costs one TLS handshake.
+        """
+        requests_sent = connections = handshakes = 0
+        for pool in self._pools():
+            requests_sent += pool.num_requests
+            connections += pool.num_connections
+            if pool.scheme == "https":
+                handshakes += pool.num_connections
+        reused = requests_sent - connections
+        return {
+            "requests": requests_sent,
+            "connections": connections,
+            "tls_handshakes": handshakes,
+            "reuse_rate": round(reused / requests_sent, 3) if requests_sent else 0.0,
+        }
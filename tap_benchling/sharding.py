@@ -0,0 +1,225 @@
+"""Sharded syncs: streams and their partitions synced by a pool of worker processes."""
+
+import copy
+import multiprocessing
+import queue
+import traceback
+from typing import TYPE_CHECKING, Any, List, NamedTuple, Optional, cast
+
+from singer_sdk import _singerlib as singer
+from singer_sdk.helpers._state import get_state_if_exists, get_writeable_state_dict
+
+from tap_benchling.writer import DEFAULT_BUFFER_BYTES, MessageWriter, dumps_message
+
+if TYPE_CHECKING:
+    from tap_benchling.client import BenchlingStream
+    from tap_benchling.tap import TapBenchling
+
+# Kinds of the items workers put on the results queue.
+LINES = "lines"
+STATE = "state"
+DONE = "done"
+ERROR = "error"
+EXIT = "exit"
+
+# Result chunks each worker may have queued before it blocks.
+QUEUED_CHUNKS_PER_WORKER = 4
+
+
+class Shard(NamedTuple):
+    """A unit of work: a whole stream, or one partition of it."""
+
+    stream: str
+    context: Optional[dict] = None
+
+
+def plan_shards(tap: "TapBenchling") -> List[Shard]:
+    """Return the shards of every selected stream.
+
+    Window partitioned streams are split into their `modifiedAt` windows.
+    Child streams, such as `assay_results`, are split into one shard per
+    parent record, listed here; their parents are synced without them.
+    """
+    shards: List[Shard] = []
+    for top_level in tap._top_level_streams():
+        stream = cast("BenchlingStream", top_level)
+        if stream.selected and stream.is_window_partitioned:
+            shards.extend(Shard(stream.name, w) for w in stream.partitions or [])
+        elif stream.selected:
+            shards.append(Shard(stream.name))
+        children = [
+            child
+            for child in stream.child_streams
+            if child.selected or child.has_selected_descendents
+        ]
+        if not children:
+            continue
+        for record in stream.get_records(None):
+            assert isinstance(record, dict)
+            child_context = stream.get_child_context(record, None)
+            shards.extend(Shard(child.name, child_context) for child in children)
+    return shards
+
+
+def merge_shard_state(tap_state: dict, stream: Any, shard: Shard, value: dict) -> None:
+    """Copy a shard's bookmark from a worker's STATE into the tap's state."""
+    partition = stream._get_state_partition_context(shard.context)
+    source = get_state_if_exists(value, shard.stream, partition)
+    if source is None:
+        return
+    target = get_writeable_state_dict(tap_state, shard.stream, partition)
+    target.clear()
+    target.update(copy.deepcopy(source))
+
+
+class ShardWriter(MessageWriter):
+    """Send a worker's messages to the coordinator in chunks of encoded lines.
+
+    STATE messages are sent on their own, after every line before them, so
+    the coordinator can merge them.
+    """
+
+    def __init__(self, results: Any, chunk_bytes: int = DEFAULT_BUFFER_BYTES) -> None:
+        """Put chunks of up to about `chunk_bytes` on the `results` queue."""
+        self.results = results
+        self.chunk_bytes = chunk_bytes
+        self.shard: Optional[Shard] = None
+        self._buffer = bytearray()
+
+    def write(self, message: singer.Message) -> None:
+        """Buffer a message, or send the buffer and then a STATE."""
+        if isinstance(message, singer.StateMessage):
+            self.flush()
+            # The queue pickles in the background; the state keeps changing.
+            value = copy.deepcopy(message.value)
+            self.results.put((STATE, self.shard, value))
+            return
+        self._buffer += dumps_message(message)
+        if len(self._buffer) >= self.chunk_bytes:
+            self.flush()
+
+    def flush(self) -> None:
+        """Send the buffered lines."""
+        if self._buffer:
+            self.results.put((LINES, self.shard, bytes(self._buffer)))
+            self._buffer.clear()
+
+    def close(self) -> None:
+        """Send the buffered lines."""
+        self.flush()
+
+
+def sync_shard(tap: "TapBenchling", shard: Shard) -> None:
+    """Sync one shard and write its final STATE."""
+    stream = cast("BenchlingStream", tap.streams[shard.stream])
+    if shard.context is None:
+        # Child streams are shards of their own.
+        stream.child_streams = []
+        stream.sync()
+        stream.finalize_state_progress_markers()
+    else:
+        stream.sync(shard.context)
+        stream._finalize_partition(shard.context)
+    stream._write_state_message()
+
+
+def run_worker(
+    config: dict, catalog: Optional[dict], state: dict, tasks: Any, results: Any
+) -> None:
+    """Sync shards from `tasks` until a None, sending output to `results`."""
+    from tap_benchling.tap import TapBenchling
+
+    writer = ShardWriter(results)
+    shard: Optional[Shard] = None
+    try:
+        tap = TapBenchling(config=config, catalog=catalog, state=state)
+        tap._reset_state_progress_markers()
+        tap._set_compatible_replication_methods()
+        tap._open_run_clients()
+        tap.message_writer = writer
+        try:
+            for shard in iter(tasks.get, None):
+                writer.shard = shard
+                sync_shard(tap, shard)
+                writer.flush()
+                results.put((DONE, shard, None))
+        finally:
+            tap._close_run_clients()
+    except Exception:  # noqa: B902 - reported to the coordinator
+        writer.flush()
+        results.put((ERROR, shard, traceback.format_exc()))
+    results.put((EXIT, None, None))
+
+
+def sync_sharded(tap: "TapBenchling", processes: int) -> None:
+    """Sync the tap's selected streams on `processes` worker processes.
+
+    Each worker syncs whole shards, so the messages of a shard keep their
+    order; chunks of different shards interleave. Workers start from the
+    tap's state and send every STATE to the coordinator, which merges the
+    shard's bookmark into the tap's state and writes the merged STATE after
+    the records it covers. Workers share `max_requests_per_second` and the
+    rate-limit headroom evenly, since Benchling's headers count every worker.
+    """
+    shards = plan_shards(tap)
+    processes = max(min(processes, len(shards)), 1)
+    config = dict(tap.config)
+    config.update(worker_processes=1, message_writer="sdk")
+    if config.get("max_requests_per_second") is not None:
+        config["max_requests_per_second"] /= processes
+    config["rate_limit_headroom"] = config.get("rate_limit_headroom", 0.9) / processes
+    catalog = tap.input_catalog.to_dict() if tap.input_catalog else None
+    state = copy.deepcopy(tap.state)
+
+    context = multiprocessing.get_context("spawn")
+    tasks = context.Queue()
+    results = context.Queue(maxsize=processes * QUEUED_CHUNKS_PER_WORKER)
+    for shard in shards:
+        tasks.put(shard)
+    for _ in range(processes):
+        tasks.put(None)
+    workers = [
+        context.Process(
+            target=run_worker,
+            args=(config, catalog, state, tasks, results),
+            name=f"benchling-worker-{number}",
+            daemon=True,
+        )
+        for number in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    tap.logger.info("Syncing %d shards on %d worker processes.", len(shards), processes)
+    try:
+        _merge_results(tap, results, workers)
+    finally:
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+            worker.join()
+
+
+def _merge_results(tap: "TapBenchling", results: Any, workers: List[Any]) -> None:
+    """Write the workers' output and merged STATE until every worker exits."""
+    running = len(workers)
+    done = 0
+    while running:
+        try:
+            kind, shard, payload = results.get(timeout=1)
+        except queue.Empty:
+            crashed = [w.name for w in workers if w.exitcode not in (None, 0)]
+            if crashed:
+                raise RuntimeError(f"Worker processes died: {', '.join(crashed)}")
+            continue
+        if kind == LINES:
+            tap.message_writer.write_lines(payload)
+        elif kind == STATE:
+            merge_shard_state(tap.state, tap.streams[shard.stream], shard, payload)
+            tap.write_message(singer.StateMessage(value=tap.state))
+        elif kind == ERROR:
+            raise RuntimeError(f"Shard {shard} failed in a worker:\n{payload}")
+        elif kind == DONE:
+            done += 1
+            tap.logger.info("Shard %d done: %s", done, shard)
+        elif kind == EXIT:
+            running -= 1
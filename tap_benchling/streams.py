@@ -1,13 +1,23 @@
 """Stream type classes for tap-benchling."""
 
+import copy
+import re
+from collections import Counter
 from pathlib import Path
-from typing import Any, Dict, Optional, Union, List, Iterable
-
-from singer_sdk import typing as th  # JSON Schema typing helpers
+from typing import Any, Dict, Iterable, Optional, List, Type
 
 from tap_benchling.client import BenchlingStream
+from tap_benchling.enrichment import Reference
+from tap_benchling.events import ChangeSource
+from tap_benchling.fieldschemas import SchemaSource
 from singer_sdk.helpers._typing import TypeConformanceLevel
 
+SCHEMAS_DIR = Path(__file__).parent / "schemas"
+
+# Listed once per run for `assay_result_schemas`, typed fields and per-schema
+# streams alike.
+ASSAY_RESULT_SCHEMAS = SchemaSource("/assay-result-schemas", "assayResultSchemas")
+
 
 class UsersStream(BenchlingStream):
     TYPE_CONFORMANCE_LEVEL = TypeConformanceLevel.NONE
@@ -16,14 +26,8 @@ class UsersStream(BenchlingStream):
     records_jsonpath = "$.users[*]"
     primary_keys = ["id"]
     replication_key = None
-    schema = th.PropertiesList(
-        th.Property("email", th.StringType),
-        th.Property("id", th.StringType),
-        th.Property("handle", th.StringType),
-        th.Property("isSuspended", th.BooleanType),
-        th.Property("name", th.StringType),
-        th.Property("passwordLastChangedAt", th.DateTimeType)
-    ).to_dict()
+    is_reference_data = True
+    schema_filepath = SCHEMAS_DIR / "users.json"
 
 
 class DnaStream(BenchlingStream):
@@ -32,85 +36,14 @@ class DnaStream(BenchlingStream):
     path = "/dna-sequences"
     records_jsonpath = "$.dnaSequences[*]"
     primary_keys = ["id"]
-    replication_key = None
-    schema = th.PropertiesList(
-        th.Property("aliases", th.ArrayType(th.StringType)),
-        th.Property("annotations", th.ArrayType(th.ObjectType(
-            th.Property("color", th.StringType),
-            th.Property("customFields", th.ArrayType(th.ObjectType())),
-            th.Property("end", th.IntegerType),
-            th.Property("name", th.StringType),
-            th.Property("notes", th.StringType),
-            th.Property("start", th.IntegerType),
-            th.Property("strand", th.IntegerType),
-            th.Property("type", th.StringType),
-        ))),
-        th.Property("apiURL", th.StringType),
-        th.Property("archiveRecord", th.ObjectType(
-            th.Property("reason", th.StringType),
-        )),
-        th.Property("authors", th.ArrayType(th.ObjectType(
-            th.Property("handle", th.StringType),
-            th.Property("id", th.StringType),
-            th.Property("name", th.StringType),
-        ))),
-        th.Property("bases", th.StringType),
-        th.Property("createdAt", th.DateTimeType),
-        th.Property("creator", th.ObjectType(
-            th.Property("handle", th.StringType),
-            th.Property("id", th.StringType),
-            th.Property("name", th.StringType),
-        )),
-        th.Property("customFields", th.ObjectType()),
-        th.Property("dnaAlignmentIds", th.ArrayType(th.StringType)),
-        th.Property("entityRegistryId", th.StringType),
-        th.Property("fields", th.ObjectType()),
-        th.Property("folderId", th.StringType),
-        th.Property("id", th.StringType),
-        th.Property("isCircular", th.BooleanType),
-        th.Property("length", th.IntegerType),
-        th.Property("modifiedAt", th.DateTimeType),
-        th.Property("name", th.StringType),
-        th.Property("primers", th.ArrayType(
-            th.ObjectType(
-                th.Property("bases", th.StringType),
-                th.Property("bindPosition", th.IntegerType),
-                th.Property("color", th.StringType),
-                th.Property("end", th.IntegerType),
-                th.Property("name", th.StringType),
-                th.Property("oligoId", th.StringType),
-                th.Property("overhangLength", th.IntegerType),
-                th.Property("start", th.IntegerType),
-                th.Property("strand", th.IntegerType)
-            )
-        )),
-        th.Property("registrationOrigin", th.ObjectType(
-            th.Property("originEntryId", th.StringType),
-            th.Property("registeredAt", th.DateTimeType),
-        )),
-        th.Property("registryId", th.StringType),
-        th.Property("schema", th.ObjectType(
-            th.Property("id", th.StringType),
-            th.Property("name", th.StringType),
-        )),
-        th.Property("translations", th.ArrayType(th.ObjectType(
-            th.Property("aminoAcids", th.StringType),
-            th.Property("color", th.StringType),
-            th.Property("customFields", th.ArrayType(th.ObjectType())),
-            th.Property("end", th.IntegerType),
-            th.Property("geneticCode", th.StringType),
-            th.Property("name", th.StringType),
-            th.Property("notes", th.StringType),
-            th.Property("regions", th.ArrayType(th.ObjectType(
-                th.Property("end", th.IntegerType),
-                th.Property("start", th.IntegerType),
-            ))),
-            th.Property("start", th.IntegerType),
-            th.Property("strand", th.IntegerType),
-        ))),
-        th.Property("url", th.StringType),
-        th.Property("webURL", th.StringType)
-    ).to_dict()
+    replication_key = "modifiedAt"
+    partition_by_modified_at = True
+    schema_filepath = SCHEMAS_DIR / "dna-sequences.json"
+    field_schema_source = SchemaSource(
+        "/entity-schemas", "entitySchemas", "dna_sequence"
+    )
+    change_sources = [ChangeSource("entity", "seq_")]
+    offloaded_fields = ["bases"]
 
 
 class AaStream(BenchlingStream):
@@ -119,53 +52,13 @@ class AaStream(BenchlingStream):
     path = "/aa-sequences"
     records_jsonpath = "$.aaSequences[*]"
     primary_keys = ["id"]
-    replication_key = None
-    schema = th.PropertiesList(
-        th.Property("aliases", th.ArrayType(th.StringType)),
-        th.Property("aminoAcids", th.StringType),
-        th.Property("annotations", th.ArrayType(th.ObjectType(
-            th.Property("id", th.StringType),
-            th.Property("color", th.StringType),
-            th.Property("end", th.IntegerType),
-            th.Property("name", th.StringType),
-            th.Property("start", th.IntegerType),
-            th.Property("type", th.StringType),
-        ))),
-        th.Property("apiURL", th.StringType),
-        th.Property("archiveRecord", th.ObjectType(
-            th.Property("reason", th.StringType),
-        )),
-        th.Property("authors", th.ArrayType(th.ObjectType(
-            th.Property("handle", th.StringType),
-            th.Property("id", th.StringType),
-            th.Property("name", th.StringType),
-        ))),
-        th.Property("createdAt", th.DateTimeType),
-        th.Property("creator", th.ObjectType(
-            th.Property("handle", th.StringType),
-            th.Property("id", th.StringType),
-            th.Property("name", th.StringType),
-        )),
-        th.Property("customFields", th.ObjectType()),
-        th.Property("entityRegistryId", th.StringType),
-        th.Property("fields", th.ObjectType()),
-        th.Property("folderId", th.StringType),
-        th.Property("id", th.StringType),
-        th.Property("length", th.IntegerType),
-        th.Property("modifiedAt", th.DateTimeType),
-        th.Property("name", th.StringType),
-        th.Property("registrationOrigin", th.ObjectType(
-            th.Property("originEntryId", th.StringType),
-            th.Property("registeredAt", th.DateTimeType),
-        )),
-        th.Property("registryId", th.StringType),
-        th.Property("schema", th.ObjectType(
-            th.Property("id", th.StringType),
-            th.Property("name", th.StringType),
-        )),
-        th.Property("url", th.StringType),
-        th.Property("webURL", th.StringType)
-    ).to_dict()
+    replication_key = "modifiedAt"
+    schema_filepath = SCHEMAS_DIR / "aa-sequences.json"
+    field_schema_source = SchemaSource(
+        "/entity-schemas", "entitySchemas", "aa_sequence"
+    )
+    change_sources = [ChangeSource("entity", "prtn_")]
+    offloaded_fields = ["aminoAcids"]
 
 
 class CustomEntitiesStream(BenchlingStream):
@@ -174,43 +67,13 @@ class CustomEntitiesStream(BenchlingStream):
     path = "/custom-entities"
     records_jsonpath = "$.customEntities[*]"
     primary_keys = ["id"]
-    replication_key = None
-    schema = th.PropertiesList(
-        th.Property("aliases", th.ArrayType(th.StringType)),
-        th.Property("apiURL", th.StringType),
-        th.Property("archiveRecord", th.ObjectType(
-            th.Property("reason", th.StringType),
-        )),
-        th.Property("authors", th.ArrayType(th.ObjectType(
-            th.Property("handle", th.StringType),
-            th.Property("id", th.StringType),
-            th.Property("name", th.StringType),
-        ))),
-        th.Property("createdAt", th.DateTimeType),
-        th.Property("creator", th.ObjectType(
-            th.Property("handle", th.StringType),
-            th.Property("id", th.StringType),
-            th.Property("name", th.StringType),
-        )),
-        th.Property("customFields", th.ObjectType()),
-        th.Property("entityRegistryId", th.StringType),
-        th.Property("fields", th.ObjectType()),
-        th.Property("folderId", th.StringType),
-        th.Property("id", th.StringType),
-        th.Property("modifiedAt", th.DateTimeType),
-        th.Property("name", th.StringType),
-        th.Property("registrationOrigin", th.ObjectType(
-            th.Property("originEntryId", th.StringType),
-            th.Property("registeredAt", th.DateTimeType),
-        )),
-        th.Property("registryId", th.StringType),
-        th.Property("schema", th.ObjectType(
-            th.Property("id", th.StringType),
-            th.Property("name", th.StringType),
-        )),
-        th.Property("url", th.StringType),
-        th.Property("webURL", th.StringType)
-    ).to_dict()
+    replication_key = "modifiedAt"
+    partition_by_modified_at = True
+    schema_filepath = SCHEMAS_DIR / "custom-entities.json"
+    field_schema_source = SchemaSource(
+        "/entity-schemas", "entitySchemas", "custom_entity"
+    )
+    change_sources = [ChangeSource("entity", "bfi_")]
 
 
 class EntriesStream(BenchlingStream):
@@ -219,59 +82,10 @@ class EntriesStream(BenchlingStream):
     path = "/entries"
     records_jsonpath = "$.entries[*]"
     primary_keys = ["id"]
-    replication_key = None
-    schema = th.PropertiesList(
-        th.Property("apiURL", th.StringType),
-        th.Property("archiveRecord", th.ObjectType(
-            th.Property("reason", th.StringType),
-        )),
-        th.Property("assignedReviewers", th.ArrayType(th.ObjectType(
-            th.Property("handle", th.StringType),
-            th.Property("id", th.StringType),
-            th.Property("name", th.StringType),
-        ))),
-        th.Property("authors", th.ArrayType(th.ObjectType(
-            th.Property("handle", th.StringType),
-            th.Property("id", th.StringType),
-            th.Property("name", th.StringType),
-        ))),
-        th.Property("createdAt", th.DateTimeType),
-        th.Property("creator", th.ObjectType(
-            th.Property("handle", th.StringType),
-            th.Property("id", th.StringType),
-            th.Property("name", th.StringType),
-        )),
-        th.Property("customFields", th.ObjectType()),
-        th.Property("days", th.ArrayType(th.ObjectType(
-            th.Property("date", th.DateTimeType),
-            th.Property("notes", th.ArrayType(th.ObjectType(
-                th.Property("indentation", th.IntegerType),
-                th.Property("links", th.ArrayType(th.ObjectType(
-                    th.Property("id", th.StringType),
-                    th.Property("type", th.StringType),
-                    th.Property("webURL", th.StringType),
-                ))),
-                th.Property("text", th.StringType),
-                th.Property("type", th.StringType),
-                th.Property("name", th.StringType),
-            ))),
-        ))),
-        th.Property("displayId", th.StringType),
-        th.Property("entryTemplateId", th.StringType),
-        th.Property("fields", th.ObjectType()),
-        th.Property("id", th.StringType),
-        th.Property("modifiedAt", th.DateTimeType),
-        th.Property("name", th.StringType),
-        th.Property("reviewRecord", th.ObjectType(
-            th.Property("status", th.StringType)
-        )),
-        th.Property("schema", th.ObjectType(
-            th.Property("id", th.StringType),
-            th.Property("modifiedAt", th.StringType),
-            th.Property("name", th.StringType),
-        )),
-        th.Property("webURL", th.StringType)
-    ).to_dict()
+    replication_key = "modifiedAt"
+    schema_filepath = SCHEMAS_DIR / "entries.json"
+    field_schema_source = SchemaSource("/entry-schemas", "entrySchemas")
+    change_sources = [ChangeSource("entry", "etr_")]
 
 
 class MixturesStream(BenchlingStream):
@@ -280,71 +94,14 @@ class MixturesStream(BenchlingStream):
     path = "/mixtures"
     records_jsonpath = "$.mixtures[*]"
     primary_keys = ["id"]
-    replication_key = None
-    schema = th.PropertiesList(
-        th.Property("aliases", th.ArrayType(th.StringType)),
-        th.Property("allowMeasuredIngredients", th.BooleanType),
-        th.Property("amount", th.StringType),
-        th.Property("apiURL", th.StringType),
-        th.Property("archiveRecord", th.ObjectType(
-            th.Property("reason", th.StringType),
-        )),
-        th.Property("authors", th.ArrayType(th.ObjectType(
-            th.Property("handle", th.StringType),
-            th.Property("id", th.StringType),
-            th.Property("name", th.StringType),
-        ))),
-        th.Property("createdAt", th.DateTimeType),
-        th.Property("creator", th.ObjectType(
-            th.Property("handle", th.StringType),
-            th.Property("id", th.StringType),
-            th.Property("name", th.StringType),
-        )),
-        th.Property("customFields", th.ObjectType()),
-        th.Property("entityRegistryId", th.StringType),
-        th.Property("fields", th.ObjectType()),
-        th.Property("id", th.StringType),
-        th.Property("ingredients", th.ArrayType(
-            th.ObjectType(
-                th.Property("amount", th.StringType),
-                th.Property("catalogIdentifier", th.StringType),
-                th.Property("componentEntity", th.ObjectType(
-                    th.Property("entityRegistryId", th.StringType),
-                    th.Property("id", th.StringType),
-                    th.Property("name", th.StringType),
-                )),
-                th.Property("componentLotContainer", th.ObjectType(
-                    th.Property("barcode", th.StringType),
-                    th.Property("id", th.StringType),
-                    th.Property("name", th.StringType),
-                )),
-                th.Property("componentLotEntity", th.ObjectType(
-                    th.Property("entityRegistryId", th.StringType),
-                    th.Property("id", th.StringType),
-                    th.Property("name", th.StringType),
-                )),
-                th.Property("componentLotText", th.StringType),
-                th.Property("hasParent", th.BooleanType),
-                th.Property("notes", th.StringType),
-                th.Property("targetAmount", th.StringType),
-                th.Property("units", th.StringType),
-            )
-        )),
-        th.Property("modifiedAt", th.DateTimeType),
-        th.Property("name", th.StringType),
-        th.Property("registrationOrigin", th.ObjectType(
-            th.Property("originEntryId", th.StringType),
-            th.Property("registeredAt", th.DateTimeType),
-        )),
-        th.Property("registryId", th.StringType),
-        th.Property("schema", th.ObjectType(
-            th.Property("id", th.StringType),
-            th.Property("modifiedAt", th.StringType),
-            th.Property("name", th.StringType),
-        )),
-        th.Property("units", th.StringType),
-        th.Property("webURL", th.StringType),
-    ).to_dict()
+    replication_key = "modifiedAt"
+    references = [
+        Reference("ingredientEntities", "ingredients.*.componentEntity.id", many=True),
+    ]
+    schema_filepath = SCHEMAS_DIR / "mixtures.json"
+    field_schema_source = SchemaSource("/entity-schemas", "entitySchemas", "mixture")
+    # Mixtures share the `bfi_` prefix of custom entities.
+    change_sources = [ChangeSource("entity", "bfi_")]
 
 
 class ContainersStream(BenchlingStream):
@@ -353,45 +110,13 @@ class ContainersStream(BenchlingStream):
     path = "/containers"
     records_jsonpath = "$.containers[*]"
     primary_keys = ["id"]
-    replication_key = None
-    schema = th.PropertiesList(
-        th.Property("archiveRecord", th.ObjectType(
-            th.Property("reason", th.StringType),
-        )),
-        th.Property("barcode", th.StringType),
-        th.Property("checkoutRecord", th.ObjectType()),
-        th.Property("contents", th.ArrayType(th.ObjectType())),
-        th.Property("createdAt", th.DateTimeType),
-        th.Property("creator", th.ObjectType(
-            th.Property("handle", th.StringType),
-            th.Property("id", th.StringType),
-            th.Property("name", th.StringType),
-        )),
-        th.Property("fields", th.ObjectType()),
-        th.Property("id", th.StringType),
-        th.Property("modifiedAt", th.DateTimeType),
-        th.Property("name", th.StringType),
-        th.Property("parentStorageId", th.StringType),
-        th.Property("parentStorageSchema", th.ObjectType(
-            th.Property("id", th.StringType),
-            th.Property("name", th.StringType),
-        )),
-        th.Property("projectId", th.StringType),
-        th.Property("quantity", th.ObjectType(
-            th.Property("units", th.StringType),
-            th.Property("value", th.NumberType),
-        )),
-        th.Property("schema", th.ObjectType(
-            th.Property("id", th.StringType),
-            th.Property("name", th.StringType),
-        )),
-        th.Property("volume", th.ObjectType(
-            th.Property("units", th.StringType),
-            th.Property("value", th.NumberType),
-        )),
-        th.Property("webURL", th.StringType),
-    ).to_dict()
-
+    replication_key = "modifiedAt"
+    references = [
+        Reference("contentEntities", "contents.*.entity.id", many=True),
+    ]
+    schema_filepath = SCHEMAS_DIR / "containers.json"
+    field_schema_source = SchemaSource("/container-schemas", "containerSchemas")
+    change_sources = [ChangeSource("container", "con_")]
 
 
 class AssayResultSchemasStream(BenchlingStream):
@@ -401,40 +126,20 @@ class AssayResultSchemasStream(BenchlingStream):
     records_jsonpath = "$.assayResultSchemas[*]"
     primary_keys = ["id"]
     replication_key = None
-    schema = th.PropertiesList(
-        th.Property("archiveRecord", th.ObjectType(
-            th.Property("reason", th.StringType)
-        )),
-        th.Property("fieldDefinitions", th.ArrayType(
-            th.ObjectType(
-                th.Property("archiveRecord", th.ObjectType(
-                    th.Property("reason", th.StringType)
-                )),
-                th.Property("id", th.StringType),
-                th.Property("isMulti", th.BooleanType),
-                th.Property("isRequired", th.BooleanType),
-                th.Property("name", th.StringType),
-                th.Property("type", th.StringType),
-                th.Property("numericMin", th.NumberType),
-                th.Property("numericMax", th.NumberType),
-                th.Property("decimalPrecision", th.IntegerType),
-                th.Property("legalTextDropdownId", th.StringType),
-                th.Property("dropdownId", th.StringType),
-                th.Property("schemaId", th.StringType),
-            )
-        )),
-        th.Property("id", th.StringType),
-        th.Property("name", th.StringType),
-        th.Property("type", th.StringType),
-        th.Property("derivedFrom", th.StringType),
-        th.Property("organization", th.ObjectType(
-            th.Property("handle", th.StringType),
-            th.Property("id", th.StringType),
-            th.Property("name", th.StringType),
-        )),
-        th.Property("systemName", th.StringType),
-        th.Property("modifiedAt", th.DateTimeType),
-    ).to_dict()
+    is_reference_data = True
+    schema_filepath = SCHEMAS_DIR / "assay_result_schemas.json"
+
+    def request_records(self, context: Optional[dict]) -> Iterable[dict]:
+        """List the schemas from the cache `typed_fields` reads them from.
+
+        That is the reference stream cache when it is set, and otherwise the
+        schema cache, so a run never sees two versions of the list.
+        """
+        if self.tap.reference_stream_cache is not None:
+            yield from super().request_records(context)
+        else:
+            schemas = self.tap.benchling_schemas(ASSAY_RESULT_SCHEMAS)
+            yield from copy.deepcopy(schemas)
 
     def get_child_context(self, record: dict, context: Optional[dict]) -> dict:
         """Return a context dictionary for child streams."""
@@ -446,56 +151,90 @@ class AssayResultSchemasStream(BenchlingStream):
 class AssayResultsStream(BenchlingStream):
     TYPE_CONFORMANCE_LEVEL = TypeConformanceLevel.NONE
     name = "assay_results"
-    parent_stream_type = AssayResultSchemasStream
+    parent_stream_type: Optional[Type[BenchlingStream]] = AssayResultSchemasStream
     ignore_parent_replication_keys = True
     path = "/assay-results"
     records_jsonpath = "$.assayResults[*]"
     primary_keys = ["id"]
-    schema = th.PropertiesList(
-        th.Property("archiveRecord", th.ObjectType(
-            th.Property("reason", th.StringType)
-        )),
-        th.Property("createdAt", th.DateTimeType),
-        th.Property("creator", th.ObjectType(
-            th.Property("handle", th.StringType),
-            th.Property("id", th.StringType),
-            th.Property("name", th.StringType),
-        )),
-        th.Property("entryId", th.StringType),
-        th.Property("fieldValidation", th.ObjectType(
-            th.Property("additionalProp1", th.ObjectType(
-                th.Property("validationComment", th.StringType),
-                th.Property("validationStatus", th.StringType),
-            )),
-            th.Property("additionalProp2", th.ObjectType(
-                th.Property("validationComment", th.StringType),
-                th.Property("validationStatus", th.StringType),
-            )),
-            th.Property("additionalProp3", th.ObjectType(
-                th.Property("validationComment", th.StringType),
-                th.Property("validationStatus", th.StringType),
-            ))
-        )),
-        th.Property("fields", th.ObjectType()),
-        th.Property("id", th.StringType),
-        th.Property("isReviewed", th.BooleanType),
-        th.Property("modifiedAt", th.DateTimeType),
-        th.Property("projectId", th.StringType),
-        th.Property("schema", th.ObjectType(
-            th.Property("id", th.StringType),
-            th.Property("name", th.StringType),
-        )),
-        th.Property("validationComment", th.StringType),
-        th.Property("validationStatus", th.StringType),
-    ).to_dict()
+    replication_key = "modifiedAt"
+    references = [Reference("entry", "entryId")]
+    schema_filepath = SCHEMAS_DIR / "assay_results.json"
+    field_schema_source = ASSAY_RESULT_SCHEMAS
+    change_sources = [ChangeSource("assayResult")]
+    derived_properties = {"schema_id": "schema"}
+
+    def post_process(self, row: dict, context: Optional[dict] = None) -> dict:
+        """Set `schema_id` from the result's schema, whichever way it was listed."""
+        schema = row.get("schema")
+        if isinstance(schema, dict) and schema.get("id"):
+            row["schema_id"] = schema["id"]
+        return row
 
     def get_url_params(
         self, context: Optional[dict], next_page_token: Optional[Any]
     ) -> Dict[str, Any]:
         """Return a dictionary of values to be used in URL parameterization."""
-        params: dict = {
-            "schemaId": context["schema_id"]
-        }
-        if next_page_token:
-            params["nextToken"] = next_page_token
+        params = super().get_url_params(context, next_page_token)
+        schema_id = self.get_schema_id(context)
+        if schema_id:
+            params["schemaId"] = schema_id
+        return params
+
+    def get_schema_id(self, context: Optional[dict]) -> Optional[str]:
+        """Return the id of the assay result schema to page, if any.
+
+        Only `cdc_mode` re-fetches of changed IDs span every schema.
+        """
+        return (context or {}).get("schema_id")
+
+    def get_replication_key_params(self, context: Optional[dict]) -> dict:
+        """Return the `modifiedAt` filter in the assay results dotted syntax."""
+        start, end = self.get_modified_at_range(context)
+        params = {}
+        if start:
+            params["modifiedAt.gte"] = start.isoformat()
+        if end:
+            params["modifiedAt.lt"] = end.isoformat()
         return params
+
+
+def _slug(key: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", key.lower()).strip("_")
+
+
+class SchemaAssayResultsStream(AssayResultsStream):
+    """Assay results of one schema, synced as a stream with its own bookmark."""
+
+    parent_stream_type = None
+
+    def __init__(self, tap: Any, assay_schema: dict, name: str) -> None:
+        """Create the stream of one assay result schema, named by `names_for`."""
+        self.assay_schema = assay_schema
+        super().__init__(tap=tap, name=name)
+
+    @staticmethod
+    def names_for(assay_schemas: List[dict]) -> Dict[str, str]:
+        """Return the stream name of each schema id.
+
+        Names are `assay_results_<systemName>`, falling back to the schema id.
+        Schemas whose names slug to the same stream name are all suffixed with
+        their schema id, so no stream replaces another.
+        """
+        slugs = {
+            schema["id"]: _slug(schema.get("systemName") or schema["id"])
+            for schema in assay_schemas
+        }
+        counts = Counter(slugs.values())
+        return {
+            schema_id: "assay_results_"
+            + (slug if counts[slug] == 1 else f"{slug}_{_slug(schema_id)}")
+            for schema_id, slug in slugs.items()
+        }
+
+    def get_schema_id(self, context: Optional[dict]) -> str:
+        """Return the id of this stream's assay result schema."""
+        return self.assay_schema["id"]
+
+    def get_field_schemas(self) -> List[dict]:
+        """Type `fields` from this stream's schema alone."""
+        return [self.assay_schema]
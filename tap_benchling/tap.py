@@ -1,12 +1,40 @@
 """Benchling tap class."""
 
-from typing import List
+import copy
+import datetime
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Type
 
 from singer_sdk import Tap, Stream
+from singer_sdk import _singerlib as singer
 from singer_sdk import typing as th  # JSON schema typing helpers
 
+from tap_benchling.aio import AsyncEngine
+from tap_benchling.client import ListEndpointStream
+from tap_benchling.enrichment import LRUCache
+from tap_benchling.events import (
+    EVENTS_BOOKMARK,
+    ChangeSet,
+    changed_resources,
+    is_removal,
+)
+from tap_benchling.fieldschemas import SchemaCache, SchemaSource
+from tap_benchling.payloads import COMPRESSIONS, PayloadStore
+from tap_benchling.ratelimit import RateLimiter
+from tap_benchling.recordindex import RecordIndex
+from tap_benchling.referencecache import VALIDATORS, ReferenceStreamCache
+from tap_benchling.session import DEFAULT_POOL_SIZE, PooledSession
+from tap_benchling.sharding import sync_sharded
+from tap_benchling.telemetry import SamplingProfiler, Telemetry
+from tap_benchling.writer import (
+    COMPRESSIONS as MESSAGE_COMPRESSIONS,
+    DEFAULT_BUFFER_BYTES,
+    BufferedMessageWriter,
+    MessageWriter,
+)
 from tap_benchling.streams import (
-    BenchlingStream,
     UsersStream,
     DnaStream,
     AaStream,
@@ -16,6 +44,7 @@ from tap_benchling.streams import (
     ContainersStream,
     AssayResultSchemasStream,
     AssayResultsStream,
+    SchemaAssayResultsStream,
 )
 
 STREAM_TYPES = [
@@ -33,6 +62,7 @@ STREAM_TYPES = [
 
 class TapBenchling(Tap):
     """Benchling tap class."""
+
     name = "tap-benchling"
 
     config_jsonschema = th.PropertiesList(
@@ -41,20 +71,730 @@ class TapBenchling(Tap):
             th.StringType,
             required=True,
             secret=True,  # Flag config as protected.
-            description="The token to authenticate against the API service"
+            description="The token to authenticate against the API service",
         ),
         th.Property(
             "api_url",
             th.StringType,
             default="https://api.mysample.com",
-            description="The url for the API service"
+            description="The url for the API service",
+        ),
+        th.Property(
+            "start_date",
+            th.DateTimeType,
+            description="The earliest `modifiedAt` to sync on the first run",
+        ),
+        th.Property(
+            "page_size",
+            th.IntegerType,
+            description="Records per list request, defaults to the API maximum",
+        ),
+        th.Property(
+            "stream_page_sizes",
+            th.ObjectType(),
+            description="Per-stream `page_size` overrides keyed by stream name",
+        ),
+        th.Property(
+            "streaming_parse",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Parse records while each page downloads, bounding memory by one "
+                "record instead of one page"
+            ),
+        ),
+        th.Property(
+            "enrich_references",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Resolve referenced IDs, such as assay result entries and mixture "
+                "ingredients, into full records via bulk-get requests"
+            ),
+        ),
+        th.Property(
+            "reference_cache_size",
+            th.IntegerType,
+            default=10000,
+            description="Most resolved references kept in memory for reuse",
+        ),
+        th.Property(
+            "record_index_path",
+            th.StringType,
+            description=(
+                "SQLite file indexing the records emitted by past runs; records "
+                "unchanged since then are not emitted again"
+            ),
+        ),
+        th.Property(
+            "record_index_ttl_days",
+            th.NumberType,
+            default=30,
+            description="Forget indexed records not seen for this many days",
+        ),
+        th.Property(
+            "payload_offload_url",
+            th.StringType,
+            description=(
+                "Directory or PyFilesystem URL, e.g. `s3://bucket/prefix` with the "
+                "`s3` extra, to write DNA `bases` and AA `aminoAcids` to; records "
+                "carry a content-addressed `basesRef`/`aminoAcidsRef` instead"
+            ),
+        ),
+        th.Property(
+            "payload_offload_compression",
+            th.StringType,
+            default="gzip",
+            allowed_values=list(COMPRESSIONS),
+            description="Compression of offloaded payload files",
+        ),
+        th.Property(
+            "payload_offload_min_length",
+            th.IntegerType,
+            default=1024,
+            description="Shorter payloads are kept inline in the record",
+        ),
+        th.Property(
+            "conform_records",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Drop properties not in the stream schema, write `date-time` "
+                "values as UTC ISO 8601 and numeric strings as numbers"
+            ),
+        ),
+        th.Property(
+            "typed_fields",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Type each schema field of `fields` from Benchling's schema "
+                "definitions, fetched during discovery"
+            ),
+        ),
+        th.Property(
+            "schema_cache_ttl_seconds",
+            th.NumberType,
+            default=3600,
+            description="How long fetched Benchling schema definitions are reused",
+        ),
+        th.Property(
+            "schema_cache_path",
+            th.StringType,
+            description=(
+                "JSON file keeping fetched schema definitions between runs, "
+                "for up to `schema_cache_ttl_seconds`"
+            ),
+        ),
+        th.Property(
+            "reference_cache_path",
+            th.StringType,
+            description=(
+                "JSON file keeping the `users` and `assay_result_schemas` lists "
+                "between runs, keyed by API URL"
+            ),
+        ),
+        th.Property(
+            "reference_cache_ttl_seconds",
+            th.NumberType,
+            default=3600,
+            description=(
+                "How long cached reference lists are used as they are; older ones "
+                "are revalidated with their ETag or re-fetched"
+            ),
+        ),
+        th.Property(
+            "reference_cache_skip_unchanged",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Emit no records for a reference stream whose list has not changed "
+                "since it was cached; child streams still sync"
+            ),
+        ),
+        th.Property(
+            "assay_results_per_schema",
+            th.BooleanType,
+            default=False,
+            description=(
+                "Sync each assay result schema as its own `assay_results_<name>` "
+                "stream with its own bookmark, instead of one `assay_results`"
+            ),
+        ),
+        th.Property(
+            "cdc_mode",
+            th.BooleanType,
+            default=False,
+            description=(
+                "After a first full sync, read Benchling's events feed and "
+                "re-fetch only the changed records; archived and deleted ones "
+                "are emitted with `_sdc_deleted_at`. Streams the feed covers are "
+                "not polled from their bookmarks in later runs"
+            ),
+        ),
+        th.Property(
+            "state_message_interval",
+            th.IntegerType,
+            description=(
+                "Write STATE every this many records of a stream, so an "
+                "interrupted sync resumes close to where it stopped; the SDK "
+                "default is 10000"
+            ),
+        ),
+        th.Property(
+            "partition_concurrency",
+            th.IntegerType,
+            default=1,
+            description=(
+                "Maximum number of partitions, such as assay result schemas, "
+                "paged at once"
+            ),
+        ),
+        th.Property(
+            "partition_window_days",
+            th.IntegerType,
+            description=(
+                "Split the large registry streams into `modifiedAt` windows of "
+                "this many days from `start_date`, paged in parallel"
+            ),
+        ),
+        th.Property(
+            "stream_concurrency",
+            th.IntegerType,
+            default=1,
+            description="Maximum number of independent streams synced at once",
+        ),
+        th.Property(
+            "worker_processes",
+            th.IntegerType,
+            default=1,
+            description=(
+                "Split the selected streams, assay result schemas and "
+                "`modifiedAt` windows across this many worker processes, whose "
+                "output and bookmarks are merged; not with `record_index_path`"
+            ),
+        ),
+        th.Property(
+            "http_engine",
+            th.StringType,
+            default="requests",
+            allowed_values=["requests", "asyncio"],
+            description=(
+                "`asyncio` sends every request from one event loop, keeping all "
+                "partitions of a stream in flight at once (needs the `async` extra)"
+            ),
+        ),
+        th.Property(
+            "http_pool_size",
+            th.IntegerType,
+            description=(
+                "Connections kept open to Benchling, defaults to enough for "
+                "`stream_concurrency` times `partition_concurrency` workers"
+            ),
+        ),
+        th.Property(
+            "telemetry_path",
+            th.StringType,
+            description=(
+                "JSON file to write per-stream stage timings, request latency "
+                "histograms and volumes to at the end of the run"
+            ),
+        ),
+        th.Property(
+            "profile_path",
+            th.StringType,
+            description=(
+                "Sample every thread's stack during the sync and write them to "
+                "this file in collapsed stack format, for flame graphs"
+            ),
+        ),
+        th.Property(
+            "profile_interval_ms",
+            th.NumberType,
+            default=10,
+            description="Milliseconds between stack samples with `profile_path`",
+        ),
+        th.Property(
+            "message_writer",
+            th.StringType,
+            default="sdk",
+            allowed_values=["sdk", "buffered"],
+            description=(
+                "`buffered` encodes messages with orjson (from the `speedups` "
+                "extra) and writes them to stdout in large chunks"
+            ),
+        ),
+        th.Property(
+            "message_buffer_bytes",
+            th.IntegerType,
+            default=DEFAULT_BUFFER_BYTES,
+            description=(
+                "Bytes of messages the buffered writer holds before writing; "
+                "STATE messages are always written at once"
+            ),
+        ),
+        th.Property(
+            "message_compression",
+            th.StringType,
+            default="none",
+            allowed_values=list(MESSAGE_COMPRESSIONS),
+            description="Compress the buffered writer's output as a gzip stream",
+        ),
+        th.Property(
+            "max_requests_per_second",
+            th.NumberType,
+            description=(
+                "Request rate cap shared by every stream and worker; unset, "
+                "requests are only paced by Benchling's rate-limit headers"
+            ),
+        ),
+        th.Property(
+            "rate_limit_headroom",
+            th.NumberType,
+            default=0.9,
+            description=(
+                "Fraction of the rate advertised by Benchling's rate-limit "
+                "headers that the tap may use"
+            ),
         ),
     ).to_dict()
 
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Initialize the tap, its shared message writer and HTTP session."""
+        self._message_lock = threading.Lock()
+        self._authenticator: Optional[Any] = None
+        self._async_engine: Optional[AsyncEngine] = None
+        self._engine_lock = threading.Lock()
+        self.record_index: Optional[RecordIndex] = None
+        self.payload_store: Optional[PayloadStore] = None
+        self.message_writer = MessageWriter()
+        # Merged view of every stream's bookmarks while streams run concurrently.
+        self._merged_state: Optional[dict] = None
+        self._schema_cache: Optional[SchemaCache] = None
+        self.reference_stream_cache: Optional[ReferenceStreamCache] = None
+        super().__init__(*args, **kwargs)
+        self._create_shared_clients()
+
+    def _create_shared_clients(self) -> None:
+        """Create the rate limiter, HTTP session and caches used by all streams.
+
+        Runs before the first stream is built, since building a stream may
+        already request Benchling's schemas.
+        """
+        if getattr(self, "http_session", None) is not None:
+            return
+        self.rate_limiter = RateLimiter(
+            max_rate=self.config.get("max_requests_per_second"),
+            headroom=self.config.get("rate_limit_headroom", 0.9),
+        )
+        self.http_session = PooledSession(self.http_pool_size)
+        self.telemetry = Telemetry()
+        self.reference_cache = LRUCache(
+            self.config.get("reference_cache_size") or 10000
+        )
+        self._schema_cache = SchemaCache(
+            ttl=self.config.get("schema_cache_ttl_seconds", 3600),
+            path=self.config.get("schema_cache_path"),
+        )
+        if self.config.get("reference_cache_path"):
+            self.reference_stream_cache = ReferenceStreamCache(
+                self.config["reference_cache_path"],
+                ttl=self.config.get("reference_cache_ttl_seconds", 3600),
+            )
+
+    def benchling_schemas(self, source: SchemaSource) -> List[dict]:
+        """Return the schemas listed by a schema endpoint, e.g. `/entry-schemas`.
+
+        Lists are fetched once and then reused until `schema_cache_ttl_seconds`
+        has passed. Lists synced as reference streams, such as assay result
+        schemas, come from the reference stream cache when it is set, so the
+        stream and its fields read the same version.
+        """
+        assert self._schema_cache is not None
+        reference_paths = {t.path for t in STREAM_TYPES if t.is_reference_data}
+        if self.reference_stream_cache is not None and source.path in reference_paths:
+            schemas, _ = self.reference_list(source.path, source.records_key)
+        else:
+            schemas = self._schema_cache.get(
+                self.config["api_url"] + source.path,
+                lambda: self._fetch_schemas(source),
+            )
+        if source.type:
+            schemas = [s for s in schemas if s.get("type") == source.type]
+        return schemas
+
+    def _fetch_schemas(self, source: SchemaSource) -> List[dict]:
+        """Page through a schema endpoint with the shared session and limiter."""
+        return list(self._get_all(source.path, source.records_key, {}))
+
+    def reference_list(self, path: str, records_key: str) -> Tuple[List[dict], bool]:
+        """Return a list kept by the reference stream cache, and if it changed.
+
+        Lists are keyed by the tenant's API URL and the endpoint path.
+        """
+        assert self.reference_stream_cache is not None
+        return self.reference_stream_cache.get(
+            self.config["api_url"] + path,
+            lambda headers: self._fetch_reference_list(path, records_key, headers),
+        )
+
+    def _fetch_reference_list(
+        self, path: str, records_key: str, headers: Dict[str, str]
+    ) -> Optional[Tuple[List[dict], Dict[str, str]]]:
+        """Page the whole list, sending `headers` with the first request.
+
+        Returns None when Benchling answers the first request with a 304,
+        otherwise the records and the validators of the first response.
+        """
+        endpoint = ListEndpointStream(self, path, records_key, {})
+        records: List[dict] = []
+        validators: Dict[str, str] = {}
+        for page, response in enumerate(endpoint._pages(None, headers)):
+            if not page:
+                if response.status_code == 304:
+                    return None
+                validators = {
+                    name: response.headers[name]
+                    for name in VALIDATORS
+                    if name in response.headers
+                }
+            records.extend(endpoint.parse_response(response))
+        return records, validators
+
+    def _get_all(self, path: str, records_key: str, params: dict) -> Iterator[dict]:
+        """Yield every record of a list endpoint, paged like the streams are."""
+        endpoint = ListEndpointStream(self, path, records_key, params)
+        for response in endpoint._pages(None):
+            yield from endpoint.parse_response(response)
+
+    @property
+    def http_pool_size(self) -> int:
+        """Return the number of connections to keep open to the API."""
+        workers = (self.config.get("stream_concurrency") or 1) * (
+            self.config.get("partition_concurrency") or 1
+        )
+        return self.config.get("http_pool_size") or max(workers, DEFAULT_POOL_SIZE)
+
+    @property
+    def async_engine(self) -> Optional[AsyncEngine]:
+        """Return the shared asyncio engine, if `http_engine` selects it."""
+        if self.config.get("http_engine") != "asyncio":
+            return None
+        with self._engine_lock:
+            if self._async_engine is None:
+                self._async_engine = AsyncEngine(self.http_pool_size)
+            return self._async_engine
+
     def discover_streams(self) -> List[Stream]:
-        """Return a list of discovered streams."""
-        return [stream_class(tap=self) for stream_class in STREAM_TYPES]
+        """Return a list of discovered streams.
+
+        With an input catalog only the selected streams, and the parents that
+        sync them, are built; each stream loads its JSON schema when built.
+        With `assay_results_per_schema` every assay result schema gets its own
+        stream in place of `assay_results`.
+        """
+        self._create_shared_clients()
+        streams: List[Stream] = [
+            stream_class(tap=self) for stream_class in self._stream_types()
+        ]
+        if self.config.get("assay_results_per_schema"):
+            source = AssayResultsStream.field_schema_source
+            assay_schemas = self.benchling_schemas(source)
+            names = SchemaAssayResultsStream.names_for(assay_schemas)
+            for assay_schema in assay_schemas:
+                name = names[assay_schema["id"]]
+                if self._is_selected(name):
+                    streams.append(SchemaAssayResultsStream(self, assay_schema, name))
+        return streams
+
+    def _is_selected(self, name: str) -> bool:
+        """Return True if there is no input catalog or it selects the stream."""
+        catalog = self.input_catalog
+        if catalog is None:
+            return True
+        entry = catalog.get_stream(name)
+        return bool(entry and entry.metadata.resolve_selection()[()])
+
+    def _stream_types(self) -> List[type]:
+        """Return the stream classes to build for discovery or the catalog."""
+        stream_types = STREAM_TYPES
+        if self.config.get("assay_results_per_schema"):
+            stream_types = [t for t in STREAM_TYPES if t is not AssayResultsStream]
+        needed = set()
+        for stream_class in stream_types:
+            if not self._is_selected(stream_class.name):
+                continue
+            required: Optional[Type[Stream]] = stream_class
+            while required is not None:
+                needed.add(required)
+                required = required.parent_stream_type
+        return [stream_class for stream_class in stream_types if stream_class in needed]
+
+    def write_message(self, message: singer.Message) -> None:
+        """Write a Singer message, one at a time across all streams.
+
+        While streams run concurrently each one keeps its bookmarks in a private
+        state dict. Its STATE messages are merged into one tap-wide state here.
+        """
+        with self._message_lock:
+            merged = self._merged_state
+            if isinstance(message, singer.StateMessage) and merged is not None:
+                bookmarks = copy.deepcopy(message.value.get("bookmarks", {}))
+                merged["bookmarks"].update(bookmarks)
+                message = singer.StateMessage(value=merged)
+            self.message_writer.write(message)
+
+    # The SDK marks `sync_all` final but has no other hook around the run: the
+    # CLI calls it directly. The serial path still runs the SDK's `sync_all`.
+    def sync_all(self) -> None:  # type: ignore[misc]
+        """Sync all streams, running up to `stream_concurrency` at once."""
+        max_workers = self.config.get("stream_concurrency") or 1
+        self._open_run_clients()
+        profiler = None
+        if self.config.get("profile_path"):
+            interval = self.config.get("profile_interval_ms", 10) / 1000
+            profiler = SamplingProfiler(interval)
+            profiler.start()
+        try:
+            if self.config.get("cdc_mode"):
+                self._sync_changes(max_workers)
+            else:
+                self._sync_streams(max_workers)
+            if self.record_index is not None:
+                self.record_index.commit()
+        finally:
+            if profiler is not None:
+                profiler.stop()
+                profiler.write(self.config["profile_path"])
+            self._close_run_clients()
+        self._log_summaries()
+
+    def _open_run_clients(self) -> None:
+        """Open the message writer, record index and payload store of this run."""
+        if self.config.get("message_writer") == "buffered":
+            self.message_writer = BufferedMessageWriter(
+                buffer_bytes=self.config.get(
+                    "message_buffer_bytes", DEFAULT_BUFFER_BYTES
+                ),
+                compression=self.config.get("message_compression", "none"),
+            )
+        if self.config.get("record_index_path"):
+            self.record_index = RecordIndex(
+                self.config["record_index_path"],
+                ttl_days=self.config.get("record_index_ttl_days"),
+            )
+        if self.config.get("payload_offload_url"):
+            self.payload_store = PayloadStore(
+                self.config["payload_offload_url"],
+                compression=self.config.get("payload_offload_compression", "gzip"),
+            )
+
+    def _close_run_clients(self) -> None:
+        """Flush the message writer and close the engine, index and store."""
+        self.message_writer.close()
+        self.message_writer = MessageWriter()
+        if self._async_engine is not None:
+            self._async_engine.close()
+            self._async_engine = None
+        if self.record_index is not None:
+            self.record_index.close()
+        if self.payload_store is not None:
+            self.payload_store.close()
+
+    def _sync_streams(self, max_workers: int) -> None:
+        """Sync every selected stream from its own bookmark.
+
+        With `worker_processes` the streams are sharded across processes. The
+        record index cannot be shared between them, so it keeps the sync here.
+        """
+        processes = self.config.get("worker_processes") or 1
+        if processes > 1 and self.record_index is not None:
+            self.logger.warning(
+                "`worker_processes` is ignored with `record_index_path`."
+            )
+        elif processes > 1:
+            sync_sharded(self, processes)
+            return
+        if max_workers <= 1:
+            super().sync_all()
+        else:
+            self._sync_all_concurrently(max_workers)
+
+    def _sync_changes(self, max_workers: int) -> None:
+        """Sync the records changed since the events cursor, for `cdc_mode`.
+
+        Without a cursor the streams are synced in full first, and events are
+        read from the time that sync started on the next run. Streams that
+        events do not cover, such as `users` and `assay_result_schemas`, are
+        synced from their bookmarks, without the child streams events feed.
+        Streams with change sources are not polled from their bookmarks: a
+        change Benchling sends no event for is only picked up by a full sync.
+
+        A removed ID may match several streams by its prefix. Each of them
+        re-lists it, and if none still returns it, only the first selected
+        stream it matched gets its soft-delete stub.
+        """
+        bookmarks = self.state.setdefault("bookmarks", {})
+        cursor = bookmarks.get(EVENTS_BOOKMARK)
+        if not cursor:
+            started = datetime.datetime.now(datetime.timezone.utc).isoformat()
+            self._sync_streams(max_workers)
+            self._write_cursor({"createdAt": started})
+            return
+        changes, last_event = self._read_events(cursor)
+        self.logger.info("Change summary: %s", json.dumps(changes.stats()))
+        for stream in self._top_level_streams():
+            if getattr(stream, "change_sources", None):
+                continue
+            children = stream.child_streams
+            # Children fed by events are re-fetched from them below.
+            stream.child_streams = [c for c in children if not _has_changes(c)]
+            try:
+                stream.sync()
+            finally:
+                stream.child_streams = children
+        changed = [
+            (stream, changes.changes[stream.name])
+            for stream in self.streams.values()
+            if stream.selected and changes.changes.get(stream.name)
+        ]
+        found: Set[str] = set()
+        for stream, stream_changes in changed:
+            found |= stream.sync_changes(stream_changes)  # type: ignore[attr-defined]
+        for stream, stream_changes in changed:
+            removed = {
+                entity_id: removed_at
+                for entity_id, removed_at in stream_changes.items()
+                if removed_at and entity_id not in found
+            }
+            if removed:
+                stream.write_removed(removed)  # type: ignore[attr-defined]
+                found.update(removed)
+        if last_event:
+            self._write_cursor({"eventId": last_event})
+
+    def _read_events(self, cursor: dict) -> Tuple[ChangeSet, Optional[str]]:
+        """Return the IDs changed per stream after `cursor`, and the last event."""
+        if "eventId" in cursor:
+            params = {"startingAfter": cursor["eventId"]}
+        else:
+            params = {"createdAt.gte": cursor["createdAt"]}
+        sources = [
+            (stream.name, source)
+            for stream in self.streams.values()
+            for source in getattr(stream, "change_sources", [])
+        ]
+        changes = ChangeSet()
+        last_event = None
+        for event in self._get_all("/events", "events", params):
+            changes.events += 1
+            last_event = event["id"]
+            removed_at = event.get("createdAt") if is_removal(event) else None
+            for resource, entity_id in changed_resources(event):
+                for name, source in sources:
+                    if source.matches(resource, entity_id):
+                        changes.add(name, entity_id, removed_at)
+        return changes, last_event
+
+    def _write_cursor(self, cursor: dict) -> None:
+        """Store the events cursor in state and emit it."""
+        self.state["bookmarks"][EVENTS_BOOKMARK] = cursor
+        self.write_message(singer.StateMessage(value=self.state))
+
+    def _log_summaries(self) -> None:
+        """Log the throttling, connection and cache counters of the sync."""
+        self.logger.info(
+            "Rate limiter summary: %s", json.dumps(self.rate_limiter.stats())
+        )
+        self.logger.info(
+            "HTTP connection summary: %s", json.dumps(self.http_session.stats())
+        )
+        if self.config.get("enrich_references"):
+            self.logger.info(
+                "Reference cache summary: %s",
+                json.dumps(self.reference_cache.stats()),
+            )
+        if self.reference_stream_cache is not None:
+            self.logger.info(
+                "Reference stream cache summary: %s",
+                json.dumps(self.reference_stream_cache.stats()),
+            )
+        if self.record_index is not None:
+            self.logger.info(
+                "Record index summary: %s", json.dumps(self.record_index.stats())
+            )
+        if self.payload_store is not None:
+            self.logger.info(
+                "Payload store summary: %s", json.dumps(self.payload_store.stats())
+            )
+        if self.config.get("message_writer") == "buffered":
+            self.logger.info(
+                "Message writer summary: %s", json.dumps(self.message_writer.stats())
+            )
+        self.telemetry.log_metrics()
+        telemetry = self.telemetry.summary()
+        self.logger.info("Stream telemetry summary: %s", json.dumps(telemetry))
+        if self.config.get("telemetry_path"):
+            with open(self.config["telemetry_path"], "w") as telemetry_file:
+                json.dump(telemetry, telemetry_file, indent=2, sort_keys=True)
+
+    def _sync_all_concurrently(self, max_workers: int) -> None:
+        """Sync independent streams on a thread pool of `max_workers`."""
+        self._reset_state_progress_markers()
+        self._set_compatible_replication_methods()
+        streams = self._top_level_streams()
+        bookmarks = self.state.setdefault("bookmarks", {})
+        for stream in self.streams.values():
+            bookmarks.setdefault(stream.name, {})
+        self._merged_state = copy.deepcopy(self.state)
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                futures = [pool.submit(self._sync_stream, s) for s in streams]
+                for future in as_completed(futures):
+                    if future.exception():
+                        for pending in futures:
+                            pending.cancel()
+                    future.result()
+        finally:
+            self._merged_state = None
+
+        for stream in self.streams.values():
+            stream.log_sync_costs()
+
+    def _top_level_streams(self) -> List[Stream]:
+        """Return the selected streams that are not synced by a parent."""
+        streams = []
+        for stream in self.streams.values():
+            if stream.parent_stream_type:
+                continue
+            if not stream.selected and not stream.has_selected_descendents:
+                self.logger.info(f"Skipping deselected stream '{stream.name}'.")
+                continue
+            streams.append(stream)
+        return streams
+
+    def _sync_stream(self, stream: Stream) -> None:
+        """Sync one top-level stream and its children against a private state."""
+        group = [stream] + stream.descendent_streams
+        private_state = {
+            "bookmarks": {s.name: self.state["bookmarks"][s.name] for s in group}
+        }
+        for member in group:
+            member._tap_state = private_state
+        try:
+            stream.sync()
+            stream.finalize_state_progress_markers()
+            stream._write_state_message()
+        finally:
+            for member in group:
+                member._tap_state = self.state
 
 
 if __name__ == "__main__":
     TapBenchling.cli()
+
+
+def _has_changes(stream: Stream) -> bool:
+    """Return True if events feed the stream or any of its descendants."""
+    family = [stream] + stream.descendent_streams
+    return any(getattr(s, "change_sources", None) for s in family)
@@ -0,0 +1,219 @@
+"""Per-stream stage timings, request latency histograms and a sampling profiler."""
+
+import collections
+import json
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from singer_sdk import metrics
+
+# Upper bounds, in seconds, of the request latency histogram buckets.
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf"))
+
+# Stages timed for every stream, in the order a page goes through them.
+STAGES = ("request", "parse", "paginate", "enrich", "transform", "write")
+
+
+class MetricPoint(NamedTuple):
+    """A METRIC measurement named outside the SDK's `metrics.Metric` enum.
+
+    It renders as the same JSON as `metrics.Point`.
+    """
+
+    metric_type: str
+    metric: str
+    value: Any
+    tags: Dict[str, Any]
+
+    def __str__(self) -> str:
+        """Return the point as JSON."""
+        return json.dumps(self._asdict(), default=str)
+
+
+class StreamTelemetry:
+    """Time spent per stage, request latencies and volumes of one stream.
+
+    `request` is the wait for response headers, or for the whole body when
+    responses are not streamed; `parse` covers reading the body and splitting
+    records; `transform` is building RECORD messages; `write` is time blocked
+    serializing and writing messages to stdout.
+    """
+
+    def __init__(self) -> None:
+        """Start with every counter at zero."""
+        self.stages: Dict[str, float] = dict.fromkeys(STAGES, 0.0)
+        self.latencies = [0] * len(LATENCY_BUCKETS)
+        self.requests = 0
+        self.records = 0
+        self.bytes_received = 0
+        self._first: Optional[float] = None
+        self._last = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float) -> None:
+        """Add `seconds` to a stage."""
+        now = time.perf_counter()
+        with self._lock:
+            self.stages[stage] += seconds
+            self._mark(now - seconds, now)
+
+    def observe_request(self, seconds: float) -> None:
+        """Count a request and its latency."""
+        now = time.perf_counter()
+        bucket = next(i for i, bound in enumerate(LATENCY_BUCKETS) if seconds <= bound)
+        with self._lock:
+            self.stages["request"] += seconds
+            self.latencies[bucket] += 1
+            self.requests += 1
+            self._mark(now - seconds, now)
+
+    def observe_record(self, transform_seconds: float) -> None:
+        """Count a record and the time spent turning it into messages."""
+        with self._lock:
+            self.stages["transform"] += transform_seconds
+            self.records += 1
+
+    def add_bytes(self, count: int) -> None:
+        """Count response body bytes received."""
+        with self._lock:
+            self.bytes_received += count
+
+    def timed(self, stage: str, items: Iterable[Any]) -> Iterator[Any]:
+        """Yield from `items`, adding the time spent producing them to `stage`."""
+        iterator = iter(items)
+        while True:
+            started = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.add(stage, time.perf_counter() - started)
+                return
+            self.add(stage, time.perf_counter() - started)
+            yield item
+
+    def _mark(self, start: float, end: float) -> None:
+        if self._first is None or start < self._first:
+            self._first = start
+        self._last = max(self._last, end)
+
+    def summary(self) -> Dict[str, Any]:
+        """Return the stream's counters as a JSON-serializable dict."""
+        with self._lock:
+            seconds = self._last - self._first if self._first is not None else 0.0
+            return {
+                "records": self.records,
+                "requests": self.requests,
+                "bytes_received": self.bytes_received,
+                "seconds": round(seconds, 3),
+                "records_per_second": round(self.records / seconds, 1)
+                if seconds
+                else 0.0,
+                "stages": {
+                    stage: round(value, 3) for stage, value in self.stages.items()
+                },
+                "request_latency": {
+                    f"le_{bound:g}": count
+                    for bound, count in zip(LATENCY_BUCKETS, self.latencies)
+                },
+            }
+
+
+class Telemetry:
+    """Telemetry of every stream of a run."""
+
+    def __init__(self) -> None:
+        """Start with no streams."""
+        self._streams: Dict[str, StreamTelemetry] = {}
+        self._lock = threading.Lock()
+
+    def for_stream(self, name: str) -> StreamTelemetry:
+        """Return the telemetry of a stream, creating it on first use."""
+        with self._lock:
+            return self._streams.setdefault(name, StreamTelemetry())
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Return the summary of every stream that did any work."""
+        with self._lock:
+            streams = dict(self._streams)
+        summaries = {name: streams[name].summary() for name in sorted(streams)}
+        return {
+            name: summary
+            for name, summary in summaries.items()
+            if summary["requests"] or summary["records"]
+        }
+
+    def log_metrics(self) -> None:
+        """Log each stream's stage timings and latency histogram as METRIC lines."""
+        logger = metrics.get_metrics_logger()
+        for name, summary in self.summary().items():
+            tags = {"stream": name}
+            points = [
+                MetricPoint("timer", "stage_duration", seconds, dict(tags, stage=stage))
+                for stage, seconds in summary["stages"].items()
+            ]
+            points.append(
+                MetricPoint(
+                    "histogram",
+                    "http_request_latency",
+                    summary["request_latency"],
+                    tags,
+                )
+            )
+            points.append(
+                MetricPoint(
+                    "counter", "bytes_received", summary["bytes_received"], tags
+                )
+            )
+            for point in points:
+                logger.info("INFO METRIC: %s", point)
+
+
+class SamplingProfiler:
+    """Sample every thread's stack at a fixed interval, in collapsed stack format.
+
+    The output has one `frame;frame;frame count` line per distinct stack, as
+    read by flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, interval: float) -> None:
+        """Sample every `interval` seconds once started."""
+        self.interval = interval
+        self.samples: "collections.Counter[str]" = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="benchling-profiler", daemon=True
+        )
+
+    def start(self) -> None:
+        """Start sampling in a daemon thread."""
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling."""
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != own:
+                    self.samples[_collapse(frame)] += 1
+
+    def write(self, path: str) -> None:
+        """Write the collapsed stacks, most sampled first."""
+        with open(path, "w") as profile:
+            for stack, count in self.samples.most_common():
+                profile.write(f"{stack} {count}\n")
+
+
+def _collapse(frame: Any) -> str:
+    """Return a frame's stack, outermost first, joined with `;`."""
+    names: List[str] = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
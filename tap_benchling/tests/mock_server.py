@@ -0,0 +1,400 @@
+"""Local stand-in for the Benchling list endpoints used by the tap."""
+
+import datetime
+import functools
+import hashlib
+import json
+import operator
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlparse
+
+# Endpoint path -> key of the records array in the list response.
+ENDPOINTS = {
+    "/users": "users",
+    "/dna-sequences": "dnaSequences",
+    "/aa-sequences": "aaSequences",
+    "/custom-entities": "customEntities",
+    "/entries": "entries",
+    "/mixtures": "mixtures",
+    "/containers": "containers",
+    "/assay-result-schemas": "assayResultSchemas",
+    "/assay-results": "assayResults",
+    "/entity-schemas": "entitySchemas",
+    "/entry-schemas": "entrySchemas",
+    "/container-schemas": "containerSchemas",
+    "/events": "events",
+}
+
+# Field definitions of every record served from a `*-schemas` endpoint.
+FIELD_DEFINITIONS = [
+    {"name": "concentration", "type": "float"},
+    {"name": "samples", "type": "entity_link", "isMulti": True},
+]
+
+# Field padded to `record_bytes` on the sequence endpoints; others pad `fields`.
+PAYLOAD_FIELDS = {"/dna-sequences": "bases", "/aa-sequences": "aminoAcids"}
+UNPADDED = ("/users", "/events")
+
+# Generated fields that the real endpoint's records do not have.
+OMITTED_FIELDS = {
+    "/users": ("createdAt", "modifiedAt"),
+    "/assay-result-schemas": ("createdAt",),
+    "/assay-results": ("name",),
+}
+
+# Tap schemas of the endpoints, and the properties the tap fills in itself.
+SCHEMAS_DIR = Path(__file__).parents[1] / "schemas"
+SCHEMA_FILES = {
+    "/assay-results": "assay_results.json",
+    "/assay-result-schemas": "assay_result_schemas.json",
+}
+TAP_FIELDS = {
+    "_sdc_deleted_at",
+    "aminoAcidsRef",
+    "basesRef",
+    "contentEntities",
+    "entry",
+    "ingredientEntities",
+    "schema_id",
+}
+
+OPERATORS = {
+    ">=": operator.ge,
+    ">": operator.gt,
+    "<=": operator.le,
+    "<": operator.lt,
+    "gte": operator.ge,
+    "gt": operator.gt,
+    "lte": operator.le,
+    "lt": operator.lt,
+}
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+EPOCH = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def make_record(
+    path: str,
+    index: int,
+    scope: str = "",
+    spacing: float = 1.0,
+    record_bytes: int = 0,
+) -> dict:
+    """Return a deterministic record, modified `spacing` minutes after the last.
+
+    With `record_bytes` entity records carry that many bytes of sequence or
+    field text, so record size can be varied independently of volume.
+    """
+    modified_at = EPOCH + datetime.timedelta(minutes=index * spacing)
+    record = {
+        "id": f"{scope or path.strip('/')}_{index}",
+        "name": f"record {index}",
+        "createdAt": EPOCH.isoformat(),
+        "modifiedAt": modified_at.isoformat(),
+    }
+    for field in OMITTED_FIELDS.get(path, ()):
+        del record[field]
+    if path == "/assay-results" and scope:
+        record["schema"] = {"id": scope, "name": scope}
+    if path.endswith("-schemas"):
+        record["fieldDefinitions"] = FIELD_DEFINITIONS
+    elif record_bytes and path not in UNPADDED:
+        payload = ("ACGT" * (record_bytes // 4 + 1))[:record_bytes]
+        if path in PAYLOAD_FIELDS:
+            record[PAYLOAD_FIELDS[path]] = payload
+        else:
+            record["fields"] = {"notes": {"value": payload, "type": "text"}}
+    return record
+
+
+def modified_at_conditions(
+    query: Dict[str, List[str]]
+) -> List[Tuple[Callable, datetime.datetime]]:
+    """Parse `modifiedAt=>= a AND < b` and `modifiedAt.gte=a` style filters."""
+    conditions = []
+    for condition in query.get("modifiedAt", [""])[0].split(" AND "):
+        op, _, value = condition.strip().partition(" ")
+        if op in OPERATORS:
+            conditions.append((OPERATORS[op], value))
+    for key, values in query.items():
+        if key.startswith("modifiedAt."):
+            conditions.append((OPERATORS[key.split(".", 1)[1]], values[0]))
+    return [
+        (op, datetime.datetime.fromisoformat(value.replace("Z", "+00:00")))
+        for op, value in conditions
+    ]
+
+
+@functools.lru_cache(maxsize=None)
+def api_fields(path: str) -> Optional[Set[str]]:
+    """Return the properties Benchling returns for an endpoint, if known."""
+    schema_file = SCHEMAS_DIR / SCHEMA_FILES.get(path, path.strip("/") + ".json")
+    if not schema_file.exists():
+        return None
+    properties = json.loads(schema_file.read_text())["properties"]
+    return set(properties) - TAP_FIELDS
+
+
+def project(records: List[dict], path: str, returning: str) -> List[dict]:
+    """Keep only the `key.field` properties listed in a `returning` parameter.
+
+    Raises ValueError for fields the endpoint does not have, as Benchling does.
+    """
+    key = ENDPOINTS[path]
+    fields = {
+        name.split(".", 1)[1]
+        for name in returning.split(",")
+        if name.startswith(key + ".")
+    }
+    unknown = fields - (api_fields(path) or fields)
+    if unknown:
+        raise ValueError(f"Unknown returning fields: {', '.join(sorted(unknown))}")
+    return [
+        {name: value for name, value in record.items() if name in fields}
+        for record in records
+    ]
+
+
+class MockBenchling:
+    """Threaded HTTP server paging generated records with `nextToken`.
+
+    Pages carry an `ETag` and are answered with a 304 when `If-None-Match`
+    matches it.
+    """
+
+    def __init__(
+        self,
+        records: int = 1000,
+        latency: float = 0.0,
+        schemas: int = 3,
+        throttle_every: int = 0,
+        retry_after: float = 0.0,
+        spacing: float = 1.0,
+        record_bytes: int = 0,
+    ) -> None:
+        """Generate `records` rows per endpoint, delaying each response.
+
+        With `throttle_every` set, every Nth request is answered with a 429
+        carrying `Retry-After: retry_after`.
+        """
+        self.records = records
+        self.schemas = schemas
+        self.latency = latency
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.spacing = spacing
+        self.record_bytes = record_bytes
+        self.throttled = 0
+        self._served = 0
+        self.request_counts: Dict[str, int] = {}
+        self.events: List[dict] = []
+        # `User-Agent` headers of every request received.
+        self.user_agents: Set[Optional[str]] = set()
+        # IDs a `:bulk-get` rejects, failing the whole request as Benchling does.
+        self.deleted: Set[str] = set()
+        self._lock = threading.Lock()
+        self._data: Dict[str, List[dict]] = {}
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Return the base url of the running server."""
+        assert self._server, "Server is not running."
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def total_requests(self) -> int:
+        """Return the number of requests served across all endpoints."""
+        return sum(self.request_counts.values())
+
+    def should_throttle(self) -> bool:
+        """Return True if the current request should get a 429."""
+        with self._lock:
+            self._served += 1
+            throttle = bool(self.throttle_every) and (
+                self._served % self.throttle_every == 0
+            )
+            self.throttled += throttle
+        return throttle
+
+    def dataset(self, path: str, scope: str = "") -> List[dict]:
+        """Return (and lazily generate) every record for an endpoint.
+
+        Assay results are scoped by `schemaId`, and their schema ids match the
+        records served from `/assay-result-schemas`.
+        """
+        key = path + scope
+        if key not in self._data:
+            count = self.schemas if path.endswith("-schemas") else self.records
+            self._data[key] = [
+                make_record(path, i, scope, self.spacing, self.record_bytes)
+                for i in range(count)
+            ]
+        return self._data[key]
+
+    def add_event(self, event_type: str, resource: str, entity_id: str) -> dict:
+        """Append an event about `entity_id` to the `/events` feed."""
+        created_at = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        event = {
+            "id": f"evt_{len(self.events)}",
+            "eventType": event_type,
+            "createdAt": created_at,
+            resource: {"id": entity_id},
+        }
+        self.events.append(event)
+        return event
+
+    def feed(self, query: Dict[str, List[str]]) -> List[dict]:
+        """Return the events after `startingAfter` or from `createdAt.gte`."""
+        events = self.events
+        if "startingAfter" in query:
+            ids = [event["id"] for event in events]
+            after = ids.index(query["startingAfter"][0]) + 1
+            events = events[after:]
+        if "createdAt.gte" in query:
+            events = [
+                event
+                for event in events
+                if event["createdAt"] >= query["createdAt.gte"][0]
+            ]
+        return events
+
+    def page(self, path: str, query: Dict[str, List[str]]) -> dict:
+        """Return one list response for the endpoint and query string.
+
+        Archived records are only listed with an `archiveReason` filter.
+        """
+        scope = query.get("schemaId", [""])[0]
+        with self._lock:
+            self.request_counts[path] = self.request_counts.get(path, 0) + 1
+            if path == "/events":
+                records = self.feed(query)
+            else:
+                records = self.dataset(path, scope)
+        if "ids" in query:
+            ids = set(query["ids"][0].split(","))
+            records = [record for record in records if record["id"] in ids]
+        if "archiveReason" not in query:
+            records = [record for record in records if not record.get("archiveRecord")]
+        conditions = modified_at_conditions(query)
+        if conditions:
+            records = [
+                record
+                for record in records
+                if all(
+                    op(datetime.datetime.fromisoformat(record["modifiedAt"]), value)
+                    for op, value in conditions
+                )
+            ]
+        page_size = int(query.get("pageSize", [DEFAULT_PAGE_SIZE])[0])
+        page_size = min(page_size, MAX_PAGE_SIZE)
+        try:
+            offset = int(query.get("nextToken", ["0"])[0])
+        except ValueError as ex:
+            raise ValueError("Invalid nextToken") from ex
+        end = offset + page_size
+        page = records[offset:end]
+        if "returning" in query:
+            page = project(page, path, query["returning"][0])
+        body = {ENDPOINTS[path]: page, "nextToken": ""}
+        if end < len(records):
+            body["nextToken"] = str(end)
+        return body
+
+    def bulk_get(self, path: str, query: Dict[str, List[str]]) -> dict:
+        """Return a `:bulk-get` response with a stub record for each ID.
+
+        Raises ValueError if any ID was deleted.
+        """
+        with self._lock:
+            self.request_counts[path] = self.request_counts.get(path, 0) + 1
+        ids = [
+            entity_id
+            for name, values in query.items()
+            if name.endswith("Ids")
+            for entity_id in values[0].split(",")
+        ]
+        if self.deleted.intersection(ids):
+            raise ValueError("Entity not found")
+        key = ENDPOINTS[path.split(":", 1)[0]]
+        return {key: [{"id": i, "name": f"{i} details"} for i in ids]}
+
+    def start(self) -> "MockBenchling":
+        """Serve on an ephemeral localhost port in a daemon thread."""
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _handler_for(self))
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Shut the server down."""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "MockBenchling":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def _handler_for(mock: MockBenchling) -> type:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def do_GET(self) -> None:
+            url = urlparse(self.path)
+            mock.user_agents.add(self.headers.get("User-Agent"))
+            endpoint, _, action = url.path.partition(":")
+            if endpoint not in ENDPOINTS or action not in ("", "bulk-get"):
+                self.send_error(404)
+                return
+            if mock.latency:
+                time.sleep(mock.latency)
+            if mock.should_throttle():
+                self.send_response(429)
+                self.send_header("Retry-After", str(mock.retry_after))
+                self.send_header("x-rate-limit-remaining", "0")
+                self.send_header("x-rate-limit-reset", str(mock.retry_after))
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            query = parse_qs(url.query)
+            try:
+                if action:
+                    body = mock.bulk_get(url.path, query)
+                else:
+                    body = mock.page(url.path, query)
+            except ValueError as ex:
+                self.send_error(400, str(ex))
+                return
+            payload = json.dumps(body).encode()
+            etag = '"%s"' % hashlib.sha1(payload).hexdigest()
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args) -> None:
+            pass
+
+    return Handler
@@ -0,0 +1,427 @@
+"""Tests for the BenchlingStream request parameters."""
+
+import json
+
+import requests
+
+from tap_benchling.streams import SchemaAssayResultsStream
+from tap_benchling.tap import TapBenchling
+from tap_benchling.tests.mock_server import MockBenchling
+
+SAMPLE_CONFIG = {
+    "api_key": "sk_test",
+    "api_url": "https://example.benchling.com/api/v2",
+    "start_date": "2023-01-01T00:00:00Z",
+    "max_requests_per_second": 1000,
+}
+
+
+def _tap(config=None, state=None) -> TapBenchling:
+    return TapBenchling(config=config or SAMPLE_CONFIG, state=state)
+
+
+def _start(stream, context=None):
+    stream._write_starting_replication_value(context)
+
+
+def test_incremental_streams_use_modified_at():
+    tap = _tap()
+    for name in (
+        "dna-sequences",
+        "aa-sequences",
+        "custom-entities",
+        "entries",
+        "mixtures",
+        "containers",
+        "assay_results",
+    ):
+        stream = tap.streams[name]
+        assert stream.replication_key == "modifiedAt"
+        assert stream.replication_method == "INCREMENTAL"
+    assert tap.streams["users"].replication_method == "FULL_TABLE"
+
+
+def test_start_date_filter():
+    stream = _tap().streams["dna-sequences"]
+    _start(stream)
+    params = stream.get_url_params(None, None)
+    assert params["sort"] == "modifiedAt:asc"
+    assert params["modifiedAt"] == ">= 2023-01-01T00:00:00+00:00"
+
+
+def test_bookmark_overrides_start_date():
+    state = {
+        "bookmarks": {
+            "entries": {
+                "replication_key": "modifiedAt",
+                "replication_key_value": "2024-05-06T07:08:09.000000+00:00",
+            }
+        }
+    }
+    stream = _tap(state=state).streams["entries"]
+    _start(stream)
+    params = stream.get_url_params(None, "token-2")
+    assert params["modifiedAt"] == ">= 2024-05-06T07:08:09+00:00"
+    assert params["nextToken"] == "token-2"
+
+
+def test_assay_results_filter():
+    stream = _tap().streams["assay_results"]
+    context = {"schema_id": "assaysch_1"}
+    _start(stream, context)
+    params = stream.get_url_params(context, None)
+    assert params["schemaId"] == "assaysch_1"
+    assert params["modifiedAt.gte"] == "2023-01-01T00:00:00+00:00"
+    assert "modifiedAt" not in params
+
+
+def test_full_table_stream_sends_no_filter():
+    stream = _tap().streams["users"]
+    assert stream.get_url_params(None, None) == {"pageSize": 100}
+
+
+def test_page_size_overrides():
+    config = dict(
+        SAMPLE_CONFIG,
+        page_size=25,
+        stream_page_sizes={"assay_results": 40, "entries": 500},
+    )
+    tap = _tap(config)
+    assert tap.streams["users"].get_url_params(None, None)["pageSize"] == 25
+    assert tap.streams["entries"].page_size == 100
+    params = tap.streams["assay_results"].get_url_params({"schema_id": "s1"}, None)
+    assert params["pageSize"] == 40
+
+
+def test_sync_pages_and_bookmarks(capsys):
+    with MockBenchling(records=250) as mock:
+        tap = _tap(dict(SAMPLE_CONFIG, api_url=mock.url))
+        stream = tap.streams["dna-sequences"]
+        stream.sync()
+        stream.finalize_state_progress_markers()
+        assert mock.request_counts == {"/dna-sequences": 3}
+
+    lines = capsys.readouterr().out.splitlines()
+    records = [line for line in lines if '"RECORD"' in line]
+    assert len(records) == 250
+    bookmark = tap.state["bookmarks"]["dna-sequences"]
+    assert bookmark["replication_key_value"] == "2023-01-01T04:09:00+00:00"
+
+
+def test_interrupted_sync_resumes_from_last_state(capsys):
+    with MockBenchling(records=250) as mock:
+        config = dict(
+            SAMPLE_CONFIG, api_url=mock.url, page_size=50, state_message_interval=40
+        )
+        records = _tap(config).streams["dna-sequences"]._sync_records()
+        for _ in range(130):
+            next(records)
+        records.close()
+        messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        state = [m["value"] for m in messages if m["type"] == "STATE"][-1]
+        bookmark = state["bookmarks"]["dna-sequences"]
+        assert bookmark["replication_key_value"] == "2023-01-01T02:00:00+00:00"
+
+        mock.request_counts.clear()
+        resumed = _tap(config, state=state)
+        resumed.streams["dna-sequences"].sync()
+        assert mock.request_counts == {"/dna-sequences": 3}
+
+    records = _records(capsys)
+    assert records[0]["id"] == "dna-sequences_120"
+    assert len(records) == 130
+
+
+def test_concurrent_assay_result_partitions(capsys):
+    with MockBenchling(records=120, schemas=5) as mock:
+        tap = _tap(dict(SAMPLE_CONFIG, api_url=mock.url, partition_concurrency=3))
+        tap.sync_all()
+        assert mock.request_counts["/assay-results"] == 10
+
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    schemas = [m for m in messages if m["type"] == "SCHEMA"]
+    assert [m["stream"] for m in schemas].count("assay_results") == 1
+    results = [
+        m["record"]
+        for m in messages
+        if m["type"] == "RECORD" and m["stream"] == "assay_results"
+    ]
+    assert len(results) == 600
+    for index in range(5):
+        schema_id = f"assay-result-schemas_{index}"
+        ids = [r["id"] for r in results if r["schema_id"] == schema_id]
+        assert ids == [f"{schema_id}_{i}" for i in range(120)]
+
+    partitions = tap.state["bookmarks"]["assay_results"]["partitions"]
+    assert len(partitions) == 5
+    for partition in partitions:
+        assert partition["replication_key_value"] == "2023-01-01T01:59:00+00:00"
+        assert "progress_markers" not in partition
+
+
+def test_retries_throttled_requests(capsys):
+    with MockBenchling(records=300, throttle_every=2, retry_after=0.05) as mock:
+        tap = _tap(dict(SAMPLE_CONFIG, api_url=mock.url))
+        tap.streams["containers"].sync()
+        assert mock.throttled == 2
+
+    lines = capsys.readouterr().out.splitlines()
+    assert len([line for line in lines if '"RECORD"' in line]) == 300
+    stats = tap.rate_limiter.stats()
+    assert stats["retries"] == 2
+    assert stats["throttled_seconds"] >= 0.1
+
+
+def test_modified_at_window_partitions(capsys):
+    config = dict(
+        SAMPLE_CONFIG,
+        partition_window_days=365,
+        partition_concurrency=4,
+        start_date="2023-01-01T00:00:00Z",
+    )
+    with MockBenchling(records=300, spacing=3 * 24 * 60) as mock:
+        tap = _tap(dict(config, api_url=mock.url))
+        stream = tap.streams["dna-sequences"]
+        windows = stream.partitions
+        assert windows[0] == {
+            "modified_after": "2023-01-01T00:00:00+00:00",
+            "modified_before": "2024-01-01T00:00:00+00:00",
+        }
+        params = stream.get_url_params(windows[1], None)
+        assert params["modifiedAt"] == (
+            ">= 2024-01-01T00:00:00+00:00 AND < 2024-12-31T00:00:00+00:00"
+        )
+        stream.sync()
+        records = [
+            json.loads(line)["record"]
+            for line in capsys.readouterr().out.splitlines()
+            if '"RECORD"' in line
+        ]
+        assert sorted(r["id"] for r in records) == sorted(
+            f"dna-sequences_{i}" for i in range(300)
+        )
+        assert "modified_after" not in records[0]
+
+        partitions = tap.state["bookmarks"]["dna-sequences"]["partitions"]
+        complete = [p for p in partitions if p.get("window_complete")]
+        assert len(complete) == len(windows) - 1
+        assert complete[0]["replication_key_value"] == "2023-12-30T00:00:00+00:00"
+
+        requests_before = mock.total_requests
+        rerun = _tap(dict(config, api_url=mock.url), state=tap.state)
+        assert len(rerun.streams["dna-sequences"].partitions) == 1
+        rerun.streams["dna-sequences"].sync()
+        assert mock.total_requests == requests_before + 1
+
+
+def test_response_is_decoded_once(monkeypatch):
+    import tap_benchling.client as client
+
+    calls = []
+
+    def loads(data):
+        calls.append(data)
+        return {"dnaSequences": [{"id": "seq_1"}, {"id": "seq_2"}], "nextToken": "n"}
+
+    monkeypatch.setattr(client, "loads", loads)
+    response = requests.Response()
+    response._content = b"{}"
+    stream = _tap().streams["dna-sequences"]
+    assert stream.get_next_page_token(response, None) == "n"
+    assert [r["id"] for r in stream.parse_response(response)] == ["seq_1", "seq_2"]
+    assert len(calls) == 1
+
+
+def test_streaming_parse_matches_buffered_sync(capsys):
+    outputs = []
+    for streaming in (False, True):
+        with MockBenchling(records=250) as mock:
+            config = dict(SAMPLE_CONFIG, api_url=mock.url, streaming_parse=streaming)
+            tap = _tap(config)
+            tap.streams["dna-sequences"].sync()
+            assert mock.request_counts == {"/dna-sequences": 3}
+        lines = capsys.readouterr().out.splitlines()
+        records = [json.loads(line) for line in lines if '"RECORD"' in line]
+        outputs.append([message["record"] for message in records])
+    assert len(outputs[1]) == 250
+    assert outputs[0] == outputs[1]
+
+
+def _deselect(stream, *names):
+    for name in names:
+        stream.metadata[("properties", name)].selected = False
+
+
+def test_returning_projects_selected_properties():
+    params = _tap().streams["dna-sequences"].get_url_params(None, None)
+    assert "returning" not in params
+
+    stream = _tap().streams["dna-sequences"]
+    _deselect(stream, *stream.schema["properties"])
+    stream.metadata[("properties", "name")].selected = True
+    returning = stream.get_url_params(None, None)["returning"].split(",")
+    assert sorted(returning) == [
+        "dnaSequences.id",
+        "dnaSequences.modifiedAt",
+        "dnaSequences.name",
+        "nextToken",
+    ]
+
+
+def test_sync_with_projection(capsys):
+    with MockBenchling(records=120) as mock:
+        tap = _tap(dict(SAMPLE_CONFIG, api_url=mock.url))
+        stream = tap.streams["dna-sequences"]
+        _deselect(stream, "name", "createdAt")
+        stream.sync()
+
+    lines = capsys.readouterr().out.splitlines()
+    records = [json.loads(line)["record"] for line in lines if '"RECORD"' in line]
+    assert len(records) == 120
+    assert set(records[0]) == {"id", "modifiedAt"}
+
+
+def test_streams_share_session_and_authenticator():
+    tap = _tap()
+    dna, entries = tap.streams["dna-sequences"], tap.streams["entries"]
+    assert dna.requests_session is entries.requests_session is tap.http_session
+    assert dna.authenticator is entries.authenticator
+    assert "gzip" in tap.http_session.headers["Accept-Encoding"]
+
+
+def test_connections_are_reused_across_streams(capsys):
+    with MockBenchling(records=150) as mock:
+        tap = _tap(dict(SAMPLE_CONFIG, api_url=mock.url))
+        for name in ("dna-sequences", "entries", "containers"):
+            tap.streams[name].sync()
+        stats = tap.http_session.stats()
+    assert stats["requests"] == mock.total_requests == 6
+    assert stats["connections"] == 1
+    assert stats["tls_handshakes"] == 0
+    assert stats["reuse_rate"] == round(5 / 6, 3)
+
+
+def _records(capsys):
+    lines = capsys.readouterr().out.splitlines()
+    return [json.loads(line)["record"] for line in lines if '"RECORD"' in line]
+
+
+def test_asyncio_engine_matches_requests_engine(capsys):
+    with MockBenchling(records=120, schemas=4, latency=0.01) as mock:
+        config = dict(SAMPLE_CONFIG, api_url=mock.url, partition_concurrency=4)
+        synced, states = [], []
+        for engine in ("requests", "asyncio"):
+            tap = _tap(dict(config, http_engine=engine))
+            tap.sync_all()
+            assert tap._async_engine is None
+            synced.append(sorted(_records(capsys), key=lambda r: r["id"]))
+            states.append(tap.state)
+    assert len(synced[1]) == 7 * 120 + 4 + 4 * 120
+    assert synced[0] == synced[1]
+    assert states[0] == states[1]
+
+
+def test_asyncio_engine_retries_throttled_requests(capsys):
+    with MockBenchling(records=300, throttle_every=2, retry_after=0.05) as mock:
+        config = dict(SAMPLE_CONFIG, api_url=mock.url, http_engine="asyncio")
+        tap = _tap(config)
+        try:
+            tap.streams["containers"].sync()
+        finally:
+            tap.async_engine.close()
+        assert mock.throttled == 2
+
+    assert len(_records(capsys)) == 300
+    assert tap.rate_limiter.stats()["retries"] == 2
+
+
+def test_enrich_resolves_references_in_batches():
+    records = [
+        {
+            "id": "mxt_1",
+            "ingredients": [
+                {"componentEntity": {"id": "bfi_1"}},
+                {"componentEntity": {"id": "seq_1"}},
+                {"componentEntity": {"id": "bfi_mix"}},
+            ],
+        },
+        {
+            "id": "mxt_2",
+            "ingredients": [
+                {"componentEntity": {"id": "bfi_1"}},
+                {"componentEntity": {"id": "xyz_1"}},
+            ],
+        },
+    ]
+    with MockBenchling() as mock:
+        mock.dataset("/custom-entities").append({"id": "bfi_1", "name": "entity"})
+        mock.dataset("/mixtures").append({"id": "bfi_mix", "name": "mixture"})
+        config = dict(SAMPLE_CONFIG, api_url=mock.url, enrich_references=True)
+        tap = _tap(config)
+        stream = tap.streams["mixtures"]
+        enriched = list(stream.enrich(records))
+        assert mock.request_counts == {
+            "/custom-entities": 1,
+            "/mixtures": 1,
+            "/dna-sequences:bulk-get": 1,
+        }
+        list(stream.enrich(records))
+        assert mock.total_requests == 3
+
+    assert [e["id"] for e in enriched[0]["ingredientEntities"]] == [
+        "bfi_1",
+        "seq_1",
+        "bfi_mix",
+    ]
+    assert enriched[1]["ingredientEntities"] == [{"id": "bfi_1", "name": "entity"}]
+    assert tap.reference_cache.stats() == {"size": 3, "hits": 3, "misses": 3}
+
+
+def test_enrich_leaves_rejected_batches_unresolved():
+    records = [{"id": "mxt_1", "ingredients": [{"componentEntity": {"id": "seq_1"}}]}]
+    with MockBenchling() as mock:
+        mock.deleted.add("seq_1")
+        config = dict(SAMPLE_CONFIG, api_url=mock.url, enrich_references=True)
+        stream = _tap(config).streams["mixtures"]
+        enriched = list(stream.enrich(records))
+
+    assert enriched[0]["ingredientEntities"] == []
+
+
+def test_reference_targets_are_only_cataloged_when_enriching():
+    plain = _tap().streams["mixtures"].schema["properties"]
+    config = dict(SAMPLE_CONFIG, enrich_references=True)
+    enriched = _tap(config).streams["mixtures"].schema["properties"]
+    assert "ingredientEntities" not in plain
+    assert enriched["ingredientEntities"]["type"] == ["array", "null"]
+
+
+def test_returning_requests_reference_sources():
+    config = dict(SAMPLE_CONFIG, enrich_references=True)
+    stream = _tap(config).streams["assay_results"]
+    _deselect(stream, *stream.schema["properties"])
+    stream.metadata[("properties", "entry")].selected = True
+    stream.metadata[("properties", "schema_id")].selected = True
+    params = stream.get_url_params({"schema_id": "assaysch_1"}, None)
+    assert sorted(params["returning"].split(",")) == [
+        "assayResults.entryId",
+        "assayResults.id",
+        "assayResults.modifiedAt",
+        "assayResults.schema",
+        "nextToken",
+    ]
+
+
+def test_derived_schema_id_is_filled_from_the_schema(capsys):
+    with MockBenchling(records=3, schemas=1) as mock:
+        config = dict(SAMPLE_CONFIG, api_url=mock.url, assay_results_per_schema=True)
+        tap = _tap(config)
+        stream = next(
+            s for s in tap.streams.values() if isinstance(s, SchemaAssayResultsStream)
+        )
+        _deselect(stream, *stream.schema["properties"])
+        stream.metadata[("properties", "schema_id")].selected = True
+        stream.sync()
+
+    schema_id = stream.assay_schema["id"]
+    assert [record["schema_id"] for record in _records(capsys)] == [schema_id] * 3
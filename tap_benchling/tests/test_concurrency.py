@@ -0,0 +1,23 @@
+"""Tests for the partition fan-out helper."""
+
+import pytest
+
+from tap_benchling.concurrency import fan_out
+
+
+def test_fan_out_keeps_per_context_order():
+    contexts = [{"n": n} for n in range(4)]
+    results = list(fan_out(lambda c: ({"i": i} for i in range(50)), contexts, 2, 8))
+    for context in contexts:
+        items = [r for c, r in results if c == context]
+        assert items[-1] is None
+        assert [r["i"] for r in items[:-1]] == list(range(50))
+
+
+def test_fan_out_reraises_worker_errors():
+    def fetch(context):
+        yield {"ok": True}
+        raise ValueError(context["n"])
+
+    with pytest.raises(ValueError):
+        list(fan_out(fetch, [{"n": n} for n in range(3)], 3, 1))
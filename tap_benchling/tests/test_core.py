@@ -1,23 +1,21 @@
 """Tests standard tap features using the built-in SDK tests library."""
 
-import datetime
-
 from singer_sdk.testing import get_tap_test_class
 
 from tap_benchling.tap import TapBenchling
+from tap_benchling.tests.mock_server import MockBenchling
 
+# The SDK tests build their tap at collection time, so the local stand-in for
+# Benchling is started with the module and served from a daemon thread.
+MOCK_SERVER = MockBenchling(records=25, schemas=2).start()
 
 SAMPLE_CONFIG = {
-    "start_date": datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%d")
-    # TODO: Initialize minimal tap config
+    "api_key": "sk_test",
+    "api_url": MOCK_SERVER.url,
+    "start_date": "2023-01-01T00:00:00Z",
+    "max_requests_per_second": 1000,
 }
 
 
 # Run standard built-in tap tests from the SDK:
-TestTapBenchling = get_tap_test_class(
-    tap_class=TapBenchling,
-    config=SAMPLE_CONFIG
-)
-
-
-# TODO: Create additional tests as appropriate for your tap.
+TestTapBenchling = get_tap_test_class(tap_class=TapBenchling, config=SAMPLE_CONFIG)
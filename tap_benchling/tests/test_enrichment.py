@@ -0,0 +1,27 @@
+"""Tests for the reference enrichment helpers."""
+
+from tap_benchling.enrichment import LRUCache, batched, bulk_gets_for, find_ids
+
+
+def test_find_ids_walks_arrays():
+    record = {"contents": [{"entity": {"id": "bfi_1"}}, {"entity": None}, {}]}
+    assert list(find_ids(record, ["contents", "*", "entity", "id"])) == ["bfi_1"]
+    assert list(find_ids({"entryId": "etr_1"}, ["entryId"])) == ["etr_1"]
+
+
+def test_bulk_get_by_prefix():
+    assert bulk_gets_for("etr_1")[0].ids_param == "entryIds"
+    assert [b.path for b in bulk_gets_for("bfi_1")] == ["/custom-entities", "/mixtures"]
+    assert bulk_gets_for("unknown") == ()
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.put_many({"a": 1, "b": 2})
+    assert cache.get_many(["a"]) == {"a": 1}
+    cache.put_many({"c": 3})
+    assert cache.get_many(["a", "b", "c"]) == {"a": 1, "c": 3}
+
+
+def test_batched():
+    assert list(batched(range(5), 2)) == [[0, 1], [2, 3], [4]]
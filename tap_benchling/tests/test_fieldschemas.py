@@ -0,0 +1,49 @@
+"""Tests for typed `fields` schemas."""
+
+from tap_benchling.fieldschemas import SchemaCache, with_typed_fields
+
+STREAM_SCHEMA = {"type": "object", "properties": {"fields": {"type": "object"}}}
+
+
+def test_fields_are_typed_per_definition():
+    schemas = [
+        {
+            "fieldDefinitions": [
+                {"name": "count", "type": "integer"},
+                {"name": "tags", "type": "dropdown", "isMulti": True},
+                {"name": "shared", "type": "text"},
+                {"name": "old", "type": "text", "archiveRecord": {"reason": "Retired"}},
+            ]
+        },
+        {"fieldDefinitions": [{"name": "shared", "type": "float"}]},
+    ]
+    fields = with_typed_fields(STREAM_SCHEMA, schemas)["properties"]["fields"]
+    values = {
+        name: prop["properties"]["value"] for name, prop in fields["properties"].items()
+    }
+    assert values == {
+        "count": {"type": ["integer", "null"]},
+        "tags": {"type": ["array", "null"], "items": {"type": ["string", "null"]}},
+        "shared": {},
+    }
+    assert STREAM_SCHEMA["properties"]["fields"] == {"type": "object"}
+
+
+def test_schema_cache_expires_and_persists(tmp_path):
+    now = [0.0]
+    calls = []
+
+    def fetch():
+        calls.append(now[0])
+        return [{"id": len(calls)}]
+
+    path = str(tmp_path / "schemas.json")
+    cache = SchemaCache(ttl=60, path=path, clock=lambda: now[0])
+    assert cache.get("/entry-schemas", fetch) == [{"id": 1}]
+    now[0] = 30
+    assert cache.get("/entry-schemas", fetch) == [{"id": 1}]
+    assert SchemaCache(ttl=60, path=path, clock=lambda: now[0]).get(
+        "/entry-schemas", fetch
+    ) == [{"id": 1}]
+    now[0] = 61
+    assert cache.get("/entry-schemas", fetch) == [{"id": 2}]
@@ -0,0 +1,41 @@
+"""Tests for the response decoding helpers."""
+
+from tap_benchling.parsing import StreamingArrayParser, extract, loads
+
+
+def test_simple_paths_match_jsonpath_semantics():
+    body = loads(b'{"entries": [{"id": 1}, {"id": 2}], "nextToken": ""}')
+    assert list(extract("$.entries[*]", body)) == [{"id": 1}, {"id": 2}]
+    assert list(extract("$.nextToken", body)) == [""]
+    assert list(extract("$.missing[*]", body)) == []
+
+
+def test_complex_paths_fall_back_to_jsonpath():
+    body = {"entries": [{"id": 1}, {"id": 2}]}
+    assert list(extract("$.entries[*].id", body)) == [1, 2]
+
+
+def _feed(parser, body, size):
+    items = []
+    for start in range(0, len(body), size):
+        end = start + size
+        items += parser.feed(body[start:end])
+    return items
+
+
+def test_streaming_parser_splits_array_in_any_chunking():
+    body = (
+        b'{"nextToken": "a,b", "entries": [{"id": "x\\"}", "tags": [1, {"n": []}]},'
+        b' {"id": "\\\\"}], "count": {"n": 2}}'
+    )
+    for size in (1, 2, 7, len(body)):
+        parser = StreamingArrayParser("entries")
+        items = _feed(parser, body, size)
+        assert items == loads(body)["entries"]
+        assert parser.extras == {"nextToken": "a,b", "count": {"n": 2}}
+
+
+def test_streaming_parser_handles_empty_array():
+    parser = StreamingArrayParser("entries")
+    assert _feed(parser, b'{"entries": [], "nextToken": ""}', 3) == []
+    assert parser.extras == {"nextToken": ""}
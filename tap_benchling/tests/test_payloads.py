@@ -0,0 +1,56 @@
+"""Tests for offloading large payloads to content-addressed files."""
+
+import gzip
+import json
+
+from tap_benchling.payloads import PayloadStore
+from tap_benchling.tap import TapBenchling
+from tap_benchling.tests.mock_server import MockBenchling
+
+
+def test_payloads_are_stored_once_by_content(tmp_path):
+    store = PayloadStore(str(tmp_path))
+    first = {"bases": "ACGT" * 500}
+    second = {"bases": "ACGT" * 500}
+    short = {"bases": "ACGT"}
+    for record in (first, second, short):
+        store.offload(record, "bases", min_length=100)
+
+    assert first["bases"] is None
+    assert first["basesRef"] == second["basesRef"]
+    assert first["basesRef"]["length"] == 2000
+    assert short == {"bases": "ACGT", "basesRef": None}
+    digest = first["basesRef"]["sha256"]
+    stored = tmp_path / digest[:2] / f"{digest}.gz"
+    assert gzip.decompress(stored.read_bytes()) == b"ACGT" * 500
+    assert store.stats()["stored"] == 1
+    assert store.stats()["deduplicated"] == 1
+
+    # A later run finds the file and does not write it again.
+    rerun = PayloadStore(str(tmp_path))
+    rerun.offload({"bases": "ACGT" * 500}, "bases", min_length=100)
+    assert rerun.stats() == {"stored": 0, "deduplicated": 1, "bytes_written": 0}
+
+
+def test_sync_emits_references_instead_of_bases(capsys, tmp_path):
+    with MockBenchling(records=10) as mock:
+        for index, record in enumerate(mock.dataset("/dna-sequences")):
+            record["bases"] = "ACGT" * 400 if index % 2 else "GATTACA" * 300
+        config = {
+            "api_key": "sk_test",
+            "api_url": mock.url,
+            "payload_offload_url": str(tmp_path),
+        }
+        tap = TapBenchling(config=config)
+        tap.sync_all()
+
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    records = [
+        message["record"]
+        for message in messages
+        if message["type"] == "RECORD" and message["stream"] == "dna-sequences"
+    ]
+    assert len(records) == 10
+    assert all(record["bases"] is None for record in records)
+    assert len({record["basesRef"]["sha256"] for record in records}) == 2
+    assert len(list(tmp_path.glob("*/*.gz"))) == 2
@@ -0,0 +1,72 @@
+"""Tests for the shared rate limiter."""
+
+from tap_benchling.ratelimit import RateLimiter, retry_after_seconds
+
+
+class FakeClock:
+    """Clock whose `sleep` advances time instantly."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def _limiter(rate, **kwargs):
+    clock = FakeClock()
+    return RateLimiter(rate, clock=clock, sleep=clock.sleep, **kwargs), clock
+
+
+def test_bucket_allows_burst_then_paces():
+    limiter, clock = _limiter(5)
+    for _ in range(5):
+        assert limiter.acquire() == 0
+    limiter.acquire()
+    assert clock.now == 0.2
+    assert limiter.stats()["throttled_requests"] == 1
+
+
+def test_headers_slow_the_rate_down():
+    limiter, _ = _limiter(10, headroom=0.5)
+    limiter.observe({"x-rate-limit-remaining": "8", "x-rate-limit-reset": "2"})
+    assert limiter.rate == 2
+    limiter.observe({"x-rate-limit-remaining": "500", "x-rate-limit-reset": "1"})
+    assert limiter.rate == 10
+
+
+def test_without_a_cap_only_headers_pace_requests():
+    limiter, clock = _limiter(None, headroom=0.5)
+    for _ in range(100):
+        limiter.acquire()
+    assert clock.now == 0
+    limiter.observe({"x-rate-limit-remaining": "8", "x-rate-limit-reset": "2"})
+    assert limiter.rate == 2
+    for _ in range(3):
+        limiter.acquire()
+    assert clock.now == 1.0
+
+
+def test_exhausted_window_pauses_everyone():
+    limiter, clock = _limiter(10)
+    limiter.observe({"x-rate-limit-remaining": "0", "x-rate-limit-reset": "3"})
+    limiter.acquire()
+    assert clock.now >= 3
+
+
+def test_exhausted_window_keeps_the_rate_after_the_reset():
+    limiter, clock = _limiter(10)
+    limiter.observe({"x-rate-limit-remaining": "0", "x-rate-limit-reset": "1"})
+    limiter.acquire()
+    limiter.acquire()
+    assert clock.now == 1.0
+    assert limiter.rate == 10
+
+
+def test_retry_after_parsing():
+    assert retry_after_seconds({"Retry-After": "2.5"}) == 2.5
+    assert retry_after_seconds({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0
+    assert retry_after_seconds({}) is None
@@ -0,0 +1,34 @@
+"""Tests for the on-disk record index."""
+
+from tap_benchling.recordindex import RecordIndex
+
+
+def test_uncommitted_runs_are_forgotten(tmp_path):
+    path = str(tmp_path / "index.sqlite")
+    index = RecordIndex(path)
+    assert not index.is_unchanged("entries", "etr_1", None, {"id": "etr_1"})
+    index.close()
+
+    index = RecordIndex(path)
+    assert not index.is_unchanged("entries", "etr_1", None, {"id": "etr_1"})
+    index.commit()
+    index.close()
+
+    index = RecordIndex(path)
+    assert index.is_unchanged("entries", "etr_1", None, {"id": "etr_1"})
+    assert not index.is_unchanged("entries", "etr_1", None, {"id": "etr_1", "x": 1})
+    index.close()
+
+
+def test_stale_records_are_evicted(tmp_path):
+    path = str(tmp_path / "index.sqlite")
+    index = RecordIndex(path, ttl_days=1)
+    index.is_unchanged("entries", "etr_1", None, {"id": "etr_1"})
+    index.commit()
+    index.close()
+
+    index = RecordIndex(path, ttl_days=1)
+    index._now += 2 * 86400
+    index.commit()
+    assert not index.is_unchanged("entries", "etr_1", None, {"id": "etr_1"})
+    index.close()
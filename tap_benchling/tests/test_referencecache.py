@@ -0,0 +1,114 @@
+"""Tests for the on-disk cache of reference streams."""
+
+import json
+
+from tap_benchling.referencecache import ReferenceStreamCache
+from tap_benchling.tap import TapBenchling
+from tap_benchling.tests.mock_server import MockBenchling
+
+
+def test_cache_serves_fresh_lists_and_revalidates_stale_ones(tmp_path):
+    now = [0.0]
+    path = str(tmp_path / "reference.json")
+    cache = ReferenceStreamCache(path, ttl=60, clock=lambda: now[0])
+    sent = []
+
+    def fetch(headers):
+        sent.append(headers)
+        if headers.get("If-None-Match") == '"v1"':
+            return None
+        return [{"id": "ent_1"}], {"ETag": '"v1"'}
+
+    users = "https://t.benchling.com/users"
+    assert cache.get(users, fetch) == ([{"id": "ent_1"}], True)
+    # A run resolves each list once, keeping whether it changed.
+    now[0] = 100
+    assert cache.get(users, fetch) == ([{"id": "ent_1"}], True)
+    assert len(sent) == 1
+
+    # A later run within the TTL reads the list from the file.
+    now[0] = 30
+    assert ReferenceStreamCache(path, ttl=60, clock=lambda: now[0]).get(
+        users, fetch
+    ) == ([{"id": "ent_1"}], False)
+    assert len(sent) == 1
+
+    # A later run past the TTL revalidates the list from the file.
+    now[0] = 100
+    rerun = ReferenceStreamCache(path, ttl=60, clock=lambda: now[0])
+    assert rerun.get(users, fetch) == ([{"id": "ent_1"}], False)
+    assert sent[-1] == {"If-None-Match": '"v1"'}
+    assert rerun.stats() == {"fresh": 0, "revalidated": 1, "fetched": 0, "changed": 0}
+
+    # Other tenants are cached apart.
+    assert cache.get("https://other.benchling.com/users", fetch)[1] is True
+
+
+def _sync(config: dict, capsys) -> dict:
+    TapBenchling(config=config).sync_all()
+    counts: dict = {}
+    for line in capsys.readouterr().out.splitlines():
+        message = json.loads(line)
+        if message["type"] == "RECORD":
+            counts[message["stream"]] = counts.get(message["stream"], 0) + 1
+    return counts
+
+
+def test_reference_streams_skip_requests_and_unchanged_records(capsys, tmp_path):
+    with MockBenchling(records=20, schemas=2) as mock:
+        config = {
+            "api_key": "sk_test",
+            "api_url": mock.url,
+            "reference_cache_path": str(tmp_path / "reference.json"),
+            "reference_cache_skip_unchanged": True,
+            "typed_fields": True,
+        }
+        counts = _sync(config, capsys)
+        assert counts["users"] == 20
+        assert counts["assay_result_schemas"] == 2
+        assert mock.request_counts["/users"] == 1
+
+        # Within the TTL nothing is requested, and nothing changed.
+        counts = _sync(config, capsys)
+        assert "users" not in counts
+        assert "assay_result_schemas" not in counts
+        assert counts["assay_results"] == 40
+        assert mock.request_counts["/users"] == 1
+        assert mock.request_counts["/assay-result-schemas"] == 1
+
+        # Past the TTL the ETag still matches.
+        config["reference_cache_ttl_seconds"] = 0
+        counts = _sync(config, capsys)
+        assert "users" not in counts
+        assert mock.request_counts["/users"] == 2
+
+        mock.dataset("/users")[3]["name"] = "renamed"
+        counts = _sync(config, capsys)
+        assert counts["users"] == 20
+
+
+def test_tenants_sharing_cache_files_get_their_own_lists(capsys, tmp_path):
+    config = {
+        "api_key": "sk_test",
+        "reference_cache_path": str(tmp_path / "reference.json"),
+        "schema_cache_path": str(tmp_path / "schemas.json"),
+        "typed_fields": True,
+    }
+    names = []
+    for tenant in ("a", "b"):
+        with MockBenchling(records=2, schemas=1) as mock:
+            mock.dataset("/assay-result-schemas")[0]["name"] = f"tenant {tenant}"
+            mock.dataset("/entry-schemas")[0]["name"] = f"tenant {tenant}"
+            tap = TapBenchling(config=dict(config, api_url=mock.url))
+            tap.sync_all()
+            entry_schemas = tap.benchling_schemas(
+                tap.streams["entries"].field_schema_source
+            )
+        for line in capsys.readouterr().out.splitlines():
+            message = json.loads(line)
+            if message["type"] == "RECORD":
+                if message["stream"] == "assay_result_schemas":
+                    names.append(message["record"]["name"])
+        names.append(entry_schemas[0]["name"])
+
+    assert names == ["tenant a", "tenant a", "tenant b", "tenant b"]
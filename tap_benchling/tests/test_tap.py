@@ -0,0 +1,276 @@
+"""Tests for TapBenchling sync scheduling."""
+
+import json
+
+from tap_benchling.streams import SchemaAssayResultsStream
+from tap_benchling.tap import TapBenchling
+from tap_benchling.tests.mock_server import MockBenchling
+
+
+def test_concurrent_streams_emit_wellformed_output(capsys):
+    with MockBenchling(records=150, schemas=2, latency=0.01) as mock:
+        config = {
+            "api_key": "sk_test",
+            "api_url": mock.url,
+            "stream_concurrency": 4,
+            "max_requests_per_second": 1000,
+        }
+        tap = TapBenchling(config=config)
+        tap.sync_all()
+
+    messages = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    seen_schemas = set()
+    for message in messages:
+        if message["type"] == "SCHEMA":
+            seen_schemas.add(message["stream"])
+        elif message["type"] == "RECORD":
+            assert message["stream"] in seen_schemas
+
+    counts: dict = {}
+    for message in messages:
+        if message["type"] == "RECORD":
+            counts[message["stream"]] = counts.get(message["stream"], 0) + 1
+    assert counts["dna-sequences"] == 150
+    assert counts["assay_results"] == 300
+    assert len(counts) == 9
+
+    final_state = [m for m in messages if m["type"] == "STATE"][-1]["value"]
+    for name in ("dna-sequences", "entries", "containers"):
+        bookmark = final_state["bookmarks"][name]
+        assert bookmark["replication_key_value"] == "2023-01-01T02:29:00+00:00"
+    assert len(final_state["bookmarks"]["assay_results"]["partitions"]) == 2
+    assert final_state == tap.state
+
+
+def _record_counts(capsys) -> dict:
+    counts: dict = {}
+    for line in capsys.readouterr().out.splitlines():
+        message = json.loads(line)
+        if message["type"] == "RECORD":
+            counts[message["stream"]] = counts.get(message["stream"], 0) + 1
+    return counts
+
+
+def test_record_index_suppresses_unchanged_records(capsys, tmp_path):
+    with MockBenchling(records=50, schemas=2) as mock:
+        config = {
+            "api_key": "sk_test",
+            "api_url": mock.url,
+            "record_index_path": str(tmp_path / "index.sqlite"),
+        }
+        TapBenchling(config=config).sync_all()
+        assert _record_counts(capsys)["entries"] == 50
+
+        mock.dataset("/entries")[7]["name"] = "renamed"
+        tap = TapBenchling(config=config)
+        tap.sync_all()
+        assert _record_counts(capsys) == {"entries": 1}
+        assert tap.record_index.stats()["entries"] == {
+            "checked": 50,
+            "suppressed": 49,
+        }
+
+
+def test_catalog_builds_only_selected_streams():
+    config = {"api_key": "sk_test"}
+    catalog = TapBenchling(config=config).catalog_dict
+    for entry in catalog["streams"]:
+        selected = entry["tap_stream_id"] in ("entries", "assay_results")
+        for metadata in entry["metadata"]:
+            if not metadata["breadcrumb"]:
+                metadata["metadata"]["selected"] = selected
+
+    tap = TapBenchling(config=config, catalog=catalog)
+    assert sorted(tap.streams) == ["assay_result_schemas", "assay_results", "entries"]
+    assert tap.streams["entries"].schema["properties"]["id"]
+
+
+def test_typed_fields_fetch_each_schema_endpoint_once():
+    with MockBenchling(schemas=2) as mock:
+        config = {"api_key": "sk_test", "api_url": mock.url, "typed_fields": True}
+        tap = TapBenchling(config=config)
+        assert mock.request_counts == {
+            "/entity-schemas": 1,
+            "/entry-schemas": 1,
+            "/container-schemas": 1,
+            "/assay-result-schemas": 1,
+        }
+
+    schema = tap.streams["assay_results"].schema["properties"]
+    fields = schema["fields"]["properties"]
+    assert fields["concentration"]["properties"]["value"]["type"] == ["number", "null"]
+    assert set(schema["fieldValidation"]["properties"]) == {"concentration", "samples"}
+    entity_fields = tap.streams["dna-sequences"].schema["properties"]["fields"]
+    assert entity_fields["properties"] == {}
+
+
+def test_schema_endpoints_retry_throttled_requests():
+    with MockBenchling(schemas=2, throttle_every=2, retry_after=0.01) as mock:
+        config = {
+            "api_key": "sk_test",
+            "api_url": mock.url,
+            "typed_fields": True,
+            "user_agent": "tap-benchling-test",
+        }
+        tap = TapBenchling(config=config)
+        assert mock.user_agents == {"tap-benchling-test"}
+
+    assert mock.throttled
+    assert tap.rate_limiter.stats()["retries"] == mock.throttled
+    assert tap.streams["entries"].schema["properties"]["fields"]["properties"]
+
+
+def test_assay_results_per_schema_streams(capsys):
+    with MockBenchling(records=30, schemas=3) as mock:
+        config = {
+            "api_key": "sk_test",
+            "api_url": mock.url,
+            "assay_results_per_schema": True,
+        }
+        catalog = TapBenchling(config=config).catalog_dict
+        names = sorted(entry["tap_stream_id"] for entry in catalog["streams"])
+        per_schema = [name for name in names if name.startswith("assay_results_")]
+        assert "assay_results" not in names
+        assert per_schema == [
+            f"assay_results_assay_result_schemas_{i}" for i in range(3)
+        ]
+
+        for entry in catalog["streams"]:
+            selected = entry["tap_stream_id"] == per_schema[1]
+            for metadata in entry["metadata"]:
+                if not metadata["breadcrumb"]:
+                    metadata["metadata"]["selected"] = selected
+        before = dict(mock.request_counts)
+        tap = TapBenchling(config=config, catalog=catalog)
+        tap.sync_all()
+        assert mock.request_counts["/assay-results"] == 1
+        assert (
+            mock.request_counts["/assay-result-schemas"]
+            == before["/assay-result-schemas"] + 1
+        )
+
+    assert _record_counts(capsys) == {per_schema[1]: 30}
+    bookmark = tap.state["bookmarks"][per_schema[1]]
+    assert bookmark["replication_key_value"] == "2023-01-01T00:29:00+00:00"
+
+
+def test_colliding_schema_names_get_distinct_streams():
+    names = SchemaAssayResultsStream.names_for(
+        [
+            {"id": "assaysch_1", "systemName": "Plate Read"},
+            {"id": "assaysch_2", "systemName": "plate-read"},
+            {"id": "assaysch_3", "systemName": "Titer"},
+        ]
+    )
+    assert names == {
+        "assaysch_1": "assay_results_plate_read_assaysch_1",
+        "assaysch_2": "assay_results_plate_read_assaysch_2",
+        "assaysch_3": "assay_results_titer",
+    }
+
+
+def test_cdc_mode_refetches_only_changed_records(capsys):
+    with MockBenchling(records=5, schemas=1) as mock:
+        config = {
+            "api_key": "sk_test",
+            "api_url": mock.url,
+            "cdc_mode": True,
+            "max_requests_per_second": 1000,
+        }
+        first = TapBenchling(config=config)
+        first.sync_all()
+        assert _record_counts(capsys)["entries"] == 5
+        assert "createdAt" in first.state["bookmarks"]["events"]
+
+        modified_at = "2023-02-01T00:00:00+00:00"
+        mock.dataset("/dna-sequences").append(
+            {"id": "seq_new", "name": "new", "modifiedAt": modified_at}
+        )
+        archived = {"reason": "Retired"}
+        mock.dataset("/entries").append(
+            {"id": "etr_1", "modifiedAt": modified_at, "archiveRecord": archived}
+        )
+        mock.dataset("/assay-results").append({"id": "res_1"})
+        mock.dataset("/mixtures").append(
+            {"id": "bfi_mix", "modifiedAt": modified_at, "archiveRecord": archived}
+        )
+        mock.add_event("v2.entity.registered", "entity", "seq_new")
+        mock.add_event("v2.entry.updated.fields", "entry", "etr_1")
+        mock.add_event("v2.assayResult.created", "assayResult", "res_1")
+        mock.add_event("v2.entity.archived", "entity", "bfi_mix")
+        removal = mock.add_event("v2.entity.archived", "entity", "bfi_gone")
+        mock.request_counts.clear()
+
+        second = TapBenchling(config=config, state=first.state)
+        second.sync_all()
+        records: dict = {}
+        for line in capsys.readouterr().out.splitlines():
+            message = json.loads(line)
+            if message["type"] == "RECORD":
+                records.setdefault(message["stream"], []).append(message["record"])
+
+    assert {name: len(rows) for name, rows in records.items()} == {
+        "users": 5,
+        "assay_result_schemas": 1,
+        "dna-sequences": 1,
+        "entries": 1,
+        "custom-entities": 1,
+        "mixtures": 1,
+        "assay_results": 1,
+    }
+    # `bfi_` IDs are re-listed by both streams and emitted by one of them.
+    assert records["mixtures"][0]["id"] == "bfi_mix"
+    assert records["entries"][0]["_sdc_deleted_at"] == modified_at
+    assert records["custom-entities"][0] == {
+        "id": "bfi_gone",
+        "_sdc_deleted_at": removal["createdAt"],
+    }
+    assert mock.request_counts["/dna-sequences"] == 1
+    assert "/containers" not in mock.request_counts
+    assert second.state["bookmarks"]["events"] == {"eventId": removal["id"]}
+
+
+def _messages(capsys) -> list:
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+
+def test_worker_processes_match_single_process_sync(capsys):
+    with MockBenchling(records=120, schemas=3, spacing=3 * 24 * 60) as mock:
+        config = {
+            "api_key": "sk_test",
+            "api_url": mock.url,
+            "max_requests_per_second": 1000,
+            "start_date": "2023-01-01T00:00:00Z",
+            "partition_window_days": 90,
+        }
+        TapBenchling(config=config).sync_all()
+        expected = _messages(capsys)
+        tap = TapBenchling(config=dict(config, worker_processes=3))
+        tap.sync_all()
+        sharded = _messages(capsys)
+
+    def records(messages: list) -> list:
+        return sorted(
+            (m["stream"], m["record"]["id"]) for m in messages if m["type"] == "RECORD"
+        )
+
+    assert records(sharded) == records(expected)
+    assert len(records(sharded)) == len(set(records(sharded)))
+    seen_schemas = set()
+    for message in sharded:
+        if message["type"] == "SCHEMA":
+            seen_schemas.add(message["stream"])
+        elif message["type"] == "RECORD":
+            assert message["stream"] in seen_schemas
+
+    final_state = [m for m in sharded if m["type"] == "STATE"][-1]["value"]
+    assert final_state == tap.state
+    expected_state = [m for m in expected if m["type"] == "STATE"][-1]["value"]
+    for name, bookmark in expected_state["bookmarks"].items():
+        partitions = bookmark.get("partitions", [])
+        assert sorted(partitions, key=json.dumps) == sorted(
+            final_state["bookmarks"][name].get("partitions", []), key=json.dumps
+        )
+        assert bookmark.get("replication_key_value") == final_state["bookmarks"][
+            name
+        ].get("replication_key_value")
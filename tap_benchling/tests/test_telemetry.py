@@ -0,0 +1,65 @@
+"""Tests for per-stream telemetry and the sampling profiler."""
+
+import json
+
+from tap_benchling.tap import TapBenchling
+from tap_benchling.telemetry import StreamTelemetry, Telemetry
+from tap_benchling.tests.mock_server import MockBenchling
+
+
+def test_request_latencies_fill_histogram_buckets():
+    telemetry = StreamTelemetry()
+    for seconds in (0.01, 0.07, 0.07, 30.0):
+        telemetry.observe_request(seconds)
+    summary = telemetry.summary()
+    assert summary["requests"] == 4
+    assert summary["request_latency"]["le_0.05"] == 1
+    assert summary["request_latency"]["le_0.1"] == 2
+    assert summary["request_latency"]["le_inf"] == 1
+    assert summary["stages"]["request"] == 30.15
+
+
+def test_metrics_are_logged_as_sdk_metric_lines(caplog):
+    telemetry = Telemetry()
+    telemetry.for_stream("entries").observe_request(0.07)
+    with caplog.at_level("INFO", logger="singer_sdk.metrics"):
+        telemetry.log_metrics()
+    points = [
+        json.loads(message.split("INFO METRIC: ", 1)[1]) for message in caplog.messages
+    ]
+    latency = next(p for p in points if p["metric"] == "http_request_latency")
+    assert latency["metric_type"] == "histogram"
+    assert latency["value"]["le_0.1"] == 1
+    assert latency["tags"] == {"stream": "entries"}
+    assert {p["metric"] for p in points} == {
+        "stage_duration",
+        "http_request_latency",
+        "bytes_received",
+    }
+
+
+def test_sync_writes_telemetry_and_profile(capsys, tmp_path):
+    with MockBenchling(records=120, schemas=2, latency=0.01) as mock:
+        config = {
+            "api_key": "sk_test",
+            "api_url": mock.url,
+            "max_requests_per_second": 1000,
+            "telemetry_path": str(tmp_path / "telemetry.json"),
+            "profile_path": str(tmp_path / "profile.txt"),
+            "profile_interval_ms": 1,
+        }
+        TapBenchling(config=config).sync_all()
+    capsys.readouterr()
+
+    telemetry = json.loads((tmp_path / "telemetry.json").read_text())
+    entries = telemetry["entries"]
+    assert entries["records"] == 120
+    assert entries["requests"] == 2
+    assert entries["bytes_received"] > 0
+    assert sum(entries["request_latency"].values()) == 2
+    assert all(entries["stages"][stage] > 0 for stage in ("request", "write"))
+    assert telemetry["assay_results"]["records"] == 240
+
+    samples = (tmp_path / "profile.txt").read_text().splitlines()
+    assert samples
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in samples)
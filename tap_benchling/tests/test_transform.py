@@ -0,0 +1,110 @@
+"""Tests for records conformed by schema-compiled transformers."""
+
+import datetime
+import json
+
+from tap_benchling.tap import TapBenchling
+from tap_benchling.tests.mock_server import MockBenchling
+from tap_benchling.transform import compile_transformer
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "id": {"type": ["string", "null"]},
+        "modifiedAt": {"type": ["string", "null"], "format": "date-time"},
+        "isArchived": {"type": ["boolean", "null"]},
+        "quantity": {
+            "type": ["object", "null"],
+            "properties": {
+                "units": {"type": ["string", "null"]},
+                "value": {"type": ["number", "null"]},
+            },
+        },
+        "contents": {
+            "type": ["array", "null"],
+            "items": {
+                "type": "object",
+                "properties": {"count": {"type": ["integer", "null"]}},
+            },
+        },
+        "fields": {"type": ["object", "null"], "properties": {}},
+        "validation": {
+            "type": ["object", "null"],
+            "properties": {"id": {"type": ["string", "null"]}},
+            "additionalProperties": {"type": ["number", "null"]},
+        },
+    },
+}
+
+
+def test_transformer_drops_unknown_properties_and_coerces_values():
+    unknown = []
+    transform = compile_transformer(SCHEMA, unknown.append)
+    record = {
+        "id": "con_1",
+        "modifiedAt": "2023-01-01T02:00:00.000+02:00",
+        "isArchived": 0,
+        "quantity": {"units": "mL", "value": "1.5", "legacy": True},
+        "contents": [{"count": "3", "batch": "bat_1"}, {"count": 2.0}],
+        "fields": {"Notes": {"value": "kept as is"}},
+        "validation": {"id": "v", "score": "7"},
+        "webURL": "https://example.benchling.com",
+    }
+    assert transform(record) == {
+        "id": "con_1",
+        "modifiedAt": "2023-01-01T00:00:00+00:00",
+        "isArchived": False,
+        "quantity": {"units": "mL", "value": 1.5},
+        "contents": [{"count": 3}, {"count": 2}],
+        "fields": {"Notes": {"value": "kept as is"}},
+        "validation": {"id": "v", "score": 7},
+    }
+    assert record["quantity"]["value"] == "1.5"
+
+    transform(record)
+    assert unknown == ["quantity.legacy", "contents.batch", "webURL"]
+
+
+def test_transformer_normalizes_datetimes_and_keeps_what_it_cannot_convert():
+    transform = compile_transformer(SCHEMA)
+    values = {
+        "2023-01-01T00:00:00Z": "2023-01-01T00:00:00+00:00",
+        "2023-01-01T00:00:00.250000Z": "2023-01-01T00:00:00.250000+00:00",
+        "2023-01-01 05:30:00+05:30": "2023-01-01T00:00:00+00:00",
+        "2023-01-01T00:00:00": "2023-01-01T00:00:00+00:00",
+        "not a date": "not a date",
+    }
+    for value, expected in values.items():
+        assert transform({"modifiedAt": value})["modifiedAt"] == expected
+    moment = datetime.datetime(2023, 1, 1, tzinfo=datetime.timezone.utc)
+    assert transform({"modifiedAt": moment}) == {
+        "modifiedAt": "2023-01-01T00:00:00+00:00"
+    }
+    assert transform({"quantity": {"value": "lots"}}) == {"quantity": {"value": "lots"}}
+    assert transform({"quantity": {"value": "nan"}}) == {"quantity": {"value": "nan"}}
+    assert transform({"isArchived": 2}) == {"isArchived": 2}
+    assert transform({"isArchived": -1}) == {"isArchived": -1}
+    assert transform({"isArchived": "1"}) == {"isArchived": "1"}
+    assert transform({"quantity": None, "modifiedAt": None}) == {
+        "quantity": None,
+        "modifiedAt": None,
+    }
+
+
+def test_conform_records_drops_properties_missing_from_the_schema(capsys):
+    with MockBenchling(records=5) as mock:
+        for record in mock.dataset("/containers"):
+            record["undocumented"] = {"added": "later"}
+            record["modifiedAt"] = record["modifiedAt"].replace("+00:00", "Z")
+        config = {"api_key": "sk_test", "api_url": mock.url, "conform_records": True}
+        tap = TapBenchling(config=config)
+        tap.streams["containers"].sync()
+
+    records = [
+        json.loads(line)["record"]
+        for line in capsys.readouterr().out.splitlines()
+        if '"RECORD"' in line
+    ]
+    assert len(records) == 5
+    assert all("undocumented" not in record for record in records)
+    assert records[0]["modifiedAt"] == "2023-01-01T00:00:00+00:00"
@@ -0,0 +1,73 @@
+"""Tests for the buffered Singer message writer."""
+
+import decimal
+import gzip
+import io
+import json
+
+from singer_sdk import _singerlib as singer
+from singer_sdk._singerlib.messages import format_message
+
+from tap_benchling.tap import TapBenchling
+from tap_benchling.tests.mock_server import MockBenchling
+from tap_benchling.writer import BufferedMessageWriter, dumps_message
+
+
+def test_messages_encode_like_the_sdk():
+    record = {"id": "seq_1", "amount": decimal.Decimal("1.10"), "n": 2}
+    message = singer.RecordMessage(stream="dna-sequences", record=record)
+    expected = json.loads(format_message(message))
+    assert json.loads(dumps_message(message)) == expected
+    assert dumps_message(message).endswith(b"\n")
+
+
+def test_buffer_flushes_when_full_and_on_state():
+    output = io.BytesIO()
+    writer = BufferedMessageWriter(output, buffer_bytes=200)
+    for index in range(3):
+        writer.write(singer.RecordMessage(stream="users", record={"id": index}))
+    assert output.getvalue() == b""
+    writer.write(singer.StateMessage(value={"bookmarks": {}}))
+    assert output.getvalue().count(b"\n") == 4
+    for index in range(10):
+        writer.write(singer.RecordMessage(stream="users", record={"id": index}))
+    assert 0 < writer.flushes < 5
+    writer.close()
+    assert output.getvalue().count(b"\n") == 14
+
+
+def _sync(mock, **settings):
+    config = {"api_key": "sk_test", "api_url": mock.url, **settings}
+    TapBenchling(config=config).sync_all()
+
+
+def _without_timestamps(lines):
+    """Return the messages without extraction times and STATE values.
+
+    Bookmarks hold signposts taken at sync time, so only STATE positions are
+    compared.
+    """
+    messages = [json.loads(line) for line in lines]
+    for message in messages:
+        message.pop("time_extracted", None)
+        message.pop("value", None)
+    return messages
+
+
+def test_buffered_writer_matches_sdk_output(capsys):
+    with MockBenchling(records=120, schemas=2) as mock:
+        _sync(mock, message_writer="sdk")
+        expected = capsys.readouterr().out.splitlines()
+        _sync(mock, message_writer="buffered", message_buffer_bytes=4096)
+        buffered = capsys.readouterr().out.splitlines()
+    assert _without_timestamps(buffered) == _without_timestamps(expected)
+
+
+def test_buffered_writer_compresses_output(capsysbinary):
+    with MockBenchling(records=120, schemas=2) as mock:
+        _sync(mock, message_writer="sdk")
+        expected = capsysbinary.readouterr().out.decode().splitlines()
+        _sync(mock, message_writer="buffered", message_compression="gzip")
+        compressed = capsysbinary.readouterr().out
+    unzipped = gzip.decompress(compressed).decode().splitlines()
+    assert _without_timestamps(unzipped) == _without_timestamps(expected)
@@ -0,0 +1,168 @@
+"""Record transformers compiled once from a stream's JSON schema."""
+
+import datetime
+import functools
+import math
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import pendulum
+
+Transform = Callable[[Any], Any]
+
+
+def compile_transformer(
+    schema: dict, on_unknown: Optional[Callable[[str], None]] = None
+) -> Transform:
+    """Return a function conforming a record to `schema` in one pass.
+
+    The schema is walked once, here. The returned function drops properties
+    the schema does not declare, writes `date-time` values as UTC ISO 8601
+    strings and turns numeric strings into numbers. Objects without declared
+    properties, such as untyped `fields`, and values that cannot be converted
+    are passed through. `on_unknown` is called with the path of each dropped
+    property the first time it is seen.
+    """
+    return _compile(schema, "", on_unknown) or _identity
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _types(schema: dict) -> List[str]:
+    types = schema.get("type") or []
+    return [types] if isinstance(types, str) else types
+
+
+def _compile(
+    schema: dict, path: str, on_unknown: Optional[Callable[[str], None]]
+) -> Optional[Transform]:
+    """Return the transform of one schema node, or None if values pass as they are."""
+    types = _types(schema)
+    if "object" in types and schema.get("properties"):
+        return _object(schema, path, on_unknown)
+    if "array" in types and isinstance(schema.get("items"), dict):
+        item = _compile(schema["items"], path, on_unknown)
+        return None if item is None else functools.partial(_array, item)
+    if "string" in types:
+        return to_datetime if schema.get("format") == "date-time" else None
+    if "integer" in types:
+        return to_integer
+    if "number" in types:
+        return to_number
+    if "boolean" in types:
+        return to_boolean
+    return None
+
+
+def _array(item: Transform, value: Any) -> Any:
+    if not isinstance(value, list):
+        return value
+    return [item(element) for element in value]
+
+
+def _object(
+    schema: dict, path: str, on_unknown: Optional[Callable[[str], None]]
+) -> Transform:
+    """Return the transform of an object with declared properties."""
+    converters: Dict[str, Optional[Transform]] = {
+        name: _compile(subschema, f"{path}{name}.", on_unknown)
+        for name, subschema in schema["properties"].items()
+    }
+    extra = schema.get("additionalProperties")
+    keep_extra = extra is True or isinstance(extra, dict)
+    extra_converter = None
+    if isinstance(extra, dict):
+        extra_converter = _compile(extra, path, on_unknown)
+    seen: Set[str] = set()
+
+    def transform(value: Any) -> Any:
+        if not isinstance(value, dict):
+            return value
+        output = {}
+        for name, item in value.items():
+            try:
+                convert = converters[name]
+            except KeyError:
+                if keep_extra:
+                    convert = extra_converter
+                else:
+                    if on_unknown is not None and name not in seen:
+                        seen.add(name)
+                        on_unknown(path + name)
+                    continue
+            output[name] = item if convert is None or item is None else convert(item)
+        return output
+
+    return transform
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_datetime(value: str) -> str:
+    try:
+        parsed = datetime.datetime.fromisoformat(
+            value[:-1] + "+00:00" if value.endswith("Z") else value
+        )
+    except ValueError:
+        try:
+            fallback = pendulum.parse(value)
+        except ValueError:
+            return value
+        if not isinstance(fallback, datetime.datetime):
+            return value
+        parsed = fallback
+    return _format_datetime(parsed)
+
+
+def _format_datetime(value: datetime.datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    else:
+        value = value.astimezone(datetime.timezone.utc)
+    return datetime.datetime.isoformat(value)
+
+
+def to_datetime(value: Any) -> Any:
+    """Return a datetime, or a string holding one, as a UTC ISO 8601 string."""
+    if isinstance(value, str):
+        return _parse_datetime(value)
+    if isinstance(value, datetime.datetime):
+        return _format_datetime(value)
+    if isinstance(value, datetime.date):
+        return value.isoformat() + "T00:00:00+00:00"
+    return value
+
+
+def to_number(value: Any) -> Any:
+    """Return a numeric string as an int or float, and other values unchanged."""
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            pass
+        try:
+            number = float(value)
+        except ValueError:
+            return value
+        return number if math.isfinite(number) else value
+    return value
+
+
+def to_integer(value: Any) -> Any:
+    """Return an integral float or numeric string as an int."""
+    if isinstance(value, str):
+        value = to_number(value)
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def to_boolean(value: Any) -> Any:
+    """Return 0/1 and `"true"`/`"false"` as booleans, other values unchanged."""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return value == 1
+    if isinstance(value, str) and value.lower() in ("true", "false"):
+        return value.lower() == "true"
+    return value
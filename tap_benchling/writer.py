@@ -0,0 +1,142 @@
+"""Singer message writers: the SDK's line-at-a-time writer and a buffered one."""
+
+import decimal
+import gzip
+import sys
+import time
+from typing import Any, BinaryIO, Dict, Optional
+
+from singer_sdk import _singerlib as singer
+from singer_sdk._singerlib.messages import format_message
+
+from tap_benchling.parsing import orjson
+
+COMPRESSIONS = ("none", "gzip")
+DEFAULT_BUFFER_BYTES = 1024 * 1024
+
+
+def _default(value: Any) -> str:
+    if isinstance(value, decimal.Decimal):
+        # orjson cannot write exact decimals; let the SDK encoder handle them.
+        raise TypeError("Decimal")
+    return str(value)
+
+
+def dumps_message(message: singer.Message) -> bytes:
+    """Return a message as one JSON line, encoded with orjson when installed.
+
+    Values are written as the SDK writes them, with `str()` for unknown types.
+    Messages holding decimals fall back to the SDK encoder.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                message.to_dict(),
+                default=_default,
+                option=orjson.OPT_APPEND_NEWLINE
+                | orjson.OPT_NON_STR_KEYS
+                | orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except TypeError:
+            pass
+    return (format_message(message) + "\n").encode()
+
+
+class MessageWriter:
+    """Write each message to stdout as it comes, like the SDK does."""
+
+    def write(self, message: singer.Message) -> None:
+        """Write and flush one message."""
+        singer.write_message(message)
+
+    def write_lines(self, data: bytes) -> None:
+        """Write and flush messages already encoded as JSON lines."""
+        sys.stdout.flush()
+        sys.stdout.buffer.write(data)
+        sys.stdout.buffer.flush()
+
+    def close(self) -> None:
+        """Nothing is buffered, so there is nothing to flush."""
+
+    def stats(self) -> Dict[str, Any]:
+        """Return no counters."""
+        return {}
+
+
+class BufferedMessageWriter(MessageWriter):
+    """Encode messages with orjson and write them to the output in large chunks.
+
+    Backpressure: at most about `buffer_bytes` of messages are held. Once that
+    is reached the whole buffer is written in one call, which blocks while the
+    target is behind on reading, and so holds up every stream writing through
+    the tap. STATE messages flush the buffer, so a bookmark reaches the target
+    as soon as it is emitted, after the records it covers. `close` flushes the
+    rest. With `gzip` compression the output is a single gzip stream.
+    """
+
+    def __init__(
+        self,
+        output: Optional[BinaryIO] = None,
+        buffer_bytes: int = DEFAULT_BUFFER_BYTES,
+        compression: str = "none",
+    ) -> None:
+        """Write to `output`, stdout's binary stream by default."""
+        if output is None:
+            sys.stdout.flush()
+            output = sys.stdout.buffer
+        self._raw = output
+        self._output: BinaryIO = output
+        if compression == "gzip":
+            self._output = gzip.GzipFile(  # type: ignore[assignment]
+                fileobj=output, mode="wb", mtime=0
+            )
+        self.buffer_bytes = buffer_bytes
+        self.messages = 0
+        self.bytes_written = 0
+        self.flushes = 0
+        self.blocked_seconds = 0.0
+        self._buffer = bytearray()
+
+    def write(self, message: singer.Message) -> None:
+        """Buffer a message, writing the buffer out when full or on STATE."""
+        self._buffer += dumps_message(message)
+        self.messages += 1
+        if len(self._buffer) >= self.buffer_bytes or isinstance(
+            message, singer.StateMessage
+        ):
+            self.flush()
+
+    def write_lines(self, data: bytes) -> None:
+        """Buffer messages already encoded as JSON lines."""
+        self._buffer += data
+        self.messages += data.count(b"\n")
+        if len(self._buffer) >= self.buffer_bytes:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write out and flush everything buffered."""
+        if not self._buffer:
+            return
+        started = time.perf_counter()
+        self._output.write(self._buffer)
+        self._output.flush()
+        self.blocked_seconds += time.perf_counter() - started
+        self.bytes_written += len(self._buffer)
+        self.flushes += 1
+        self._buffer.clear()
+
+    def close(self) -> None:
+        """Flush the buffer and end the gzip stream, leaving stdout open."""
+        self.flush()
+        if self._output is not self._raw:
+            self._output.close()
+            self._raw.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return messages and bytes written, flushes and time blocked writing."""
+        return {
+            "messages": self.messages,
+            "bytes_written": self.bytes_written,
+            "flushes": self.flushes,
+            "blocked_seconds": round(self.blocked_seconds, 3),
+        }